@@ -0,0 +1,165 @@
+# benchmarks/bench_commands.py
+# End-to-end latency benchmark for the cogs' slash commands, run entirely offline.
+# Builds synthetic projects/profiles/tags datasets in a temp directory, loads the real cogs
+# into a bot that never connects, and calls the command callbacks with fake interactions.
+# Reports p50/p95/p99 latency and the peak memory allocated per call.
+# Run from the repository root: python benchmarks/bench_commands.py [dataset sizes...]
+
+import asyncio
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+from discord.ext import commands
+
+from fakes import FakeGuild, FakeInteraction, FakeMember, FakeRole
+from utils.project_store import open_project_store
+
+SIZES = [1_000, 10_000]
+ITERATIONS = 2_000
+ALLOC_ITERATIONS = 200
+
+GUILD_ID = 1144662039504109721
+APPLY_ROLE_IDS = [1409947732151505007, 1409946575853064445]
+EXTENSIONS = ["cogs.project_viewer", "cogs.project_manager", "cogs.profile", "cogs.tags", "cogs.apply"]
+
+
+def random_text(length):
+    return ''.join(random.choice(string.ascii_letters + ' ') for _ in range(length))
+
+
+def write_datasets(size):
+    """Writes synthetic projects.json, profiles.json and tags.json to the working directory."""
+    characters = string.ascii_uppercase + string.digits
+    projects = {}
+    while len(projects) < size:
+        project_id = ''.join(random.choice(characters) for _ in range(6))
+        projects[project_id] = {
+            "department": "Scripting",
+            "creator_id": str(10**17 + random.randrange(size)),
+            "recipient_id": str(10**17 + random.randrange(size)),
+            "creator_name": "creator",
+            "recipient_name": "recipient",
+            "status": "Created"
+        }
+    profiles = {
+        str(10**17 + i): {"name": random_text(12), "pronouns": "they/them", "intro": random_text(200), "links": "Not provided"}
+        for i in range(size)
+    }
+    tags = {f"tag-{i}": "Hey {mention}, " + random_text(300) for i in range(size)}
+    for filename, data in (("projects.json", projects), ("profiles.json", profiles), ("tags.json", tags)):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+    return projects, profiles, tags
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[int(fraction * (len(sorted_values) - 1))]
+
+
+async def measure(make_call):
+    """Times ITERATIONS calls, then measures peak allocation over ALLOC_ITERATIONS calls."""
+    timings = []
+    for _ in range(ITERATIONS):
+        call = make_call()
+        start = time.perf_counter()
+        await call
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    allocations = []
+    tracemalloc.start()
+    for _ in range(ALLOC_ITERATIONS):
+        call = make_call()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await call
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return timings, sum(allocations) / len(allocations)
+
+
+async def run(size):
+    projects, profiles, tags = write_datasets(size)
+    project_ids = list(projects)
+    profile_ids = list(profiles)
+    tag_names = list(tags)
+
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.none())
+    bot.projects = await open_project_store()
+    for extension in EXTENSIONS:
+        await bot.load_extension(extension)
+
+    guild = FakeGuild(GUILD_ID, roles=[FakeRole(role_id, f"Role {role_id}") for role_id in APPLY_ROLE_IDS])
+    viewer = bot.get_cog("ProjectViewerCog")
+    manager = bot.get_cog("ProjectManagerCog")
+    profile = bot.get_cog("ProfileCog")
+    tag = bot.get_cog("TagsCog")
+    apply = bot.get_cog("ApplyCog")
+
+    def project_status():
+        interaction = FakeInteraction(FakeMember(1), guild, "project-status")
+        return viewer.project_status_command.callback(viewer, interaction, random.choice(project_ids).lower())
+
+    def manage_status():
+        project_id = random.choice(project_ids)
+        creator = FakeMember(int(projects[project_id]["creator_id"]))
+        interaction = FakeInteraction(creator, guild, "manage-status")
+        return manager.manage_status_command.callback(manager, interaction, project_id)
+
+    def profile_view():
+        interaction = FakeInteraction(FakeMember(1), guild, "profile")
+        return profile.profile_command.callback(profile, interaction, FakeMember(int(random.choice(profile_ids))))
+
+    def tag_send():
+        interaction = FakeInteraction(FakeMember(1), guild, "tag send")
+        return tag.send_tag.callback(tag, interaction, random.choice(tag_names))
+
+    def apply_dev():
+        interaction = FakeInteraction(FakeMember(1), guild, "apply-dev")
+        return apply.apply_dev.callback(apply, interaction)
+
+    results = []
+    for name, make_call in (
+        ("/project-status", project_status),
+        ("/manage-status", manage_status),
+        ("/profile @user", profile_view),
+        ("/tag send", tag_send),
+        ("/apply-dev", apply_dev),
+    ):
+        timings, allocated = await measure(make_call)
+        results.append((name, timings, allocated))
+
+    for extension in EXTENSIONS:
+        await bot.unload_extension(extension)
+    await bot.projects.close()
+    return results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'records':>8} {'command':<16} {'p50 (us)':>10} {'p95 (us)':>10} {'p99 (us)':>10} {'alloc (KiB)':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp) # The cogs use data file paths relative to the working directory
+            results = asyncio.run(run(size))
+            os.chdir(ROOT)
+        for name, timings, allocated in results:
+            print(
+                f"{size:>8} {name:<16} {percentile(timings, 0.50) * 1e6:>10.1f} {percentile(timings, 0.95) * 1e6:>10.1f} "
+                f"{percentile(timings, 0.99) * 1e6:>10.1f} {allocated / 1024:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_intents_memory.py
+# Memory held by discord.py's cache for one guild with a simulated member list, running with
+# Intents.all() versus the intents and member cache derived from the cogs' declarations.
+# The guild payload is the same for both (every member, with a presence each, as member chunking
+# delivers them); only what the client keeps differs.
+# Run from the repository root: python benchmarks/bench_intents_memory.py
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+from utils.cog_loader import discover_extensions
+from utils.intents import derive_intents
+
+MEMBER_COUNTS = [10_000, 50_000, 100_000]
+BOT_ID = 1409939541229436998
+GUILD_ID = 1144662039504109721
+
+
+def make_member(user_id):
+    return {
+        "user": {
+            "id": str(user_id),
+            "username": f"member{user_id % 1_000_000}",
+            "discriminator": "0",
+            "global_name": f"Member {user_id % 1_000_000}",
+            "avatar": "a" * 32 if random.random() < 0.6 else None
+        },
+        "nick": f"nick{user_id % 1000}" if random.random() < 0.2 else None,
+        "roles": [str(GUILD_ID + 1 + i) for i in range(random.randint(0, 3))],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0
+    }
+
+
+def make_presence(user_id):
+    return {
+        "user": {"id": str(user_id)},
+        "status": random.choice(["online", "idle", "dnd"]),
+        "client_status": {"desktop": "online"},
+        "activities": []
+    }
+
+
+def make_guild_payload(member_count):
+    """A guild with member_count members, about a third of them online."""
+    user_ids = [BOT_ID] + [10**17 + i for i in range(member_count - 1)]
+    return {
+        "id": str(GUILD_ID),
+        "name": "Benchmark Guild",
+        "owner_id": str(user_ids[1]),
+        "member_count": member_count,
+        "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False, "flags": 0}],
+        "channels": [],
+        "members": [make_member(user_id) for user_id in user_ids],
+        "presences": [make_presence(user_id) for user_id in user_ids if random.random() < 0.33]
+    }
+
+
+def cache_size(intents, member_cache_flags, payload):
+    """Bytes still allocated after building the guild from the payload, and the members cached."""
+    client = discord.Client(intents=intents, member_cache_flags=member_cache_flags)
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=payload["members"][0]["user"])
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    guild = discord.Guild(data=payload, state=state)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, len(guild.members)
+
+
+def main():
+    random.seed(0)
+    cogs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cogs')
+    intents, member_cache_flags, reasons = derive_intents(discover_extensions(cogs_dir))
+    print(f"Derived intents: {', '.join(sorted(reasons)) or 'none'} (value {intents.value})")
+    all_intents = discord.Intents.all()
+    print(f"{'members':>8} {'all: cached':>12} {'all (MiB)':>10} {'derived: cached':>16} {'derived (KiB)':>14} {'saved':>7}")
+    for member_count in MEMBER_COUNTS:
+        payload = make_guild_payload(member_count)
+        all_size, all_cached = cache_size(all_intents, discord.MemberCacheFlags.from_intents(all_intents), payload)
+        derived_size, derived_cached = cache_size(intents, member_cache_flags, payload)
+        print(
+            f"{member_count:>8} {all_cached:>12} {all_size / 1024**2:>10.1f} {derived_cached:>16} "
+            f"{derived_size / 1024:>14.1f} {1 - derived_size / all_size:>6.1%}"
+        )
+
+
+if __name__ == '__main__':
+    main()
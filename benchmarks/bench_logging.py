@@ -0,0 +1,124 @@
+# benchmarks/bench_logging.py
+# Throughput of a log-heavy command with the old logging setup (FileHandler and StreamHandler
+# writing on the event loop) versus the queue-based pipeline from utils/logging_setup.py, in text
+# and JSON format. Each simulated command logs LOGS_PER_COMMAND lines; COMMANDS of them run
+# CONCURRENCY at a time. Also reports how long one logging call holds up the loop, and how long
+# the listener thread needed afterwards to write out what was still queued.
+# The "slow disk" rows make every write to the log file block for SLOW_WRITE seconds, as a busy or
+# network disk would. Console output goes to os.devnull.
+# Run from the repository root: python benchmarks/bench_logging.py
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging_setup import TEXT_FORMAT, setup_logging
+
+COMMANDS = 20_000
+CONCURRENCY = 100
+LOGS_PER_COMMAND = 3
+SLOW_WRITE = 0.0001
+
+logger = logging.getLogger("bench.command")
+
+
+async def command(number, call_times):
+    """Stands in for a cog handler: a few awaits with a log line around each."""
+    for step in range(LOGS_PER_COMMAND):
+        start = time.perf_counter()
+        logger.info(f"Command {number} step {step} handled for user {number % 997} in guild 1144662039504109721.")
+        call_times.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+
+async def run_commands():
+    call_times = []
+    start = time.perf_counter()
+    for batch in range(0, COMMANDS, CONCURRENCY):
+        await asyncio.gather(*(command(number, call_times) for number in range(batch, batch + CONCURRENCY)))
+    return time.perf_counter() - start, call_times
+
+
+class SlowStream:
+    """A file stream whose writes block for SLOW_WRITE seconds first."""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        time.sleep(SLOW_WRITE)
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def old_setup(path):
+    """The logging.basicConfig call bot.py used to make."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=TEXT_FORMAT,
+        handlers=[logging.FileHandler(path), logging.StreamHandler()],
+        force=True
+    )
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    real_stderr = sys.stderr
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        cases = [
+            ("FileHandler (before)", None, False),
+            ("queue, text", "text", False),
+            ("queue, JSON", "json", False),
+            ("FileHandler, slow disk", None, True),
+            ("queue, text, slow disk", "text", True)
+        ]
+        for position, (name, log_format, slow) in enumerate(cases):
+            path = os.path.join(directory, f"{position}.log")
+            sys.stderr = open(os.devnull, 'w')
+            listener = None
+            if log_format is None:
+                old_setup(path)
+                file_handler = logging.getLogger().handlers[0]
+            else:
+                os.environ['LOG_FILE'] = path
+                os.environ['LOG_FORMAT'] = log_format
+                listener = setup_logging()
+                file_handler = listener.handlers[0]
+            if slow:
+                file_handler.stream = SlowStream(file_handler.stream)
+            elapsed, call_times = asyncio.run(run_commands())
+            drain_start = time.perf_counter()
+            if listener is not None:
+                listener.stop()
+            drain = time.perf_counter() - drain_start
+            reset_root()
+            sys.stderr.close()
+            sys.stderr = real_stderr
+            results.append((name, COMMANDS / elapsed, percentile(call_times, 0.5), percentile(call_times, 0.99), max(call_times), drain))
+
+    print(f"{COMMANDS} commands, {LOGS_PER_COMMAND} log lines each, {CONCURRENCY} at a time")
+    print(f"{'setup':<24} {'commands/s':>11} {'log p50 (us)':>13} {'log p99 (us)':>13} {'log max (ms)':>13} {'drain (s)':>10}")
+    for name, throughput, p50, p99, worst, drain in results:
+        print(f"{name:<24} {throughput:>11.0f} {p50 * 1e6:>13.1f} {p99 * 1e6:>13.1f} {worst * 1000:>13.2f} {drain:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/bench_member_chunking.py
+# Time to the first interaction after a restart with MEMBER_CHUNKING=startup (every guild is chunked
+# before on_ready) versus lazy (ready at once; members are fetched on demand and the cache is warmed
+# up in the background). The gateway is simulated: member chunks of CHUNK_SIZE arrive CHUNK_INTERVAL
+# apart and are turned into real discord.Member objects, and a member query takes QUERY_LATENCY.
+# An interaction is waiting when the bot connects; answering it needs one member that is not cached yet.
+# Run from the repository root: python benchmarks/bench_member_chunking.py
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+import utils.member_cache as member_cache_module
+from utils.member_cache import MemberCache
+
+# (guilds, members per guild)
+CASES = [(1, 10_000), (1, 50_000), (5, 20_000)]
+CHUNK_SIZE = 1_000 # Members per GUILD_MEMBERS_CHUNK event, as Discord sends them
+CHUNK_INTERVAL = 0.02 # Assumed time between chunk events
+QUERY_LATENCY = 0.1 # Assumed round trip of a member query by user ID
+BOT_ID = 1409939541229436998
+
+
+def member_payload(user_id):
+    return {
+        "user": {"id": str(user_id), "username": f"member{user_id}", "discriminator": "0", "avatar": None},
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0
+    }
+
+
+class SimulatedGuild:
+    """The parts of discord.Guild the member cache uses, with a simulated gateway behind them."""
+    def __init__(self, state, guild_id, member_count):
+        self.id = guild_id
+        self.guild = discord.Guild(data={"id": str(guild_id), "name": "guild", "member_count": member_count}, state=state)
+        self.state = state
+        self.user_ids = [guild_id * 1_000_000 + i for i in range(member_count)]
+        self.chunked = False
+        self.queries = 0
+
+    def get_member(self, user_id):
+        return self.guild.get_member(user_id)
+
+    def _add(self, user_ids):
+        members = []
+        for user_id in user_ids:
+            member = discord.Member(data=member_payload(user_id), guild=self.guild, state=self.state)
+            self.guild._add_member(member)
+            members.append(member)
+        return members
+
+    async def chunk(self, cache=True):
+        for start in range(0, len(self.user_ids), CHUNK_SIZE):
+            await asyncio.sleep(CHUNK_INTERVAL)
+            self._add(self.user_ids[start:start + CHUNK_SIZE])
+        self.chunked = True
+
+    async def query_members(self, user_ids, limit, cache=True):
+        self.queries += 1
+        await asyncio.sleep(QUERY_LATENCY)
+        return self._add(user_ids)
+
+
+class SimulatedBot:
+    def __init__(self, guilds):
+        self.intents = discord.Intents.all()
+        self.guilds = guilds
+
+    def get_user(self, user_id):
+        return None
+
+
+def make_guilds(guild_count, member_count):
+    client = discord.Client(intents=discord.Intents.all())
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data={"id": str(BOT_ID), "username": "bot", "discriminator": "0", "avatar": None})
+    return [SimulatedGuild(state, guild_id, member_count) for guild_id in range(1, guild_count + 1)]
+
+
+async def first_interaction(member_cache, guild):
+    """Handles the waiting interaction: looks up its member and a few others it mentions."""
+    user_ids = guild.user_ids[-20:]
+    members = await member_cache.get_members(guild, user_ids)
+    assert len(members) == len(user_ids)
+
+
+async def run(mode, guild_count, member_count):
+    guilds = make_guilds(guild_count, member_count)
+    bot = SimulatedBot(guilds)
+    member_cache = MemberCache(bot, mode=mode)
+    start = time.perf_counter()
+    if mode == 'startup':
+        for guild in guilds:
+            await guild.chunk()
+    ready = time.perf_counter() - start
+    member_cache.start_warm_up()
+    await first_interaction(member_cache, guilds[0])
+    answered = time.perf_counter() - start
+    await member_cache.wait_warm_ups()
+    cached = time.perf_counter() - start
+    return ready, answered, cached, sum(guild.queries for guild in guilds)
+
+
+async def main():
+    member_cache_module.WARM_UP_DELAY = 0.1
+    print(f"{'guilds':>6} {'members':>8} {'mode':>8} {'ready (s)':>10} {'first interaction (s)':>22} {'all cached (s)':>15} {'queries':>8}")
+    for guild_count, member_count in CASES:
+        for mode in ('startup', 'lazy'):
+            ready, answered, cached, queries = await run(mode, guild_count, member_count)
+            print(f"{guild_count:>6} {member_count:>8} {mode:>8} {ready:>10.2f} {answered:>22.2f} {cached:>15.2f} {queries:>8}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
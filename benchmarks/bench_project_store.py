@@ -0,0 +1,89 @@
+# benchmarks/bench_project_store.py
+# Compares per-command latency of the project cogs before and after the shared project store.
+# "Before" mirrors the old cogs: every /project-status or /manage-status re-parsed projects.json.
+# "After" is a lookup against the JSON (in-memory) and SQLite backends.
+# Run from the repository root: python benchmarks/bench_project_store.py
+
+import asyncio
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.project_store import ProjectStore
+from utils.sqlite_project_store import SQLiteProjectStore
+
+SIZES = [1_000, 10_000, 100_000]
+LOOKUPS = 200
+
+
+def make_projects(count):
+    """Builds a synthetic project dictionary shaped like the one ProjectSelectView writes."""
+    characters = string.ascii_uppercase + string.digits
+    projects = {}
+    while len(projects) < count:
+        project_id = ''.join(random.choice(characters) for _ in range(6))
+        projects[project_id] = {
+            "department": "Scripting",
+            "creator_id": str(random.randint(10**17, 10**18)),
+            "recipient_id": str(random.randint(10**17, 10**18)),
+            "creator_name": "creator",
+            "recipient_name": "recipient",
+            "status": "Created"
+        }
+    return projects
+
+
+def legacy_lookup(path, project_id):
+    """The old per-command path: parse the whole file, then look up one project."""
+    with open(path, 'r', encoding='utf-8') as f:
+        projects = json.load(f)
+    return projects.get(project_id)
+
+
+def time_per_call(func, ids):
+    start = time.perf_counter()
+    for project_id in ids:
+        func(project_id)
+    return (time.perf_counter() - start) / len(ids) * 1000
+
+
+async def async_time_per_call(func, ids):
+    start = time.perf_counter()
+    for project_id in ids:
+        await func(project_id)
+    return (time.perf_counter() - start) / len(ids) * 1000
+
+
+async def main():
+    print(f"{'projects':>10} {'before (ms)':>12} {'json (ms)':>12} {'sqlite (ms)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f'projects_{size}.json')
+            projects = make_projects(size)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(projects, f, indent=4)
+
+            ids = random.choices(list(projects), k=LOOKUPS)
+            # The legacy path is slow at 100k, so sample fewer calls there
+            legacy_ids = ids[:max(5, LOOKUPS * 1_000 // size)]
+
+            before = time_per_call(lambda project_id: legacy_lookup(path, project_id), legacy_ids)
+
+            json_store = ProjectStore(path)
+            json_after = await async_time_per_call(json_store.get, ids)
+
+            sqlite_store = await SQLiteProjectStore.open(os.path.join(tmp, f'projects_{size}.db'), migrate_from=path)
+            sqlite_after = await async_time_per_call(sqlite_store.get, ids)
+            await sqlite_store.close()
+
+            print(f"{size:>10} {before:>12.3f} {json_after:>12.5f} {sqlite_after:>12.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
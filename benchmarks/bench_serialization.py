@@ -0,0 +1,68 @@
+# benchmarks/bench_serialization.py
+# Reports load time, save time and on-disk size of each DATA_FORMAT for synthetic profile data.
+# Formats whose optional package isn't installed are skipped.
+# Run from the repository root: python benchmarks/bench_serialization.py [record counts...]
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import serialization
+from utils.serialization import FORMATS, decode, encode
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_profiles(count):
+    """Builds a synthetic profile dictionary shaped like the one ProfileSetupModal writes."""
+    def text(length):
+        return ''.join(random.choice(string.ascii_letters + ' ') for _ in range(length))
+    intros = [text(200) for _ in range(50)]
+    return {
+        str(10**17 + i): {
+            "name": text(12),
+            "pronouns": "they/them",
+            "intro": random.choice(intros),
+            "links": "https://github.com/example"
+        }
+        for i in range(count)
+    }
+
+
+def available(fmt):
+    return fmt != "msgpack" or serialization.msgpack is not None
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'records':>10} {'format':>8} {'save (s)':>10} {'load (s)':>10} {'size (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            data = make_profiles(size)
+            for fmt in FORMATS:
+                if not available(fmt):
+                    print(f"{size:>10} {fmt:>8} {'skipped: package not installed':>32}")
+                    continue
+                path = os.path.join(tmp, f'profiles_{size}.{fmt}')
+
+                start = time.perf_counter()
+                with open(path, 'wb') as f:
+                    f.write(encode(data, fmt))
+                save = time.perf_counter() - start
+
+                start = time.perf_counter()
+                with open(path, 'rb') as f:
+                    loaded = decode(f.read())
+                load = time.perf_counter() - start
+
+                assert len(loaded) == size
+                print(f"{size:>10} {fmt:>8} {save:>10.3f} {load:>10.3f} {os.path.getsize(path) / 1024**2:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
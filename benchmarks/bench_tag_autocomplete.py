@@ -0,0 +1,91 @@
+# benchmarks/bench_tag_autocomplete.py
+# Per-keystroke latency of the /tag autocomplete: the old full scan versus TagIndex.
+# Each query is one keystroke of a user typing out an existing tag name.
+# Also times fuzzy lookups of mistyped names (autocomplete and "did you mean").
+# Run from the repository root: python benchmarks/bench_tag_autocomplete.py [tag counts...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tag_index import TagIndex
+
+SIZES = [100, 10_000, 50_000, 100_000]
+TYPED_TAGS = 50
+
+
+def make_words(count):
+    """Pronounceable made-up words standing in for the vocabulary of real tag names."""
+    consonants = "bcdfghklmnprstvz"
+    vowels = "aeiou"
+    return list({
+        ''.join(random.choice(consonants) + random.choice(vowels) for _ in range(random.randint(2, 4)))
+        for _ in range(count)
+    })
+
+
+def make_names(count):
+    """Tag names of one to three words, e.g. "bamoto-rise"."""
+    words = make_words(max(200, count // 20))
+    names = set()
+    while len(names) < count:
+        names.add('-'.join(random.choice(words) for _ in range(random.randint(1, 3))))
+    return list(names)
+
+
+def legacy_autocomplete(names, current):
+    """The old TagsCog.tag_autocomplete loop."""
+    choices = []
+    for tag_name in names:
+        if current.lower() in tag_name.lower():
+            choices.append(tag_name)
+    return choices[:25]
+
+
+def keystrokes(names):
+    """Every prefix of TYPED_TAGS random tag names, as a user would type them."""
+    return [name[:length] for name in random.sample(names, min(TYPED_TAGS, len(names))) for length in range(1, len(name) + 1)]
+
+
+def typos(names):
+    """TYPED_TAGS random tag names with one character dropped and two swapped."""
+    mistyped = []
+    for name in random.sample(names, min(TYPED_TAGS, len(names))):
+        chars = list(name)
+        del chars[random.randrange(len(chars))]
+        i = random.randrange(len(chars) - 1)
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        mistyped.append(''.join(chars))
+    return mistyped
+
+
+def time_per_query(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tags':>8} {'scan (us)':>12} {'index (us)':>12} {'speedup':>9} {'typo search (us)':>17} {'did you mean (us)':>18}")
+    for size in sizes:
+        names = make_names(size)
+        tags = dict.fromkeys(names, "content")
+        index = TagIndex(names)
+        queries = keystrokes(names)
+        # The scan is slow at large sizes, so time it on a sample of the keystrokes
+        scan_queries = queries[:max(20, len(queries) * 1_000 // size)]
+        scan = time_per_query(lambda query: legacy_autocomplete(tags.keys(), query), scan_queries)
+        indexed = time_per_query(index.search, queries)
+        mistyped = typos(names)
+        typo_search = time_per_query(index.search, mistyped)
+        did_you_mean = time_per_query(index.suggest, mistyped)
+        print(f"{size:>8} {scan:>12.1f} {indexed:>12.1f} {scan / indexed:>8.0f}x {typo_search:>17.1f} {did_you_mean:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_tag_templates.py
+# Cost of rendering a tag on /tag send: a compiled TagTemplate versus calling str.format
+# on the raw content every time (and splitting it into messages for long tags).
+# Run from the repository root: python benchmarks/bench_tag_templates.py
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tag_template import MESSAGE_LIMIT, TagTemplate
+
+# (content length, number of placeholders)
+CASES = [(200, 0), (200, 2), (1_500, 5), (6_000, 10)]
+RUNS = 20_000
+VALUES = {
+    "user": "Some Member",
+    "mention": "<@123456789012345678>",
+    "channel": "<#123456789012345678>",
+    "server": "Example Server"
+}
+
+
+def make_content(length, placeholders):
+    """Random words and line breaks with the given number of placeholders spread through them."""
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        word = ''.join(random.choice(string.ascii_lowercase) for _ in range(random.randint(2, 9)))
+        words.append(word + ('\n' if random.random() < 0.1 else ' '))
+    for _ in range(placeholders):
+        words.insert(random.randrange(len(words)), "{" + random.choice(list(VALUES)) + "} ")
+    return ''.join(words)
+
+
+def naive_render(content):
+    """Parse and format the raw content on every send, splitting it if it got too long."""
+    text = content.format(**VALUES)
+    return [text[i:i + MESSAGE_LIMIT] for i in range(0, len(text), MESSAGE_LIMIT)]
+
+
+def time_per_call(func, arg):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        func(arg)
+    return (time.perf_counter() - start) / RUNS * 1e6
+
+
+def main():
+    random.seed(0)
+    print(f"{'length':>8} {'placeholders':>13} {'messages':>9} {'str.format (us)':>16} {'template (us)':>14} {'compile (us)':>13}")
+    for length, placeholders in CASES:
+        content = make_content(length, placeholders)
+        template = TagTemplate(content)
+        naive = time_per_call(naive_render, content)
+        compiled = time_per_call(template.render, VALUES)
+        compile_time = time_per_call(TagTemplate, content)
+        print(
+            f"{len(content):>8} {placeholders:>13} {len(template.chunks):>9} "
+            f"{naive:>16.2f} {compiled:>14.2f} {compile_time:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
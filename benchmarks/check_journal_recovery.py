@@ -0,0 +1,153 @@
+# benchmarks/check_journal_recovery.py
+# Crash-recovery checks for the journaled persistence mode (utils/journal.py): simulates a crash
+# mid-append by truncating the journal in the middle of a record, and a crash mid-compaction by
+# leaving a .journal.compacting segment behind, then checks what load_journaled() recovers.
+# Run from the repository root: python benchmarks/check_journal_recovery.py
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ['PERSISTENCE_MODE'] = 'journal'
+
+from utils.journal import Journal, load_journaled
+from utils.persistence import atomic_write
+
+failures = []
+
+
+def check(condition, message):
+    if not condition:
+        failures.append(message)
+
+
+async def write_records(path, records):
+    """Appends (key, value) records to the journal of path; a value of None is a delete."""
+    data = load_journaled(path)
+    journal = Journal(path, lambda: dict(data))
+    for key, value in records:
+        if value is None:
+            data.pop(key, None)
+            journal.delete(key)
+        else:
+            data[key] = value
+            journal.set(key, value)
+    await journal.close()
+
+
+async def torn_record(directory):
+    """A crash mid-append leaves half a record at the end of the journal."""
+    path = os.path.join(directory, 'torn.json')
+    journal_file = f"{path}.journal"
+    await write_records(path, [("a", 1), ("b", {"nested": [1, 2]})])
+    good_offset = os.path.getsize(journal_file)
+    await write_records(path, [("c", "lost")])
+    # Cut the last record in half
+    with open(journal_file, 'r+b') as f:
+        f.truncate(good_offset + (os.path.getsize(journal_file) - good_offset) // 2)
+
+    data = load_journaled(path)
+    check(data == {"a": 1, "b": {"nested": [1, 2]}}, f"torn record: loaded {data!r}, expected only the complete records")
+    size = os.path.getsize(journal_file)
+    check(size == good_offset, f"torn record: journal is {size} bytes, expected it cut back to {good_offset}")
+
+    # New records must land right after the last good one, not after the torn bytes
+    await write_records(path, [("d", 4)])
+    with open(journal_file, 'rb') as f:
+        f.seek(good_offset)
+        appended = f.read()
+    check(appended == b'{"op":"set","key":"d","value":4}\n', f"append after reload: found {appended!r} after the last good record")
+    data = load_journaled(path)
+    check(data == {"a": 1, "b": {"nested": [1, 2]}, "d": 4}, f"append after reload: loaded {data!r}")
+
+
+async def torn_first_record(directory):
+    """A journal holding nothing but a torn record is cut back to empty."""
+    path = os.path.join(directory, 'empty.json')
+    journal_file = f"{path}.journal"
+    atomic_write(path, {"kept": True})
+    with open(journal_file, 'wb') as f:
+        f.write(b'{"op":"set","key":"x","val')
+    data = load_journaled(path)
+    check(data == {"kept": True}, f"torn first record: loaded {data!r}")
+    check(os.path.getsize(journal_file) == 0, "torn first record: journal was not cut back to empty")
+
+
+async def leftover_compacting(directory):
+    """
+    A crash mid-compaction leaves the old journal as .journal.compacting next to the new live
+    journal. It is replayed before the live journal, and its torn tail is dropped too.
+    """
+    path = os.path.join(directory, 'compacting.json')
+    compacting_file = f"{path}.journal.compacting"
+    journal_file = f"{path}.journal"
+    atomic_write(path, {"a": 1, "b": 2})
+    with open(compacting_file, 'wb') as f:
+        f.write(b'{"op":"set","key":"a","value":10}\n{"op":"delete","key":"b"}\n')
+    good_offset = os.path.getsize(compacting_file)
+    with open(compacting_file, 'ab') as f:
+        f.write(b'{"op":"set","key":"b","va')
+    with open(journal_file, 'wb') as f:
+        # The live journal comes after the segment, so its write to "a" wins
+        f.write(b'{"op":"set","key":"a","value":20}\n{"op":"set","key":"c","value":3}\n')
+
+    data = load_journaled(path)
+    check(data == {"a": 20, "c": 3}, f"leftover compacting segment: loaded {data!r}, expected {{'a': 20, 'c': 3}}")
+    size = os.path.getsize(compacting_file)
+    check(size == good_offset, f"leftover compacting segment: {size} bytes, expected it cut back to {good_offset}")
+
+    # The next compaction folds the leftover segment in along with the live journal
+    data = load_journaled(path)
+    journal = Journal(path, lambda: dict(data))
+    data["d"] = 4
+    journal.set("d", 4)
+    await journal.compact()
+    await journal.close()
+    check(not os.path.exists(compacting_file), "compaction left the .journal.compacting segment behind")
+    check(os.path.getsize(journal_file) == 0, "compaction did not start a fresh journal")
+    data = load_journaled(path)
+    check(data == {"a": 20, "c": 3, "d": 4}, f"after compaction: loaded {data!r}")
+
+
+async def folded_outside_journal_mode(directory):
+    """Outside journal mode, leftover journal files are folded into the snapshot and removed."""
+    path = os.path.join(directory, 'folded.json')
+    await write_records(path, [("a", 1), ("b", 2), ("a", None)])
+    with open(f"{path}.journal.compacting", 'wb') as f:
+        f.write(b'{"op":"set","key":"z","value":0}\n')
+    os.environ['PERSISTENCE_MODE'] = 'snapshot'
+    try:
+        data = load_journaled(path)
+    finally:
+        os.environ['PERSISTENCE_MODE'] = 'journal'
+    check(data == {"z": 0, "b": 2}, f"folding: loaded {data!r}")
+    check(not os.path.exists(f"{path}.journal") and not os.path.exists(f"{path}.journal.compacting"), "folding left journal files behind")
+    os.environ['PERSISTENCE_MODE'] = 'snapshot'
+    try:
+        data = load_journaled(path)
+    finally:
+        os.environ['PERSISTENCE_MODE'] = 'journal'
+    check(data == {"z": 0, "b": 2}, f"folding: reloaded {data!r} from the snapshot")
+
+
+async def run():
+    with tempfile.TemporaryDirectory() as directory:
+        for case in (torn_record, torn_first_record, leftover_compacting, folded_outside_journal_mode):
+            await case(directory)
+
+
+def main():
+    asyncio.run(run())
+    if failures:
+        print(f"FAILED: {len(failures)} checks")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK: journal recovery")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/check_write_behind.py
+# Checks for the debounced writer (utils/persistence.WriteBehind) that profiles and tag usage
+# counters are saved through: bursts are folded into one write, a change made while a write is
+# running still gets written, a failed write is retried, and close() leaves nothing pending.
+# Run from the repository root: python benchmarks/check_write_behind.py
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.persistence import WriteBehind
+
+# Flush interval for the checks (seconds)
+INTERVAL = 0.05
+
+failures = []
+
+
+def check(condition, message):
+    if not condition:
+        failures.append(message)
+
+
+class FakeFile:
+    """Stands in for the data file: records every write, optionally slowly or failing."""
+    def __init__(self, delay=0.0, failures=0):
+        self.delay = delay
+        self.failures = failures # How many writes fail before they start succeeding
+        self.writes = []
+
+    async def write(self, data):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.writes.append(data)
+
+
+async def coalesced():
+    """A burst of changes within one interval is a single write of the final data."""
+    data = {}
+    file = FakeFile()
+    writer = WriteBehind("coalesced.json", lambda: dict(data), INTERVAL, write=file.write)
+    for i in range(100):
+        data[i] = i
+        writer.mark_dirty()
+    await asyncio.sleep(INTERVAL * 4)
+    check(len(file.writes) == 1, f"burst: {len(file.writes)} writes, expected 1")
+    check(file.writes and len(file.writes[-1]) == 100, "burst: the write did not hold every change")
+    await writer.close()
+
+
+async def changed_during_write():
+    """A change made while a background write is running is written after it, without another change."""
+    data = {"a": 1}
+    file = FakeFile(delay=INTERVAL * 4)
+    writer = WriteBehind("during.json", lambda: dict(data), INTERVAL, write=file.write)
+    writer.mark_dirty()
+    await asyncio.sleep(INTERVAL * 2) # The first write is now running
+    data["b"] = 2
+    writer.mark_dirty()
+    await asyncio.sleep(INTERVAL * 15)
+    check(file.writes[-1:] == [{"a": 1, "b": 2}], f"change during a write: last write was {file.writes[-1:]!r}")
+    check(not writer.dirty, "change during a write: still dirty after the follow-up interval")
+    await writer.close()
+
+
+async def retried():
+    """A failed background write is retried on the next interval."""
+    data = {"a": 1}
+    file = FakeFile(failures=2)
+    writer = WriteBehind("retried.json", lambda: dict(data), INTERVAL, write=file.write)
+    writer.mark_dirty()
+    await asyncio.sleep(INTERVAL * 8)
+    check(file.writes == [{"a": 1}], f"retry: writes were {file.writes!r}, expected one successful write")
+    check(not writer.dirty, "retry: still dirty after the failed writes were retried")
+    await writer.close()
+
+
+async def closed():
+    """close() writes pending changes straight away, even mid-write, and leaves no timer running."""
+    data = {"a": 1}
+    file = FakeFile(delay=INTERVAL)
+    writer = WriteBehind("closed.json", lambda: dict(data), 10.0, write=file.write)
+    writer.mark_dirty()
+    await writer.close()
+    check(file.writes == [{"a": 1}], f"close: writes were {file.writes!r}")
+    check(not writer.dirty, "close: still dirty")
+
+    writer = WriteBehind("closed.json", lambda: dict(data), INTERVAL, write=file.write)
+    writer.mark_dirty()
+    await asyncio.sleep(INTERVAL * 1.5) # A background write is running
+    data["b"] = 2
+    writer.mark_dirty()
+    await writer.close()
+    check(file.writes[-1] == {"a": 1, "b": 2}, f"close mid-write: last write was {file.writes[-1]!r}")
+    check(not writer.dirty, "close mid-write: still dirty")
+    check(all(task is asyncio.current_task() for task in asyncio.all_tasks()), "close: left a task running")
+
+
+async def run():
+    for case in (coalesced, changed_during_write, retried, closed):
+        await case()
+
+
+def main():
+    asyncio.run(run())
+    if failures:
+        print(f"FAILED: {len(failures)} checks")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK: write-behind")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/fakes.py
+# Minimal stand-ins for the discord.py objects the cogs touch (Interaction, Member, Guild, ...),
+# so command callbacks can be called directly without a Discord connection.
+# Only the attributes and methods the cogs actually use are implemented.
+
+import datetime
+
+
+class FakeAsset:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeRole:
+    def __init__(self, role_id, name):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+
+class FakeMember:
+    """Stands in for discord.Member / discord.User."""
+    def __init__(self, member_id, name=None, roles=()):
+        self.id = member_id
+        self.name = name or f"user{member_id}"
+        self.display_name = self.name
+        self.mention = f"<@{member_id}>"
+        self.bot = False
+        self.roles = list(roles)
+        self.avatar = FakeAsset(f"https://cdn.example/avatars/{member_id}.png")
+        self.display_avatar = self.avatar
+        self.created_at = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        self.joined_at = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+    def __str__(self):
+        return self.name
+
+
+class FakeGuild:
+    def __init__(self, guild_id, roles=()):
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self._roles = {role.id: role for role in roles}
+        self.default_role = FakeRole(guild_id, "@everyone")
+
+    def get_role(self, role_id):
+        return self._roles.get(role_id)
+
+
+class FakeResponse:
+    """Stands in for discord.InteractionResponse and records what was sent."""
+    def __init__(self):
+        self.sent = []
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self.sent.append(("message", content, kwargs))
+
+    async def send_modal(self, modal):
+        self._done = True
+        self.sent.append(("modal", modal, {}))
+
+    async def defer(self, **kwargs):
+        self._done = True
+        self.sent.append(("defer", None, kwargs))
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+class FakeCommand:
+    def __init__(self, name):
+        self.name = name
+        self.qualified_name = name
+
+
+class FakeInteraction:
+    """Stands in for discord.Interaction."""
+    def __init__(self, user, guild, command_name=None, channel=None):
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = channel
+        self.command = FakeCommand(command_name) if command_name else None
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
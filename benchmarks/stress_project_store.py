@@ -0,0 +1,94 @@
+# benchmarks/stress_project_store.py
+# Fires hundreds of concurrent project creations and status changes at the project store
+# and checks that no write was lost, both in memory and after reloading from disk.
+# Each status change is a read-modify-write under the project's lock (read the counter kept in
+# the status, yield to the other tasks, write it back incremented), so a lost increment means
+# two updates of the same project interleaved.
+# Run from the repository root: python benchmarks/stress_project_store.py [updates]
+# Set PROJECTS_BACKEND=sqlite or PERSISTENCE_MODE=journal to stress the other backends.
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.project_store import open_project_store
+
+PROJECTS = 50
+STATUS_PREFIX = "In Progress #"
+
+
+async def run(updates):
+    store = await open_project_store()
+
+    # Concurrent creations: every allocated ID must end up stored
+    async def create(i):
+        project_id = store.ids.allocate()
+        await store.create(project_id, {
+            "department": "Scripting",
+            "creator_id": str(i),
+            "recipient_id": str(i + 1),
+            "creator_name": "creator",
+            "recipient_name": "recipient",
+            "status": f"{STATUS_PREFIX}0"
+        })
+        return project_id
+    project_ids = await asyncio.gather(*(create(i) for i in range(PROJECTS)))
+
+    # Concurrent read-modify-write updates, several per project. Each one must see the
+    # previous one's write, so a project ends up counting every update made to it.
+    expected = dict.fromkeys(project_ids, 0)
+    async def update(project_id):
+        async with store.lock(project_id):
+            project = await store.get(project_id)
+            count = int(project["status"].removeprefix(STATUS_PREFIX))
+            await asyncio.sleep(0) # Let the other updates run between the read and the write
+            await store.update_status(project_id, f"{STATUS_PREFIX}{count + 1}")
+
+    targets = [random.choice(project_ids) for _ in range(updates)]
+    for project_id in targets:
+        expected[project_id] += 1
+    start = time.perf_counter()
+    await asyncio.gather(*(update(project_id) for project_id in targets))
+    elapsed = time.perf_counter() - start
+
+    failures = []
+    for project_id, count in expected.items():
+        stored = await store.get(project_id)
+        if stored["status"] != f"{STATUS_PREFIX}{count}":
+            failures.append(f"{project_id}: in memory {stored['status']!r}, expected {STATUS_PREFIX}{count}")
+    await store.close()
+
+    # Reload from disk and compare
+    reloaded = await open_project_store()
+    for project_id in project_ids:
+        stored = await reloaded.get(project_id)
+        if stored is None:
+            failures.append(f"{project_id}: missing after reload")
+        elif stored["status"] != f"{STATUS_PREFIX}{expected[project_id]}":
+            failures.append(f"{project_id}: on disk {stored['status']!r}, expected {STATUS_PREFIX}{expected[project_id]}")
+    await reloaded.close()
+    return elapsed, failures
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp) # The stores use paths relative to the working directory
+        os.environ.setdefault('PROJECTS_DB', os.path.join(tmp, 'projects.db'))
+        elapsed, failures = asyncio.run(run(updates))
+    print(f"{PROJECTS} concurrent creations, {updates} concurrent status changes in {elapsed:.3f} s")
+    if failures:
+        print(f"FAILED: {len(failures)} mismatches from lost or out-of-order writes")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK: no lost writes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,172 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
 import logging
 import os
 import asyncio
 import sys
+import time
 
-# Set up logging to file and console
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("bot.log"),
-        logging.StreamHandler()
-    ]
-)
+from utils.cog_loader import discover_extensions, format_startup_profile, load_extensions
+from utils.command_metrics import InstrumentedCommandTree, RestMetrics, http_trace_config
+from utils.command_sync import CommandSync
+from utils.guild_config import GUILD_IDS
+from utils.hot_reload import CogReloader
+from utils.intents import build_intents
+from utils.logging_setup import setup_logging
+from utils.loop_watchdog import LoopWatchdog
+from utils.member_cache import MemberCache, member_chunking_mode
+from utils.metrics_server import MetricsServer
+from utils.project_store import open_project_store
+from utils.sharding import ShardConfig, ShardMonitor
+
+# Set up logging to file and console; records are written by a background thread, never on the event loop
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Enable all intents
-intents = discord.Intents.all()
+# Startup timings (time to ready, time to the first interaction) are measured from here
+STARTED_AT = time.perf_counter()
+
+COGS_DIR = './cogs'
+extensions = discover_extensions(COGS_DIR) if os.path.isdir(COGS_DIR) else []
+
+# Only the intents and member cache the cogs declare (INTENTS / MEMBER_CACHE in each cog).
+# Set INTENTS_PROFILE=all to subscribe to and cache everything instead.
+intents, member_cache_flags = build_intents(extensions)
+
+# Port for the Prometheus metrics endpoint on localhost (0 to disable)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+# Discord API responses by status, counted by the HTTP trace
+rest_metrics = RestMetrics()
+
+# SHARDING=auto makes the bot an AutoShardedBot; SHARD_COUNT / SHARD_IDS pick the shards this process runs
+sharding = ShardConfig.from_env()
 
 # Initialize bot with intents and application ID
-class MyBot(commands.Bot):
+class MyBot(sharding.bot_class):
     async def setup_hook(self):
+        # Watch for synchronous work blocking the event loop (threshold in seconds, 0 to disable)
+        stall_threshold = float(os.getenv('LOOP_STALL_THRESHOLD', '0.5'))
+        self.loop_watchdog = LoopWatchdog(threshold=stall_threshold) if stall_threshold > 0 else None
+        if self.loop_watchdog is not None:
+            self.loop_watchdog.start()
+
+        # Shared data stores are created before any cog so they can be injected into them
+        self.projects = await open_project_store()
+        # Member/user lookups that fetch what isn't cached; warms the member cache after ready in lazy chunking mode
+        self.member_cache = MemberCache(self)
+        self.ready_after = None
+        self.first_interaction_after = None
+        # Per-shard connection state, latency and event rate for /stats and /metrics (sharded only)
+        self.shard_monitor = ShardMonitor(self, STARTED_AT) if sharding.enabled else None
+        if self.shard_monitor is not None:
+            self.shard_monitor.start()
+        # Syncs slash commands only when they changed; the hash of the last sync is kept on disk.
+        # Every guild in GUILD_IDS is its own scope; with the shards split over processes, only the
+        # process running a scope's shard syncs it.
+        self.command_sync = CommandSync(
+            self.tree,
+            guild_ids=[guild_id for guild_id in GUILD_IDS if sharding.runs_guild(guild_id)],
+            include_global=sharding.runs_shard(0)
+        )
+        # Every command's latency and outcome histograms are in self.tree.metrics; logged as JSON periodically
+        metrics_log_interval = float(os.getenv('COMMAND_METRICS_LOG_INTERVAL', '300'))
+        if metrics_log_interval > 0:
+            self.tree.metrics.start_logging(metrics_log_interval)
+        # Reloads single cogs in place (/reload-cog, or on file changes with COG_WATCH=1)
+        self.cog_reloader = CogReloader(self)
+
         logger.info("Bot is starting up, loading cogs...")
-        cogs_dir = './cogs'
-        if not os.path.isdir(cogs_dir):
-            logger.warning(f"Cog directory '{cogs_dir}' does not exist. No cogs loaded.")
+        if not os.path.isdir(COGS_DIR):
+            logger.warning(f"Cog directory '{COGS_DIR}' does not exist. No cogs loaded.")
         else:
-            for filename in os.listdir(cogs_dir):
-                if filename.endswith('.py') and filename != '__init__.py':
-                    cog = f'cogs.{filename[:-3]}'
-                    try:
-                        await self.load_extension(cog)
-                        logger.info(f"Loaded extension: {cog}")
-                    except Exception as e:
-                        logger.error(f"Failed to load extension {cog}: {e}", exc_info=True)
+            # Independent cogs load concurrently; a cog can declare LOAD_AFTER / LOAD_PRIORITY for ordering
+            start = time.perf_counter()
+            self.startup_profile = await load_extensions(self, extensions)
+            logger.info(format_startup_profile(self.startup_profile, time.perf_counter() - start))
+            if os.getenv('COG_WATCH', '0') == '1':
+                self.cog_reloader.start_watching(COGS_DIR, interval=float(os.getenv('COG_WATCH_INTERVAL', '1.0')))
 
-bot = MyBot(command_prefix='!', intents=intents, application_id=1409939541229436998)
+        self.rest_metrics = rest_metrics
+        self.metrics_server = None
+        if METRICS_PORT > 0:
+            self.metrics_server = MetricsServer(self, host=os.getenv('METRICS_HOST', '127.0.0.1'), port=METRICS_PORT)
+            await self.metrics_server.start()
+
+    async def close(self):
+        # The cog watcher stops first so nothing is reloaded during shutdown
+        if hasattr(self, 'cog_reloader'):
+            await self.cog_reloader.close()
+        if getattr(self, 'metrics_server', None) is not None:
+            await self.metrics_server.close()
+        if getattr(self, 'shard_monitor', None) is not None:
+            await self.shard_monitor.close()
+        # Cogs are unloaded first so they can finish any writes before the stores close
+        await super().close()
+        await self.tree.metrics.close()
+        if hasattr(self, 'member_cache'):
+            await self.member_cache.close()
+        if hasattr(self, 'projects'):
+            await self.projects.close()
+        if getattr(self, 'loop_watchdog', None) is not None:
+            await self.loop_watchdog.stop()
+
+# With MEMBER_CHUNKING=lazy, guild member lists aren't downloaded before on_ready (only matters with the members intent)
+bot = MyBot(
+    command_prefix='!',
+    intents=intents,
+    member_cache_flags=member_cache_flags,
+    chunk_guilds_at_startup=intents.members and member_chunking_mode() != 'lazy',
+    # The tree times every command, and the HTTP trace attributes Discord API time to the command being handled
+    tree_cls=InstrumentedCommandTree,
+    http_trace=http_trace_config(rest_metrics),
+    # Dispatches on_socket_event_type, so the metrics endpoint can count gateway events by type
+    enable_debug_events=METRICS_PORT > 0,
+    application_id=1409939541229436998,
+    **sharding.bot_options()
+)
 
 @bot.event
 async def on_ready():
     logger.info(f'Logged in as {bot.user.name}#{bot.user.discriminator} (ID: {bot.user.id})')
-    logger.info("Bot is ready, starting command sync...")
+    if bot.ready_after is None:
+        bot.ready_after = time.perf_counter() - STARTED_AT
+        shards = f", {len(bot.shards)} shards" if sharding.enabled else ""
+        logger.info(f"Ready {bot.ready_after:.2f}s after start (member chunking: {bot.member_cache.mode}{shards}).")
+        # When sharded, each shard's guilds were already handed to the warm-up in on_shard_ready
+        if not sharding.enabled:
+            bot.member_cache.start_warm_up()
+    # on_ready fires again after every reconnect (once all shards are ready when sharded);
+    # the commands only need syncing once per process
+    if bot.command_sync.synced:
+        logger.info("Reconnected, slash commands were already synced by this process.")
+        return
+    logger.info("Bot is ready, checking whether slash commands need syncing...")
     try:
-        # Sync all commands specifically to the guild.
-        # This will instantly update all commands (from all cogs)
-        # without waiting for the global command cache to refresh.
-        guild_id = 1144662039504109721
-        synced = await bot.tree.sync(guild=discord.Object(id=guild_id))
-        logger.info(f"Successfully synced {len(synced)} slash commands to guild {guild_id}.")
-        if len(synced) == 0:
-            logger.warning("No slash commands were synced. Check if cogs are loaded and commands are registered correctly.")
-        for command in bot.tree.get_commands(guild=discord.Object(id=guild_id)):
-            logger.info(f"Registered command: {command.name}")
+        # Syncs the guild commands (instant) and the global ones, but only those that changed.
+        # Set FORCE_COMMAND_SYNC=1 to sync regardless, or use /sync-commands while running.
+        force = os.getenv('FORCE_COMMAND_SYNC', '0') == '1'
+        await bot.command_sync.sync(force=force)
+        if any(not bot.tree.get_commands(guild=guild) for guild in bot.command_sync.guilds if guild is not None):
+            logger.warning("No guild slash commands are registered. Check if cogs are loaded and commands are registered correctly.")
     except Exception as e:
         logger.error(f"Failed to sync slash commands: {e}", exc_info=True)
     logger.info('------')
 
+@bot.event
+async def on_shard_ready(shard_id):
+    # Only dispatched when sharded. In lazy member chunking mode the shard's guilds are chunked in
+    # the background right away, without waiting for the other shards.
+    bot.member_cache.start_warm_up(shard_id)
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if bot.first_interaction_after is None:
+        bot.first_interaction_after = time.perf_counter() - STARTED_AT
+        logger.info(
+            f"First interaction received {bot.first_interaction_after:.2f}s after start "
+            f"(ready after {bot.ready_after or 0:.2f}s, member chunking: {bot.member_cache.mode})."
+        )
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     if isinstance(error, app_commands.CommandOnCooldown):
@@ -105,7 +214,8 @@ def run_bot():
         print(error_message, file=sys.stderr)
         sys.exit(1)
     else:
-        bot.run(token)
+        # discord.py's own log handler is left out, so its records go through the same queue
+        bot.run(token, log_handler=None)
 
 if __name__ == "__main__":
     run_bot()
@@ -22,9 +22,14 @@ from discord.ext import commands
 from discord.ui import Select, View, Modal, TextInput
 import logging
 
+from utils.guild_config import HOME_GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for guild roles and the applications channel
+INTENTS = ["guilds"]
+
 class ApplyCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -66,7 +71,7 @@ class ApplyCog(commands.Cog):
         logger.info("ApplyCog initialized successfully")
 
     @app_commands.command(name='apply-dev', description='Apply for a developer role')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     async def apply_dev(self, interaction: discord.Interaction):
         try:
             if not self.role_ids:
@@ -130,7 +135,7 @@ class ApplicationModal(Modal):
             embed.set_footer(text=f"User ID: {interaction.user.id}")
 
             # Send to configured channel with approval view
-            channel = self.cog.bot.get_channel(self.cog.application_channel_id)
+            channel = interaction.guild.get_channel(self.cog.application_channel_id)
             if not channel:
                 await interaction.response.send_message("Error: Application channel not found.", ephemeral=True)
                 logger.error(f"Application channel {self.cog.application_channel_id} not found")
@@ -169,7 +174,7 @@ class ApprovalView(View):
             await interaction.response.send_message("Application accepted and role assigned.", ephemeral=True)
             
             # Send embed to the application channel
-            channel = self.cog.bot.get_channel(self.cog.application_channel_id)
+            channel = interaction.guild.get_channel(self.cog.application_channel_id)
             if channel:
                 channel_embed = discord.Embed(
                     title="Application Accepted",
@@ -223,7 +228,7 @@ class DeclineModal(Modal):
             await interaction.response.send_message("Application declined and reason sent.", ephemeral=True)
             
             # Send embed to the application channel
-            channel = self.cog.bot.get_channel(self.cog.application_channel_id)
+            channel = interaction.guild.get_channel(self.cog.application_channel_id)
             if channel:
                 channel_embed = discord.Embed(
                     title="Application Declined",
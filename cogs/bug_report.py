@@ -7,9 +7,14 @@ from discord.ext import commands
 from discord.ui import Select, View, Modal, TextInput
 import logging
 
+from utils.guild_config import HOME_GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for guild roles and the bug report channel
+INTENTS = ["guilds"]
+
 class BugReportCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -20,7 +25,7 @@ class BugReportCog(commands.Cog):
         logger.info("BugReportCog initialized successfully")
 
     @app_commands.command(name='bug-report', description='Submit a bug report')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     async def bug_report_command(self, interaction: discord.Interaction):
         try:
             # Create a dropdown menu for topic selection
@@ -91,7 +96,7 @@ class BugReportModal(Modal):
                 embed.set_image(url=image_link)
             
             # Send to the configured channel
-            channel = self.cog.bot.get_channel(self.cog.bug_report_channel_id)
+            channel = interaction.guild.get_channel(self.cog.bug_report_channel_id)
             if not channel:
                 await interaction.response.send_message("Error: Bug report channel not found.", ephemeral=True)
                 logger.error(f"Bug report channel {self.cog.bug_report_channel_id} not found")
@@ -7,6 +7,8 @@ from discord.ext import commands
 import logging
 import re
 
+from utils.guild_config import GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -17,7 +19,7 @@ class ColorCog(commands.Cog):
 
     @app_commands.command(name='color', description='Displays a color from a hex code.')
     @app_commands.describe(hex_code='The hex code for the color (e.g., #FF5733 or FF5733).')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def color_command(self, interaction: discord.Interaction, hex_code: str):
         try:
             # Sanitize and validate the hex code
@@ -6,9 +6,14 @@ from discord import app_commands
 from discord.ext import commands
 import logging
 
+from utils.guild_config import HOME_GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for the announcements channel
+INTENTS = ["guilds"]
+
 # Placeholder for announcements channel ID
 # REPLACE WITH YOUR ACTUAL ANNOUNCEMENTS CHANNEL ID
 ANNOUNCEMENTS_CHANNEL_ID = 123456789012345678  # Example ID
@@ -21,11 +26,11 @@ class DevOfTheMonthCog(commands.Cog):
     @app_commands.command(name='dev-of-the-month', description='Recognizes an outstanding member (admin only).')
     @app_commands.describe(member='The member to recognize.')
     @app_commands.checks.has_permissions(administrator=True)
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     async def dev_of_the_month(self, interaction: discord.Interaction, member: discord.Member):
         """Recognizes an outstanding member of the month."""
         try:
-            channel = self.bot.get_channel(ANNOUNCEMENTS_CHANNEL_ID)
+            channel = interaction.guild.get_channel(ANNOUNCEMENTS_CHANNEL_ID)
             if not channel:
                 await interaction.response.send_message("Announcements channel not found. Please configure the channel ID.", ephemeral=True)
                 return
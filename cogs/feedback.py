@@ -7,9 +7,14 @@ from discord.ext import commands
 from discord.ui import Modal, TextInput
 import logging
 
+from utils.guild_config import HOME_GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for the feedback channel
+INTENTS = ["guilds"]
+
 class FeedbackCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -20,7 +25,7 @@ class FeedbackCog(commands.Cog):
         logger.info("FeedbackCog initialized successfully")
 
     @app_commands.command(name='feedback', description='Submit feedback for a developer')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     async def feedback_command(self, interaction: discord.Interaction):
         try:
             modal = FeedbackModal(self)
@@ -91,7 +96,7 @@ class FeedbackModal(Modal):
             embed.set_footer(text=f"Submitted by {interaction.user.name} | User ID: {interaction.user.id}")
             
             # Send to the configured channel
-            channel = self.cog.bot.get_channel(self.cog.feedback_channel_id)
+            channel = interaction.guild.get_channel(self.cog.feedback_channel_id)
             if not channel:
                 await interaction.response.send_message("Error: Feedback channel not found.", ephemeral=True)
                 logger.error(f"Feedback channel {self.cog.feedback_channel_id} not found")
@@ -6,28 +6,32 @@ from discord import app_commands
 from discord.ext import commands
 import logging
 
+from utils.guild_config import HOME_GUILDS, staff_role_id
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for guild roles and the investigation category
+INTENTS = ["guilds"]
+
 class FlagCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Configurable role ID that can use this command
-        self.allowed_role_id = 1409970906981339317
         # Configurable category ID where new channels will be created
         self.category_id = 1409971086392557618
         logger.info("FlagCog initialized successfully")
 
     @app_commands.command(name='flag', description='Create a private investigation channel for a user.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     @app_commands.describe(user='The user to create an investigation channel for.')
     async def flag_command(self, interaction: discord.Interaction, user: discord.Member):
         try:
-            # Check if the user has the allowed role
-            allowed_role = interaction.guild.get_role(self.allowed_role_id)
+            # Check if the user has the staff role of the guild the command was used in
+            allowed_role_id = staff_role_id(interaction.guild.id)
+            allowed_role = interaction.guild.get_role(allowed_role_id)
             if not allowed_role:
                 await interaction.response.send_message("Error: Allowed role not found.", ephemeral=True)
-                logger.error(f"Allowed role {self.allowed_role_id} not found in guild {interaction.guild.id}")
+                logger.error(f"Allowed role {allowed_role_id} not found in guild {interaction.guild.id}")
                 return
 
             if allowed_role not in interaction.user.roles:
@@ -51,7 +55,7 @@ class FlagCog(commands.Cog):
                 topic=f"Investigation channel for {user.display_name} ({user.id})",
                 overwrites={
                     interaction.guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                    interaction.guild.get_role(self.allowed_role_id): discord.PermissionOverwrite(read_messages=True),
+                    interaction.guild.get_role(allowed_role_id): discord.PermissionOverwrite(read_messages=True),
                     user: discord.PermissionOverwrite(read_messages=False)
                 }
             )
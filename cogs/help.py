@@ -1,7 +1,7 @@
 # cogs/help.py
 # Implements a /help slash command that displays an embed with buttons for "Rules" and "Freelancing Roles."
 # Clicking a button sends a new embed with relevant information.
-# The command is restricted to the guild with ID 1144662039504109721.
+# The command is registered in the guilds listed in GUILD_IDS (see utils/guild_config.py).
 # The setup function is now asynchronous to properly await bot.add_cog().
 
 import discord
@@ -10,6 +10,8 @@ from discord.ext import commands
 from discord.ui import Button, View
 import logging
 
+from utils.guild_config import GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ class HelpCog(commands.Cog):
         logger.info("HelpCog initialized successfully")
 
     @app_commands.command(name='help', description='Get help with server rules or freelancing roles')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))  # Restrict to specific guild
+    @app_commands.guilds(*GUILDS)
     async def help_command(self, interaction: discord.Interaction):
         try:
             # Initial embed asking what the user needs help with
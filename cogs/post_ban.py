@@ -6,14 +6,17 @@ from discord import app_commands
 from discord.ext import commands
 import logging
 
+from utils.guild_config import HOME_GUILDS, staff_role_id
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for guild roles and the ban log channels
+INTENTS = ["guilds"]
+
 class PostBanCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Configurable role ID that can use this command
-        self.allowed_role_id = 1409970906981339317
         # Channels to apply the post ban to
         self.banned_channels = [
             1408415131590852761,
@@ -25,14 +28,15 @@ class PostBanCog(commands.Cog):
     @app_commands.command(name='post-ban', description='Bans a user from posting in specific channels.')
     @app_commands.describe(user='The user to post-ban.')
     @app_commands.describe(reason='The reason for the post-ban.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*HOME_GUILDS)
     async def post_ban_command(self, interaction: discord.Interaction, user: discord.Member, reason: str):
         try:
-            # Check if the command runner has the allowed role
-            allowed_role = interaction.guild.get_role(self.allowed_role_id)
+            # Check if the command runner has the staff role of the guild the command was used in
+            allowed_role_id = staff_role_id(interaction.guild.id)
+            allowed_role = interaction.guild.get_role(allowed_role_id)
             if not allowed_role:
                 await interaction.response.send_message("Error: Allowed role not found.", ephemeral=True)
-                logger.error(f"Allowed role {self.allowed_role_id} not found in guild {interaction.guild.id}")
+                logger.error(f"Allowed role {allowed_role_id} not found in guild {interaction.guild.id}")
                 return
 
             if allowed_role not in interaction.user.roles:
@@ -63,7 +67,7 @@ class PostBanCog(commands.Cog):
 
             # Apply channel-specific permission overwrites to prevent posting
             for channel_id in self.banned_channels:
-                channel = self.bot.get_channel(channel_id)
+                channel = interaction.guild.get_channel(channel_id)
                 if channel:
                     await channel.set_permissions(user, send_messages=False)
                     logger.info(f"Post-ban applied to user {user.id} in channel {channel.id}.")
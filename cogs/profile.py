@@ -1,38 +1,31 @@
 # cogs/profile.py
 # Implements a /profile command that allows a user to create and view a personal profile.
-# The profile data is now stored in a JSON file for persistence across bot restarts.
+# Each profile is stored in its own file under profiles/ and loaded on demand, with an
+# LRU cache in front, so startup doesn't parse every member's profile.
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-import json
 import os
 
+from utils.guild_config import GUILDS
+from utils.profile_store import ProfileStore
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# File path for the profile data
+# Directory holding one file per profile
+PROFILES_DIR = 'profiles'
+
+# The old single-file profile store, migrated into PROFILES_DIR on first start
 PROFILES_FILE = 'profiles.json'
 
-def load_profiles():
-    """Loads profiles from the JSON file."""
-    if os.path.exists(PROFILES_FILE):
-        with open(PROFILES_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logger.error("profiles.json file is corrupted. Starting with an empty profile dictionary.")
-                return {}
-    return {}
-
-def save_profiles(profiles_data):
-    """Saves profiles to the JSON file."""
-    with open(PROFILES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(profiles_data, f, indent=4)
-
-# Load profiles at the start
-profiles = load_profiles()
+# Seconds to wait after a profile change before writing, so bursts of edits share one write
+PROFILES_FLUSH_INTERVAL = 2.0
+
+# Number of profiles kept in memory (environment variable PROFILE_CACHE_SIZE overrides it)
+PROFILE_CACHE_SIZE = int(os.getenv('PROFILE_CACHE_SIZE', '1000'))
 
 class ProfileSetupModal(discord.ui.Modal, title='Create/Update Your Profile'):
     """
@@ -89,14 +82,13 @@ class ProfileSetupModal(discord.ui.Modal, title='Create/Update Your Profile'):
         """
         user_id = str(interaction.user.id) # Use string for dictionary key
         
-        # Store the data and save to the file
-        profiles[user_id] = {
+        # Store the data and schedule a background write to the user's profile file
+        self.cog.profiles.set(user_id, {
             "name": self.name_input.value,
             "pronouns": self.pronouns_input.value,
             "intro": self.intro_input.value,
             "links": self.links_input.value or "Not provided" # Handle empty optional field
-        }
-        save_profiles(profiles)
+        })
         
         embed = discord.Embed(
             title="Profile Updated!",
@@ -132,7 +124,7 @@ class ProfileOptionsView(discord.ui.View):
         user_id = str(interaction.user.id)
 
         if selected_option == "view":
-            profile_data = profiles[user_id]
+            profile_data = await self.cog.profiles.get(user_id)
             embed = discord.Embed(
                 title=f"{interaction.user.name}'s Profile!",
                 description=(
@@ -149,7 +141,7 @@ class ProfileOptionsView(discord.ui.View):
             logger.info(f"Profile for {user_id} viewed via dropdown by {interaction.user.id}.")
         
         elif selected_option == "update":
-            existing_data = profiles.get(user_id)
+            existing_data = await self.cog.profiles.get(user_id)
             modal = ProfileSetupModal(self.cog, existing_data)
             await interaction.response.send_modal(modal)
             logger.info(f"User {user_id} chose to update their profile via dropdown.")
@@ -157,19 +149,34 @@ class ProfileOptionsView(discord.ui.View):
 class ProfileCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.profiles = None # ProfileStore, opened in cog_load
         logger.info("ProfileCog initialized successfully")
 
+    async def cog_load(self):
+        """Opens the profile store; no profile is read until someone asks for it."""
+        self.profiles = await ProfileStore.open(
+            PROFILES_DIR,
+            migrate_from=PROFILES_FILE,
+            cache_size=PROFILE_CACHE_SIZE,
+            flush_interval=PROFILES_FLUSH_INTERVAL
+        )
+
+    async def cog_unload(self):
+        """Writes any pending profile changes before the cog is unloaded or the bot shuts down."""
+        await self.profiles.close()
+
     @app_commands.command(name='profile', description='View or create a user profile.')
     @app_commands.describe(user='The user whose profile you want to view. Leave empty for your own.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def profile_command(self, interaction: discord.Interaction, user: discord.Member = None):
         try:
             target_user = user or interaction.user
             user_id = str(target_user.id)
+            profile_data = await self.profiles.get(user_id)
             
             # Scenario 1: User is viewing their own profile
             if target_user == interaction.user:
-                if user_id in profiles:
+                if profile_data is not None:
                     # Profile exists, show the dropdown menu
                     view = ProfileOptionsView(self, target_user)
                     await interaction.response.send_message("What would you like to do?", view=view, ephemeral=True)
@@ -180,9 +187,7 @@ class ProfileCog(commands.Cog):
                 return
 
             # Scenario 2: User is viewing someone else's profile
-            if user_id in profiles:
-                profile_data = profiles[user_id]
-                
+            if profile_data is not None:
                 # Create the formatted embed
                 embed = discord.Embed(
                     title=f"{target_user.name}'s Profile!",
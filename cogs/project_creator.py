@@ -6,43 +6,12 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-import json
-import os
-import random
-import string
+
+from utils.guild_config import GUILDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# File path for the project data
-PROJECTS_FILE = 'projects.json'
-
-def load_projects():
-    """Loads projects from the JSON file."""
-    if os.path.exists(PROJECTS_FILE):
-        with open(PROJECTS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logger.error("projects.json file is corrupted. Starting with an empty project dictionary.")
-                return {}
-    return {}
-
-def save_projects(projects_data):
-    """Saves projects to the JSON file."""
-    with open(PROJECTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(projects_data, f, indent=4)
-
-def generate_unique_id():
-    """Generates a unique 6-character alphanumeric ID."""
-    characters = string.ascii_uppercase + string.digits
-    while True:
-        project_id = ''.join(random.choice(characters) for _ in range(6))
-        projects = load_projects()
-        # Check if the ID is already in use
-        if project_id not in projects:
-            return project_id
-
 class ProjectSelectView(discord.ui.View):
     """
     A view with a dropdown menu to select a project department.
@@ -72,19 +41,23 @@ class ProjectSelectView(discord.ui.View):
         Generates a unique ID and saves the project.
         """
         department = select.values[0]
-        project_id = generate_unique_id()
+        projects = self.cog.projects
+        # Reserves the ID straight away, so concurrent creations can't be handed the same one
+        project_id = projects.ids.allocate()
         
-        projects = load_projects()
-        # Save the new project to the dictionary and file
-        projects[project_id] = {
-            "department": department,
-            "creator_id": str(self.creator.id),
-            "recipient_id": str(self.recipient.id),
-            "creator_name": self.creator.name,
-            "recipient_name": self.recipient.name,
-            "status": "Created"  # Initial status for a new project
-        }
-        save_projects(projects)
+        # Save the new project to the shared project store
+        try:
+            await projects.create(project_id, {
+                "department": department,
+                "creator_id": str(self.creator.id),
+                "recipient_id": str(self.recipient.id),
+                "creator_name": self.creator.name,
+                "recipient_name": self.recipient.name,
+                "status": "Created"  # Initial status for a new project
+            })
+        except Exception:
+            projects.ids.release(project_id)
+            raise
         
         # Create and send the DM embed to the recipient
         dm_embed = discord.Embed(
@@ -143,12 +116,13 @@ class ProjectSelectView(discord.ui.View):
 class ProjectCreatorCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.projects = bot.projects # Shared ProjectStore owned by the bot
         logger.info("ProjectCreatorCog initialized successfully")
 
     @app_commands.command(name='set-project-id', description='Creates a new project and gives it a unique ID.')
     @app_commands.describe(creator='The user who created the project.')
     @app_commands.describe(recipient='The user who is receiving the commission.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def set_project_id_command(self, interaction: discord.Interaction, creator: discord.Member, recipient: discord.Member):
         try:
             view = ProjectSelectView(self, creator, recipient)
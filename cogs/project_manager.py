@@ -6,31 +6,13 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-import json
-import os
+import asyncio
+
+from utils.guild_config import GUILDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# File path for the project data
-PROJECTS_FILE = 'projects.json'
-
-def load_projects():
-    """Loads projects from the JSON file."""
-    if os.path.exists(PROJECTS_FILE):
-        with open(PROJECTS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logger.error("projects.json file is corrupted. Starting with an empty project dictionary.")
-                return {}
-    return {}
-
-def save_projects(projects_data):
-    """Saves projects to the JSON file."""
-    with open(PROJECTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(projects_data, f, indent=4)
-
 class ProjectManageStatusView(discord.ui.View):
     """
     A view with a dropdown menu to update the project status.
@@ -55,12 +37,9 @@ class ProjectManageStatusView(discord.ui.View):
         """
         new_status = select.values[0]
         
-        projects = load_projects()
-        # Check if the project ID still exists
-        if self.project_id in projects:
-            project_data = projects[self.project_id]
-            project_data["status"] = new_status
-            save_projects(projects)
+        # Update the status in the shared project store (None if the project no longer exists)
+        project_data = await self.cog.projects.update_status(self.project_id, new_status)
+        if project_data is not None:
             
             embed = discord.Embed(
                 title="Status Updated!",
@@ -74,8 +53,14 @@ class ProjectManageStatusView(discord.ui.View):
                 recipient_id = int(project_data.get("recipient_id"))
                 creator_id = int(project_data.get("creator_id"))
                 
-                recipient = self.cog.bot.get_user(recipient_id)
-                creator = self.cog.bot.get_user(creator_id)
+                # Users are only cached when the bot shares a cached guild with them, so fall back to fetching
+                try:
+                    recipient, creator = await asyncio.gather(
+                        self.cog.bot.member_cache.get_user(recipient_id),
+                        self.cog.bot.member_cache.get_user(creator_id)
+                    )
+                except discord.HTTPException:
+                    recipient = creator = None
                 
                 if recipient and creator:
                     dm_embed = discord.Embed(
@@ -109,20 +94,19 @@ class ProjectManageStatusView(discord.ui.View):
 class ProjectManagerCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.projects = bot.projects # Shared ProjectStore owned by the bot
         logger.info("ProjectManagerCog initialized successfully")
         
     @app_commands.command(name='manage-status', description='Manages the status of a project (creator only).')
     @app_commands.describe(project_id='The unique ID of the project to manage.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def manage_status_command(self, interaction: discord.Interaction, project_id: str):
         try:
-            projects = load_projects()
             project_id = project_id.upper()
-            if project_id not in projects:
+            project = await self.projects.get(project_id)
+            if project is None:
                 await interaction.response.send_message("That project ID does not exist.", ephemeral=True)
                 return
-
-            project = projects[project_id]
             
             # Check if the user is the project creator
             if str(interaction.user.id) == project["creator_id"]:
@@ -5,41 +5,26 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-import json
-import os
+
+from utils.guild_config import GUILDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# File path for the project data
-PROJECTS_FILE = 'projects.json'
-
-def load_projects():
-    """Loads projects from the JSON file."""
-    if os.path.exists(PROJECTS_FILE):
-        with open(PROJECTS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logger.error("projects.json file is corrupted. Starting with an empty project dictionary.")
-                return {}
-    return {}
-
 class ProjectViewerCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.projects = bot.projects # Shared ProjectStore owned by the bot
         logger.info("ProjectViewerCog initialized successfully")
 
     @app_commands.command(name='project-status', description='Shows the current status of a project.')
     @app_commands.describe(project_id='The unique ID of the project.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def project_status_command(self, interaction: discord.Interaction, project_id: str):
         try:
-            projects = load_projects()
             project_id = project_id.upper()
-            if project_id in projects:
-                project = projects[project_id]
-                
+            project = await self.projects.get(project_id)
+            if project is not None:
                 embed = discord.Embed(
                     title=f"Project Status: `{project_id}`",
                     description=(
@@ -0,0 +1,75 @@
+# cogs/reload_cog.py
+# Implements a /reload-cog command for staff to reload one cog without restarting the bot.
+# The bot stays connected; the slash commands are only synced again if the cog's commands changed.
+# Set COG_WATCH=1 to reload cogs automatically when their files change.
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import logging
+
+from utils.guild_config import GUILDS, staff_only
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class ReloadCogCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        logger.info("ReloadCogCog initialized successfully")
+
+    async def extension_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggests the loaded extensions matching what was typed."""
+        current = current.lower()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in sorted(self.bot.extensions)
+            if current in name.lower()
+        ][:25]
+
+    @app_commands.command(name='reload-cog', description='Reloads a cog without restarting the bot.')
+    @app_commands.guilds(*GUILDS)
+    @app_commands.describe(extension='The cog to reload, e.g. cogs.tags.')
+    @app_commands.autocomplete(extension=extension_autocomplete)
+    @staff_only()
+    async def reload_cog(self, interaction: discord.Interaction, extension: str):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        if extension not in self.bot.extensions:
+            await interaction.followup.send(f"`{extension}` is not a loaded cog.", ephemeral=True)
+            return
+        logger.info(f"Reload of {extension} requested by {interaction.user.id}.")
+        # Reloading this cog replaces it mid-command, so the reply only uses the interaction
+        result = await self.bot.cog_reloader.reload(extension)
+        if result.error is not None:
+            await interaction.followup.send(
+                f"Failed to reload `{extension}`, the previous version is still running: {result.error}",
+                ephemeral=True
+            )
+            return
+        message = f"Reloaded `{extension}` in {result.time:.2f}s."
+        if result.carried:
+            message += f" Kept the state of: {', '.join(result.carried)}."
+        if result.synced_scopes:
+            message += f" Its commands changed, so they were synced ({', '.join(result.synced_scopes)})."
+        else:
+            message += " Its commands are unchanged, so nothing was synced."
+        await interaction.followup.send(message, ephemeral=True)
+
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        """Handles errors for this cog's commands."""
+        if isinstance(error, app_commands.MissingAnyRole):
+            await interaction.response.send_message("You do not have the required permissions to use this command.", ephemeral=True)
+        else:
+            logger.error(f"Error in reload-cog command: {error}", exc_info=True)
+            if interaction.response.is_done():
+                await interaction.followup.send("An unexpected error occurred while reloading the cog.", ephemeral=True)
+            else:
+                await interaction.response.send_message("An unexpected error occurred while reloading the cog.", ephemeral=True)
+
+async def setup(bot):
+    try:
+        await bot.add_cog(ReloadCogCog(bot))
+        logger.info("ReloadCogCog added to bot successfully")
+    except Exception as e:
+        logger.error(f"Failed to add ReloadCogCog to bot: {e}", exc_info=True)
+        raise
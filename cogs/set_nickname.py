@@ -6,27 +6,31 @@ from discord import app_commands
 from discord.ext import commands
 import logging
 
+from utils.guild_config import GUILDS, staff_role_id
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for guild roles
+INTENTS = ["guilds"]
+
 class SetNicknameCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Configurable role ID that can use this command
-        self.allowed_role_id = 1409970906981339317
         logger.info("SetNicknameCog initialized successfully")
 
     @app_commands.command(name='set-nickname', description='Changes a users nickname.')
     @app_commands.describe(user='The user whose nickname you want to change.')
     @app_commands.describe(nickname='The new nickname for the user.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def set_nickname_command(self, interaction: discord.Interaction, user: discord.Member, nickname: str):
         try:
-            # Check if the user has the allowed role
-            allowed_role = interaction.guild.get_role(self.allowed_role_id)
+            # Check if the user has the staff role of the guild the command was used in
+            allowed_role_id = staff_role_id(interaction.guild.id)
+            allowed_role = interaction.guild.get_role(allowed_role_id)
             if not allowed_role:
                 await interaction.response.send_message("Error: Allowed role not found.", ephemeral=True)
-                logger.error(f"Allowed role {self.allowed_role_id} not found in guild {interaction.guild.id}")
+                logger.error(f"Allowed role {allowed_role_id} not found in guild {interaction.guild.id}")
                 return
 
             if allowed_role not in interaction.user.roles:
@@ -5,24 +5,34 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
+import math
 import os
 import psutil
 
+from utils.guild_config import GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Gateway intents this cog needs: the guild cache, for the guild list and member counts
+INTENTS = ["guilds"]
+
+# Most shards listed one per line in the embed (the field is limited to 1024 characters)
+MAX_SHARD_LINES = 12
+
 class StatsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         logger.info("StatsCog initialized successfully")
 
     @app_commands.command(name='stats', description='Displays bot statistics.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def stats_command(self, interaction: discord.Interaction):
         try:
             # Get bot statistics
             guilds = len(self.bot.guilds)
-            users = len(self.bot.users)
+            # Member counts come with the guilds, so they don't need the member cache
+            members = sum(guild.member_count or 0 for guild in self.bot.guilds)
             
             # Get memory usage
             process = psutil.Process(os.getpid())
@@ -33,9 +43,85 @@ class StatsCog(commands.Cog):
                 color=discord.Color.gold()
             )
             embed.add_field(name="Servers", value=guilds, inline=True)
-            embed.add_field(name="Users", value=users, inline=True)
+            embed.add_field(name="Members", value=members, inline=True)
             embed.add_field(name="Memory Usage", value=f"{memory_usage_mb:.2f} MB", inline=True)
             embed.add_field(name="Discord.py Version", value=discord.__version__, inline=True)
+            # The average over this process's shards when sharded
+            if math.isfinite(self.bot.latency):
+                embed.add_field(name="Gateway Latency", value=f"{self.bot.latency * 1000:.0f} ms", inline=True)
+
+            # Health of every shard this process runs, with the least healthy ones first
+            shard_monitor = getattr(self.bot, 'shard_monitor', None)
+            if shard_monitor is not None:
+                shards = shard_monitor.snapshot()
+                shards.sort(key=lambda shard: (shard["state"] == "ready", -(shard["latency"] if math.isfinite(shard["latency"]) else math.inf)))
+                lines = []
+                for shard in shards[:MAX_SHARD_LINES]:
+                    latency = f"{shard['latency'] * 1000:.0f} ms" if math.isfinite(shard["latency"]) else "no heartbeat yet"
+                    event_rate = f"{shard['event_rate']:.1f}" if shard["event_rate"] is not None else "n/a"
+                    lines.append(
+                        f"`#{shard['id']}` {shard['state']}, {latency}, {shard['guilds']} servers, "
+                        f"{event_rate} events/s, {shard['disconnects']} disconnects"
+                    )
+                if len(shards) > MAX_SHARD_LINES:
+                    lines.append(f"...and {len(shards) - MAX_SHARD_LINES} more")
+                ready = sum(1 for shard in shards if shard["state"] == "ready")
+                embed.add_field(
+                    name=f"Shards ({ready}/{len(shards)} ready, {self.bot.shard_count} total)",
+                    value="\n".join(lines) or "No shards connected yet",
+                    inline=False
+                )
+
+            # How long the last start took to become ready and to answer its first interaction
+            ready_after = getattr(self.bot, 'ready_after', None)
+            if ready_after is not None:
+                value = f"Ready after {ready_after:.1f}s"
+                if self.bot.first_interaction_after is not None:
+                    value += f", first interaction after {self.bot.first_interaction_after:.1f}s"
+                value += f" (member chunking: {self.bot.member_cache.mode})"
+                if self.bot.member_cache.warm_up_time is not None:
+                    value += f"\nMember cache warmed up in {self.bot.member_cache.warm_up_time:.1f}s"
+                embed.add_field(name="Startup", value=value, inline=False)
+
+            # Latency of the slowest commands, from the command tree's metrics
+            metrics = getattr(self.bot.tree, 'metrics', None)
+            if metrics is not None and metrics.commands:
+                lines = []
+                for name, command_stats in metrics.slowest(limit=5):
+                    outcomes = command_stats.outcomes
+                    total = sum(outcomes.values())
+                    lines.append(
+                        f"`/{name}`: p95 {command_stats.handler.quantile(0.95) * 1000:.0f} ms "
+                        f"(first response {command_stats.first_response.quantile(0.95) * 1000:.0f} ms, "
+                        f"REST {command_stats.rest.quantile(0.95) * 1000:.0f} ms), "
+                        f"{total} runs, {total - outcomes['ok']} failed"
+                    )
+                embed.add_field(name="Slowest Commands", value="\n".join(lines), inline=False)
+
+            # Event loop stalls seen by the loop watchdog, if it is running
+            watchdog = getattr(self.bot, 'loop_watchdog', None)
+            if watchdog is not None:
+                stalls = watchdog.snapshot()
+                value = f"{stalls['stalls']} (longest {stalls['longest_stall'] * 1000:.0f} ms)"
+                if stalls['stalls_by_command']:
+                    worst = sorted(stalls['stalls_by_command'].items(), key=lambda item: item[1], reverse=True)[:3]
+                    value += "\n" + "\n".join(f"`{name}`: {count}" for name, count in worst)
+                embed.add_field(name="Event Loop Stalls", value=value, inline=False)
+
+            # Hit rate of the lazily loaded profile cache
+            profile_cog = self.bot.get_cog('ProfileCog')
+            if profile_cog is not None and profile_cog.profiles is not None:
+                cache = profile_cog.profiles.stats()
+                embed.add_field(
+                    name="Profile Cache",
+                    value=f"{cache['cached']}/{cache['capacity']} cached, {cache['hit_rate']:.0%} hit rate ({cache['hits']} hits, {cache['misses']} misses)",
+                    inline=False
+                )
+
+            # How full the project ID space is; IDs get longer once it is a quarter full
+            projects = getattr(self.bot, 'projects', None)
+            if projects is not None and projects.ids is not None:
+                embed.add_field(name="Project IDs", value=projects.ids.describe(), inline=False)
             
             await interaction.response.send_message(embed=embed)
             logger.info(f"Stats command used by {interaction.user.id}")
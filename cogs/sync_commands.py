@@ -0,0 +1,45 @@
+# cogs/sync_commands.py
+# Implements a /sync-commands command for administrators to push the slash commands to Discord.
+# The bot already syncs on startup when the commands changed; this is for forcing a sync,
+# e.g. after commands were edited or removed outside the bot.
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import logging
+
+from utils.guild_config import GUILDS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class SyncCommandsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        logger.info("SyncCommandsCog initialized successfully")
+
+    @app_commands.command(name='sync-commands', description='Syncs the slash commands with Discord.')
+    @app_commands.guilds(*GUILDS)
+    @app_commands.describe(force='Sync even if the commands have not changed since the last sync.')
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    async def sync_commands(self, interaction: discord.Interaction, force: bool = False):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            synced_scopes = await self.bot.command_sync.sync(force=force)
+            if synced_scopes:
+                await interaction.followup.send(f"Synced slash commands for: {', '.join(synced_scopes)}.", ephemeral=True)
+            else:
+                await interaction.followup.send("Slash commands are already up to date. Use `force` to sync anyway.", ephemeral=True)
+            logger.info(f"Command sync (force={force}) run by {interaction.user.id}; synced: {synced_scopes or 'nothing'}.")
+        except Exception as e:
+            logger.error(f"Error in sync-commands command: {e}", exc_info=True)
+            await interaction.followup.send("An error occurred while syncing the slash commands.", ephemeral=True)
+
+async def setup(bot):
+    try:
+        await bot.add_cog(SyncCommandsCog(bot))
+        logger.info("SyncCommandsCog added to bot successfully")
+    except Exception as e:
+        logger.error(f"Failed to add SyncCommandsCog to bot: {e}", exc_info=True)
+        raise
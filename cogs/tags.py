@@ -1,67 +1,111 @@
 # cogs/tags.py
 # This cog implements a versatile slash command group for managing and sending tags.
-# It uses a JSON file for persistent storage and restricts administrative
-# subcommands to a specific role.
+# Every guild has its own tags (see utils/tag_library.py), stored in JSON files, and
+# administrative subcommands are restricted to the guild's staff role.
 
+import aiohttp
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
-import os
 import logging
+import tempfile
+import time
+
+from utils.guild_config import GUILD_IDS, staff_only
+from utils.hot_reload import take_carried_state
+from utils.tag_library import TagLibrary
+from utils.tag_template import TagTemplate
+from utils.tag_transfer import TagImport, iter_lines, write_export
 
 # Set up logging for this cog
 logger = logging.getLogger(__name__)
 
-# File path for tag data
-TAGS_FILE = 'tags.json'
+# Gateway intents this cog needs: the guild cache, for the guild name and upload limit
+INTENTS = ["guilds"]
 
-def load_tags():
-    """
-    Loads tags from the JSON file.
-    Returns an empty dictionary if the file doesn't exist or is corrupted.
-    """
-    if os.path.exists(TAGS_FILE):
-        with open(TAGS_FILE, 'r', encoding='utf-8') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                logger.error("tags.json file is corrupted. Starting with an empty dictionary.")
-                return {}
-    return {}
-
-def save_tags(tags_data):
-    """Saves the current tag data to the JSON file."""
-    with open(TAGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tags_data, f, indent=4)
-    logger.info("Tags data saved to tags.json.")
+# Largest file /tag import accepts, and how often (seconds) it reports progress while reading
+MAX_IMPORT_BYTES = 50 * 1024 * 1024
+IMPORT_PROGRESS_INTERVAL = 2.0
+
+def placeholder_values(interaction: discord.Interaction):
+    """Values for the {user}, {mention}, {channel} and {server} tag placeholders."""
+    channel = interaction.channel
+    return {
+        "user": interaction.user.display_name,
+        "mention": interaction.user.mention,
+        "channel": channel.mention if hasattr(channel, "mention") else "",
+        "server": interaction.guild.name if interaction.guild else ""
+    }
 
 
 class TagsCog(commands.Cog):
     """
     A cog for managing and displaying custom tags.
     """
+    # Handed to the new instance on a hot reload, so no guild's tags are loaded, indexed and compiled again
+    RELOAD_STATE = ("libraries",)
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.tags = load_tags()
-        self.TAG_ADMIN_ROLE_ID = 1409970906981339317  # Your specified role ID
+        carried = take_carried_state(bot, "TagsCog")
+        # Each guild has its own tags: the configured guilds' are loaded with the cog, any other guild's on its first /tag
+        self.libraries = carried.get("libraries", {}) # guild id -> TagLibrary
+        for library in self.libraries.values():
+            library.reopen()
+        self._loading = {} # guild id -> task loading its library
+
+    async def cog_load(self):
+        """Loads the tags of the configured guilds up front, in worker threads, so their first /tag isn't slowed down."""
+        await asyncio.gather(*(self.library_for(guild_id) for guild_id in GUILD_IDS))
+
+    async def cog_unload(self):
+        """Closes every guild's tag journals and saves the usage counters before the cog is unloaded or the bot shuts down."""
+        for library in self.libraries.values():
+            await library.close()
+
+    async def library(self, interaction: discord.Interaction):
+        """The tag library of the guild the interaction came from."""
+        return await self.library_for(interaction.guild_id)
+
+    async def library_for(self, guild_id):
+        """The guild's tag library, loaded on first use. Concurrent first uses share one load."""
+        library = self.libraries.get(guild_id)
+        if library is not None:
+            return library
+        task = self._loading.get(guild_id)
+        if task is None:
+            task = self._loading[guild_id] = asyncio.create_task(TagLibrary.load(guild_id))
+        try:
+            library = await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._loading.pop(guild_id, None)
+        self.libraries[guild_id] = library
+        return library
 
     # This is the main command group for `/tag`
     # All subcommands will be part of this group.
     tag_group = app_commands.Group(
         name="tag",
-        description="Manage and send custom tags."
+        description="Manage and send custom tags.",
+        guild_only=True # Every server has its own tags
     )
 
     # Autocomplete function for the tag names
     # This provides suggestions as the user types, making it easier to use.
     async def tag_autocomplete(self, interaction: discord.Interaction, current: str):
-        """Autocompletes tag names for the user."""
-        choices = []
-        for tag_name in self.tags.keys():
-            if current.lower() in tag_name.lower():
-                choices.append(app_commands.Choice(name=tag_name, value=tag_name))
-        return choices[:25] # Limit to 25 choices for Discord's API limits
+        """Autocompletes tag names for the user, most popular matches first."""
+        library = await self.library(interaction)
+        query = current.lower()
+        # Limit to 25 choices for Discord's API limits
+        names = [tag_name for tag_name in library.usage.top() if query in tag_name.lower()][:25]
+        for tag_name in library.index.search(current, limit=25):
+            if len(names) >= 25:
+                break
+            if tag_name not in names:
+                names.append(tag_name)
+        return [app_commands.Choice(name=tag_name, value=tag_name) for tag_name in names]
 
     @tag_group.command(name="send", description="Sends a pre-defined tag.")
     @app_commands.describe(name="The name of the tag you want to send.")
@@ -71,42 +115,53 @@ class TagsCog(commands.Cog):
         Handles the /tag send command.
         Sends the content of a tag if it exists.
         """
-        if name in self.tags:
-            content = self.tags[name]
-            await interaction.response.send_message(content)
+        library = await self.library(interaction)
+        tag_name = library.aliases.get(name, name) # An alias resolves to its tag in one lookup
+        if tag_name in library.tags:
+            template = library.templates[tag_name]
+            messages = template.render(placeholder_values(interaction) if template.placeholders else {})
+            await interaction.response.send_message(messages[0])
+            # Content longer than one message was split into chunks when the tag was compiled
+            for message in messages[1:]:
+                await interaction.followup.send(message)
+            library.usage.record(tag_name)
             logger.info(f"Tag '{name}' sent by {interaction.user.name} ({interaction.user.id}).")
         else:
-            await interaction.response.send_message(
-                f"Sorry, a tag named `{name}` does not exist.",
-                ephemeral=True
-            )
+            message = f"Sorry, a tag named `{name}` does not exist."
+            suggestions = library.index.suggest(name)
+            if suggestions:
+                message += " Did you mean " + ", ".join(f"`{suggestion}`" for suggestion in suggestions) + "?"
+            await interaction.response.send_message(message, ephemeral=True)
             logger.warning(f"Attempted to send non-existent tag '{name}' by {interaction.user.id}.")
 
     @tag_group.command(name="create", description="Creates a new tag.")
     @app_commands.describe(
         name="The name for the new tag.",
-        content="The content for the new tag."
+        content="The tag content. {user}, {mention}, {channel} and {server} are filled in when sent."
     )
-    # Restrict this command to the specified role ID
-    @app_commands.has_any_role(1409970906981339317)
+    # Restrict this command to the guild's staff role
+    @staff_only()
     async def create_tag(self, interaction: discord.Interaction, name: str, content: str):
         """
         Handles the /tag create command.
         Creates a new tag with the given name and content.
         """
         await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response for a better user experience
+        library = await self.library(interaction)
         name = name.lower() # Normalize tag name to lowercase
 
-        if name in self.tags:
+        if name in library.tags or name in library.aliases:
             await interaction.followup.send(
-                f"A tag named `{name}` already exists. Please choose a different name.",
+                f"A tag or alias named `{name}` already exists. Please choose a different name.",
                 ephemeral=True
             )
             logger.warning(f"Failed to create tag '{name}'. It already exists.")
             return
 
-        self.tags[name] = content
-        save_tags(self.tags)
+        library.tags[name] = content
+        library.templates[name] = TagTemplate(content)
+        library.index.add(name)
+        await library.save_tags(name)
         
         await interaction.followup.send(
             f"Tag `{name}` has been successfully created!",
@@ -114,19 +169,31 @@ class TagsCog(commands.Cog):
         )
         logger.info(f"Tag '{name}' created by {interaction.user.name} ({interaction.user.id}).")
 
-    @tag_group.command(name="delete", description="Deletes an existing tag.")
-    @app_commands.describe(name="The name of the tag to delete.")
-    # Restrict this command to the specified role ID
-    @app_commands.has_any_role(1409970906981339317)
+    @tag_group.command(name="delete", description="Deletes an existing tag or alias.")
+    @app_commands.describe(name="The name of the tag or alias to delete. Deleting a tag also deletes its aliases.")
+    # Restrict this command to the guild's staff role
+    @staff_only()
     async def delete_tag(self, interaction: discord.Interaction, name: str):
         """
         Handles the /tag delete command.
-        Deletes a tag with the given name.
+        Deletes an alias, or a tag together with all of its aliases.
         """
         await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
         name = name.lower() # Normalize tag name to lowercase
 
-        if name not in self.tags:
+        if name in library.aliases:
+            target = library.aliases[name]
+            library.remove_alias(name)
+            await library.save_aliases(name)
+            await interaction.followup.send(
+                f"Alias `{name}` of `{target}` has been successfully deleted!",
+                ephemeral=True
+            )
+            logger.info(f"Alias '{name}' of '{target}' deleted by {interaction.user.name} ({interaction.user.id}).")
+            return
+
+        if name not in library.tags:
             await interaction.followup.send(
                 f"Sorry, a tag named `{name}` does not exist.",
                 ephemeral=True
@@ -134,15 +201,306 @@ class TagsCog(commands.Cog):
             logger.warning(f"Failed to delete tag '{name}'. It does not exist.")
             return
 
-        del self.tags[name]
-        save_tags(self.tags)
-        
+        aliases = sorted(library.aliases_by_tag.get(name, ()))
+        for alias in aliases:
+            library.remove_alias(alias)
+        del library.tags[name]
+        del library.templates[name]
+        library.index.remove(name)
+        library.usage.remove(name)
+        await library.save_tags(name)
+        if aliases:
+            await library.save_aliases(*aliases)
+
+        message = f"Tag `{name}` has been successfully deleted!"
+        if aliases:
+            message += " Its aliases were deleted too: " + ", ".join(f"`{alias}`" for alias in aliases)
+        await interaction.followup.send(message, ephemeral=True)
+        logger.info(f"Tag '{name}' and {len(aliases)} aliases deleted by {interaction.user.name} ({interaction.user.id}).")
+
+    @tag_group.command(name="alias", description="Adds another name for an existing tag.")
+    @app_commands.describe(
+        name="The new name.",
+        tag="The tag the new name should send."
+    )
+    @app_commands.autocomplete(tag=tag_autocomplete)
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def alias_tag(self, interaction: discord.Interaction, name: str, tag: str):
+        """
+        Handles the /tag alias command.
+        Makes name send the same content as tag, without storing the content again.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
+        name = name.lower() # Normalize tag names to lowercase
+        target = library.aliases.get(tag.lower(), tag.lower()) # An alias of an alias points straight at the tag
+
+        if target not in library.tags:
+            await interaction.followup.send(
+                f"Sorry, a tag named `{tag}` does not exist.",
+                ephemeral=True
+            )
+            logger.warning(f"Failed to add alias '{name}'. Tag '{tag}' does not exist.")
+            return
+        if name in library.tags or name in library.aliases:
+            await interaction.followup.send(
+                f"A tag or alias named `{name}` already exists. Please choose a different name.",
+                ephemeral=True
+            )
+            logger.warning(f"Failed to add alias '{name}'. It already exists.")
+            return
+
+        library.add_alias(name, target)
+        await library.save_aliases(name)
         await interaction.followup.send(
-            f"Tag `{name}` has been successfully deleted!",
+            f"`{name}` is now an alias of `{target}`!",
             ephemeral=True
         )
-        logger.info(f"Tag '{name}' deleted by {interaction.user.name} ({interaction.user.id}).")
+        logger.info(f"Alias '{name}' of '{target}' created by {interaction.user.name} ({interaction.user.id}).")
+
+    @tag_group.command(name="rename", description="Renames a tag or alias.")
+    @app_commands.describe(
+        name="The current name of the tag or alias.",
+        new_name="The new name."
+    )
+    @app_commands.autocomplete(name=tag_autocomplete)
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def rename_tag(self, interaction: discord.Interaction, name: str, new_name: str):
+        """
+        Handles the /tag rename command.
+        Renaming a tag keeps its aliases, usage counts and content pointing at it.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
+        name = name.lower() # Normalize tag names to lowercase
+        new_name = new_name.lower()
+
+        if name not in library.tags and name not in library.aliases:
+            await interaction.followup.send(
+                f"Sorry, a tag named `{name}` does not exist.",
+                ephemeral=True
+            )
+            logger.warning(f"Failed to rename tag '{name}'. It does not exist.")
+            return
+        if new_name in library.tags or new_name in library.aliases:
+            await interaction.followup.send(
+                f"A tag or alias named `{new_name}` already exists. Please choose a different name.",
+                ephemeral=True
+            )
+            logger.warning(f"Failed to rename tag '{name}'. '{new_name}' already exists.")
+            return
+
+        if name in library.aliases:
+            target = library.aliases[name]
+            library.remove_alias(name)
+            library.add_alias(new_name, target)
+            await library.save_aliases(new_name, name)
+        else:
+            library.tags[new_name] = library.tags.pop(name)
+            library.templates[new_name] = library.templates.pop(name)
+            library.index.remove(name)
+            library.index.add(new_name)
+            library.usage.merge(name, new_name)
+            aliases = library.aliases_by_tag.pop(name, set())
+            for alias in aliases:
+                library.aliases[alias] = new_name
+            if aliases:
+                library.aliases_by_tag[new_name] = aliases
+            # The new name is saved before the old one is removed, so a crash can't lose the tag
+            await library.save_tags(new_name, name)
+            if aliases:
+                await library.save_aliases(*aliases)
+
+        await interaction.followup.send(
+            f"`{name}` has been successfully renamed to `{new_name}`!",
+            ephemeral=True
+        )
+        logger.info(f"Tag '{name}' renamed to '{new_name}' by {interaction.user.name} ({interaction.user.id}).")
+
+    @tag_group.command(name="dedupe", description="Turns tags with identical content into aliases of one tag.")
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def dedupe_tags(self, interaction: discord.Interaction):
+        """
+        Handles the /tag dedupe command.
+        For each group of tags with the same content, the most used one (then the shortest
+        name) stays a tag and the others become its aliases.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
+        by_content = {}
+        for name, content in library.tags.items():
+            by_content.setdefault(content, []).append(name)
+
+        merged = 0
+        saved_characters = 0
+        for content, names in by_content.items():
+            if len(names) < 2:
+                continue
+            names.sort(key=lambda name: (-library.usage.count(name), len(name), name))
+            target = names[0]
+            for name in names[1:]:
+                # The name stays in the autocomplete index, now as an alias
+                del library.tags[name]
+                del library.templates[name]
+                library.usage.merge(name, target)
+                moved = library.aliases_by_tag.pop(name, set()) | {name}
+                for alias in moved:
+                    library.aliases[alias] = target
+                library.aliases_by_tag.setdefault(target, set()).update(moved)
+                merged += 1
+                saved_characters += len(content)
+
+        if not merged:
+            await interaction.followup.send("No two tags have the same content.", ephemeral=True)
+            return
+        await library.save_all()
+        await interaction.followup.send(
+            f"Turned {merged} duplicate tags into aliases, saving {saved_characters} characters of stored content.",
+            ephemeral=True
+        )
+        logger.info(f"{merged} duplicate tags turned into aliases by {interaction.user.name} ({interaction.user.id}).")
         
+    @tag_group.command(name="stats", description="Shows the most used tags.")
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def tag_stats(self, interaction: discord.Interaction):
+        """
+        Handles the /tag stats command.
+        Lists the most popular tags by recent use, with their total use counts.
+        """
+        library = await self.library(interaction)
+        top = library.usage.top(limit=10)
+        if not top:
+            await interaction.response.send_message("No tags have been used yet.", ephemeral=True)
+            return
+
+        lines = []
+        for rank, name in enumerate(top, start=1):
+            last_used = int(library.usage.last_used(name))
+            lines.append(
+                f"**{rank}.** `{name}` - {library.usage.count(name)} uses, "
+                f"score {library.usage.score(name):.1f}, last used <t:{last_used}:R>"
+            )
+        embed = discord.Embed(
+            title="Most Used Tags",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Ranked by score, which weighs recent uses more heavily.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        logger.info(f"Tag stats viewed by {interaction.user.name} ({interaction.user.id}).")
+
+    @tag_group.command(name="import", description="Imports tags from a JSON lines file.")
+    @app_commands.describe(
+        file="A .jsonl file with one {\"name\": ..., \"content\": ...} object per line.",
+        overwrite="Replace existing tags that have the same name instead of skipping them."
+    )
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def import_tags(self, interaction: discord.Interaction, file: discord.Attachment, overwrite: bool = False):
+        """
+        Handles the /tag import command.
+        Reads the attachment line by line, then adds all of its tags at once with a single save.
+        If any line is invalid, nothing is imported.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
+        if file.size > MAX_IMPORT_BYTES:
+            await interaction.followup.send(
+                f"`{file.filename}` is too large to import (limit: {MAX_IMPORT_BYTES // (1024 * 1024)} MB).",
+                ephemeral=True
+            )
+            return
+
+        tag_import = TagImport(library.tags, library.aliases, overwrite)
+        last_progress = time.monotonic()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(file.url) as response:
+                    response.raise_for_status()
+                    async for line_number, line in iter_lines(response.content.iter_chunked(64 * 1024)):
+                        tag_import.feed(line_number, line)
+                        if time.monotonic() - last_progress >= IMPORT_PROGRESS_INTERVAL:
+                            last_progress = time.monotonic()
+                            await interaction.edit_original_response(content=f"Importing `{file.filename}`... {tag_import.summary()}")
+        except (aiohttp.ClientError, ValueError) as e:
+            await interaction.followup.send(f"Could not read `{file.filename}`: {e}", ephemeral=True)
+            logger.warning(f"Tag import of '{file.filename}' by {interaction.user.id} failed: {e}")
+            return
+
+        tag_import.finish()
+        if not tag_import.valid:
+            await interaction.followup.send(
+                f"Nothing was imported. {tag_import.summary()}\n" + "\n".join(tag_import.errors),
+                ephemeral=True
+            )
+            logger.warning(f"Tag import of '{file.filename}' by {interaction.user.id} rejected: {tag_import.summary()}")
+            return
+
+        # Applied in one go with no awaits in between; names created while the file was read are respected
+        imported = 0
+        aliased = 0
+        new_names = []
+        for name, content in tag_import.tags.items():
+            if name in library.aliases or (name in library.tags and not overwrite):
+                continue
+            if name not in library.tags:
+                new_names.append(name)
+            library.tags[name] = content
+            library.templates[name] = tag_import.templates[name]
+            imported += 1
+        for alias, target in tag_import.aliases.items():
+            target = library.aliases.get(target, target)
+            if alias in library.tags or target not in library.tags or (alias in library.aliases and not overwrite):
+                continue
+            if alias in library.aliases:
+                library.remove_alias(alias)
+            library.aliases[alias] = target
+            library.aliases_by_tag.setdefault(target, set()).add(alias)
+            new_names.append(alias)
+            aliased += 1
+        library.index.update(new_names)
+        await library.save_all()
+
+        await interaction.followup.send(
+            f"Imported {imported} tags and {aliased} aliases from `{file.filename}`. {tag_import.summary()}",
+            ephemeral=True
+        )
+        logger.info(f"{imported} tags and {aliased} aliases imported from '{file.filename}' by {interaction.user.name} ({interaction.user.id}).")
+
+    @tag_group.command(name="export", description="Exports all tags and aliases as a JSON lines file.")
+    # Restrict this command to the guild's staff role
+    @staff_only()
+    async def export_tags(self, interaction: discord.Interaction):
+        """
+        Handles the /tag export command.
+        Writes every tag and alias to a temporary .jsonl file in a worker thread and attaches it.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True) # Defer the response
+        library = await self.library(interaction)
+        count = len(library.tags)
+        alias_count = len(library.aliases)
+        with tempfile.TemporaryFile() as export_file:
+            await asyncio.to_thread(write_export, dict(library.tags), dict(library.aliases), export_file)
+            size = export_file.tell()
+            limit = interaction.guild.filesize_limit if interaction.guild else 25 * 1024 * 1024
+            if size > limit:
+                await interaction.followup.send(
+                    f"The export is {size / (1024 * 1024):.1f} MB, more than this server's upload limit.",
+                    ephemeral=True
+                )
+                return
+            export_file.seek(0)
+            await interaction.followup.send(
+                f"Exported {count} tags and {alias_count} aliases.",
+                file=discord.File(export_file, filename="tags.jsonl"),
+                ephemeral=True
+            )
+        logger.info(f"{count} tags and {alias_count} aliases exported by {interaction.user.name} ({interaction.user.id}).")
+
     # Handles a generic error for the command group
     async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         """Handles errors for this cog's commands."""
@@ -7,6 +7,8 @@ from discord.ext import commands
 from deep_translator import GoogleTranslator
 import logging
 
+from utils.guild_config import GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,7 @@ class TranslateCog(commands.Cog):
     @app_commands.command(name='translate', description='Translate a block of text to a different language.')
     @app_commands.describe(language='The language to translate to (e.g., en, es, fr).')
     @app_commands.describe(text='The text to translate.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def translate_command(self, interaction: discord.Interaction, language: str, text: str):
         try:
             # Use deep-translator with Google Translate backend
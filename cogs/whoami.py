@@ -6,6 +6,8 @@ from discord import app_commands
 from discord.ext import commands
 import logging
 
+from utils.guild_config import GUILDS
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -15,7 +17,7 @@ class WhoamiCog(commands.Cog):
         logger.info("WhoamiCog initialized successfully")
 
     @app_commands.command(name='whoami', description='Tells you your Discord ID, account creation date, and join date.')
-    @app_commands.guilds(discord.Object(id=1144662039504109721))
+    @app_commands.guilds(*GUILDS)
     async def whoami_command(self, interaction: discord.Interaction):
         try:
             user = interaction.user
@@ -0,0 +1,172 @@
+# utils/cog_loader.py
+# Loads the extensions in ./cogs concurrently and records how long each one took.
+# A cog can declare what it needs to be loaded after, as module-level constants:
+#   LOAD_AFTER = ["cogs.profile"]  # Extensions that must finish loading first
+#   LOAD_PRIORITY = 10             # Higher starts earlier among those ready (default 0)
+# The declarations are read from the source with ast, so nothing is imported to find them.
+
+import ast
+import asyncio
+import importlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Threads used to import the cogs' dependencies while other cogs are being set up
+IMPORT_WORKERS = 4
+
+
+class CogExtension:
+    """An extension file in the cogs directory, with the imports and declarations found in its source."""
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.imports = [] # Modules the extension imports at the top level
+        self.constants = {} # Module-level NAME = <literal> assignments
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError) as e:
+            # load_extension will report the problem properly
+            logger.warning(f"Could not read declarations from {path}: {e}")
+        else:
+            self._scan(tree)
+        self.after = list(self.constants.get('LOAD_AFTER', ()))
+        self.priority = self.constants.get('LOAD_PRIORITY', 0)
+
+    def _scan(self, tree):
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                self.imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                self.imports.append(node.module)
+                # "from package import name" may be importing a submodule
+                self.imports.extend(f"{node.module}.{alias.name}" for alias in node.names)
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                try:
+                    self.constants[node.targets[0].id] = ast.literal_eval(node.value)
+                except ValueError:
+                    pass
+
+
+class LoadResult:
+    """How loading one extension went."""
+    def __init__(self, name):
+        self.name = name
+        self.import_time = 0.0 # Importing its dependencies, in a worker thread
+        self.setup_time = 0.0 # load_extension on the event loop: running the module and its setup()
+        self.error = None
+
+    @property
+    def total_time(self):
+        return self.import_time + self.setup_time
+
+
+def discover_extensions(cogs_dir, package='cogs'):
+    """Every extension module in cogs_dir, in name order."""
+    return [
+        CogExtension(f"{package}.{filename[:-3]}", os.path.join(cogs_dir, filename))
+        for filename in sorted(os.listdir(cogs_dir))
+        if filename.endswith('.py') and not filename.startswith('_')
+    ]
+
+
+def _ordering_problems(extensions):
+    """Extensions that can never load because of a missing dependency or a cycle, with the reason."""
+    by_name = {extension.name: extension for extension in extensions}
+    problems = {}
+    for extension in extensions:
+        missing = [name for name in extension.after if name not in by_name]
+        if missing:
+            problems[extension.name] = f"LOAD_AFTER names unknown extensions: {', '.join(missing)}"
+
+    # Depth-first search for cycles; every extension on a cycle is reported
+    state = {} # name -> "visiting" or "done"
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            cycle = path[path.index(name):] + [name]
+            for member in cycle[:-1]:
+                problems.setdefault(member, f"LOAD_AFTER cycle: {' -> '.join(cycle)}")
+            return
+        state[name] = "visiting"
+        for dependency in by_name[name].after:
+            if dependency in by_name:
+                visit(dependency, path + [name])
+        state[name] = "done"
+    for extension in extensions:
+        visit(extension.name, [])
+    return problems
+
+
+def _warm_imports(modules):
+    """Imports modules in a worker thread so load_extension finds them cached. Returns the time taken."""
+    start = time.perf_counter()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass # Not a module (e.g. a class imported by name), or broken; load_extension reports the latter
+    return time.perf_counter() - start
+
+
+async def load_extensions(bot, extensions, import_workers=IMPORT_WORKERS):
+    """
+    Loads the extensions concurrently, each one as soon as everything in its LOAD_AFTER has
+    loaded. Dependencies are imported in worker threads, so one cog's slow imports don't
+    hold up the others. Returns a LoadResult per extension; failures are logged, not raised.
+    """
+    loop = asyncio.get_running_loop()
+    results = {extension.name: LoadResult(extension.name) for extension in extensions}
+    loaded = {extension.name: loop.create_future() for extension in extensions} # -> True if it loaded
+    problems = _ordering_problems(extensions)
+
+    async def load(extension, executor):
+        result = results[extension.name]
+        try:
+            result.import_time = await loop.run_in_executor(executor, _warm_imports, extension.imports)
+            for dependency in extension.after:
+                if not await loaded[dependency]:
+                    raise RuntimeError(f"{dependency} (from LOAD_AFTER) failed to load")
+            start = time.perf_counter()
+            await bot.load_extension(extension.name)
+            result.setup_time = time.perf_counter() - start
+            logger.info(f"Loaded extension: {extension.name}")
+        except Exception as e:
+            result.error = e
+            logger.error(f"Failed to load extension {extension.name}: {e}", exc_info=True)
+        finally:
+            loaded[extension.name].set_result(result.error is None)
+
+    with ThreadPoolExecutor(max_workers=import_workers, thread_name_prefix='cog-import') as executor:
+        tasks = []
+        # Started highest priority first, so those get the first import threads
+        for extension in sorted(extensions, key=lambda extension: (-extension.priority, extension.name)):
+            if extension.name in problems:
+                results[extension.name].error = RuntimeError(problems[extension.name])
+                loaded[extension.name].set_result(False)
+                logger.error(f"Failed to load extension {extension.name}: {problems[extension.name]}")
+                continue
+            tasks.append(asyncio.create_task(load(extension, executor)))
+        await asyncio.gather(*tasks)
+    return list(results.values())
+
+
+def format_startup_profile(results, wall_time):
+    """A table of the load results, slowest first, for the startup log."""
+    failed = sum(1 for result in results if result.error is not None)
+    lines = [
+        f"Startup profile: {len(results) - failed} of {len(results)} extensions loaded in {wall_time:.3f}s",
+        f"  {'extension':<28} {'import':>8} {'setup':>8} {'total':>8}"
+    ]
+    for result in sorted(results, key=lambda result: result.total_time, reverse=True):
+        lines.append(
+            f"  {result.name:<28} {result.import_time:>7.3f}s {result.setup_time:>7.3f}s {result.total_time:>7.3f}s"
+            + ("  FAILED" if result.error is not None else "")
+        )
+    return "\n".join(lines)
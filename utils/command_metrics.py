@@ -0,0 +1,249 @@
+# utils/command_metrics.py
+# Latency and outcome metrics for every app command, recorded by the command tree itself,
+# so no cog has to time its own handlers.
+# For each command it keeps histograms of:
+#   first response: until Discord accepted the interaction response (a reply, defer or modal)
+#   handler: the whole invocation, checks and error handlers included
+#   REST: time spent in Discord API requests made while handling it
+# and counts the outcomes: ok, error, cooldown or permission (a failed check).
+# REST requests are attributed to the invocation through a context variable, which asyncio
+# copies into the tasks a handler starts, and aiohttp request tracing.
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from collections import Counter
+
+import aiohttp
+from discord import app_commands
+from discord import InteractionType
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+# The invocation being handled in the current task, if any
+_current = contextvars.ContextVar('command_invocation', default=None)
+
+
+class Histogram:
+    """Counts of observed durations per bucket, with their total and maximum."""
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """An upper bound for the q quantile: the bound of the bucket it falls in (the maximum for the last one)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "buckets": {("+Inf" if bound == float('inf') else str(bound)): count for bound, count in zip(self.buckets, self.counts)}
+        }
+
+
+class CommandStats:
+    """The histograms and outcome counts of one command."""
+    def __init__(self):
+        self.first_response = Histogram()
+        self.handler = Histogram()
+        self.rest = Histogram()
+        self.outcomes = Counter()
+
+    def snapshot(self):
+        return {
+            "outcomes": dict(self.outcomes),
+            "first_response": self.first_response.snapshot(),
+            "handler": self.handler.snapshot(),
+            "rest": self.rest.snapshot()
+        }
+
+
+class Invocation:
+    """Timings of one interaction being handled by the tree."""
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.interaction_id = interaction.id
+        self.start = time.perf_counter()
+        self.first_response = None # Seconds from start until the interaction response was accepted
+        self.rest_time = 0.0
+        self.rest_calls = 0
+        self.error = None
+
+    @property
+    def command_name(self):
+        """The qualified name of the command, once the tree has resolved it."""
+        command = self.interaction.command
+        return command.qualified_name if command is not None else None
+
+
+def current_invocation():
+    """The invocation being handled in the current task, or None outside of a command."""
+    return _current.get()
+
+
+def outcome_of(error):
+    """Sorts an app command error into the outcome it is counted under."""
+    if error is None:
+        return "ok"
+    if isinstance(error, app_commands.CommandOnCooldown):
+        return "cooldown"
+    if isinstance(error, app_commands.CheckFailure):
+        return "permission"
+    return "error"
+
+
+class CommandMetrics:
+    """Per-command statistics, keyed by the command's qualified name."""
+    def __init__(self):
+        self.commands = {} # name -> CommandStats
+        self._log_task = None
+
+    def record(self, name, invocation, failed=False):
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = CommandStats()
+        outcome = outcome_of(invocation.error)
+        if outcome == "ok" and failed:
+            outcome = "error"
+        stats.outcomes[outcome] += 1
+        stats.handler.observe(time.perf_counter() - invocation.start)
+        stats.rest.observe(invocation.rest_time)
+        if invocation.first_response is not None:
+            stats.first_response.observe(invocation.first_response)
+
+    def snapshot(self):
+        """Every command's histograms and outcome counts, for logs and exporters."""
+        return {name: stats.snapshot() for name, stats in sorted(self.commands.items())}
+
+    def slowest(self, limit=5):
+        """The commands with the highest p95 handler time, as (name, CommandStats)."""
+        return sorted(self.commands.items(), key=lambda item: item[1].handler.quantile(0.95), reverse=True)[:limit]
+
+    def start_logging(self, interval):
+        """Logs a JSON snapshot of the metrics every interval seconds."""
+        if self._log_task is None:
+            self._log_task = asyncio.create_task(self._log_periodically(interval))
+
+    async def _log_periodically(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            if self.commands:
+                logger.info(f"Command metrics: {json.dumps(self.snapshot(), separators=(',', ':'))}")
+
+    async def close(self):
+        """Stops the periodic log."""
+        if self._log_task is not None:
+            self._log_task.cancel()
+            try:
+                await self._log_task
+            except asyncio.CancelledError:
+                pass
+
+
+class RestMetrics:
+    """Counts of every Discord API request the bot made, by response status."""
+    def __init__(self):
+        self.responses = Counter() # status code -> count
+        self.rate_limited = Counter() # X-RateLimit-Scope (user, global or shared) -> 429 responses
+
+    def record(self, response):
+        self.responses[response.status] += 1
+        if response.status == 429:
+            self.rate_limited[response.headers.get('X-RateLimit-Scope', 'unknown')] += 1
+
+
+def http_trace_config(rest_metrics=None):
+    """
+    An aiohttp TraceConfig that adds the Discord API requests of an invocation to its timings,
+    and counts every response in rest_metrics if given.
+    """
+    async def on_request_start(session, context, params):
+        context.start = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        if rest_metrics is not None:
+            rest_metrics.record(params.response)
+        invocation = _current.get()
+        if invocation is None:
+            return
+        now = time.perf_counter()
+        invocation.rest_time += now - context.start
+        invocation.rest_calls += 1
+        # POST /interactions/{id}/{token}/callback is the initial response (reply, defer or modal)
+        if invocation.first_response is None and params.url.path.endswith('/callback') and f"/interactions/{invocation.interaction_id}/" in params.url.path:
+            invocation.first_response = now - invocation.start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """A CommandTree that times every command it runs and records how it ended in self.metrics."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = CommandMetrics()
+
+    async def _call(self, interaction):
+        invocation = Invocation(interaction)
+        token = _current.set(invocation)
+        try:
+            await super()._call(interaction)
+        except Exception as e:
+            invocation.error = e # Raised before the command ran, e.g. an unknown command
+            raise
+        finally:
+            _current.reset(token)
+            name = invocation.command_name or "<unknown>"
+            if interaction.type is InteractionType.autocomplete:
+                name += " (autocomplete)"
+            self.metrics.record(name, invocation, failed=interaction.command_failed)
+
+    async def on_error(self, interaction, error):
+        _record_error(error)
+        await super().on_error(interaction, error)
+
+    def error(self, coro):
+        """Registers the tree's error handler, recording each error for the metrics before it runs."""
+        async def on_error(interaction, error):
+            _record_error(error)
+            await coro(interaction, error)
+        super().error(on_error)
+        return coro
+
+
+def _record_error(error):
+    invocation = _current.get()
+    if invocation is not None and invocation.error is None:
+        invocation.error = error
@@ -0,0 +1,77 @@
+# utils/command_sync.py
+# Syncs the slash command tree to Discord only when it has actually changed.
+# A hash of each scope's command payload (the global commands, and each guild's) is saved to disk
+# after a successful sync, so restarts and reconnects with unchanged commands skip the REST call.
+
+import asyncio
+import hashlib
+import json
+import logging
+
+import discord
+
+from utils.journal import load_journaled
+from utils.persistence import atomic_write
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# File path for the saved command tree hashes
+COMMAND_SYNC_FILE = 'command_sync.json'
+
+
+def command_tree_hash(tree, guild=None):
+    """
+    A hash of the commands tree.sync(guild=guild) would send, independent of the order
+    the cogs registered them in.
+    """
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    serialized = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+class CommandSync:
+    """
+    Syncs the global commands (unless include_global is False) and the given guilds' commands,
+    skipping every scope whose hash matches the one saved after its last sync.
+    """
+    def __init__(self, tree, guild_ids=(), path=COMMAND_SYNC_FILE, include_global=True):
+        self.tree = tree
+        self.guilds = [discord.Object(id=guild_id) for guild_id in guild_ids]
+        if include_global:
+            self.guilds.insert(0, None) # None is the global scope
+        self.path = path
+        self.synced = False # Set once this process has synced or found everything up to date
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _scope(guild):
+        return "global" if guild is None else str(guild.id)
+
+    async def sync(self, force=False):
+        """
+        Syncs each scope whose commands changed since its last sync, or every scope if force.
+        Returns the scopes that were synced.
+        """
+        async with self._lock:
+            saved = load_journaled(self.path)
+            synced_scopes = []
+            for guild in self.guilds:
+                scope = self._scope(guild)
+                digest = command_tree_hash(self.tree, guild)
+                if not force and saved.get(scope) == digest:
+                    continue
+                synced = await self.tree.sync(guild=guild)
+                saved[scope] = digest
+                # Saved per scope, so a failure syncing a later scope doesn't lose this one
+                await asyncio.to_thread(atomic_write, self.path, dict(saved))
+                synced_scopes.append(scope)
+                logger.info(
+                    f"Synced {len(synced)} slash commands ({scope}): "
+                    + ", ".join(sorted(command.name for command in synced))
+                )
+            if not synced_scopes:
+                logger.info("Slash commands are unchanged since the last sync; skipped syncing.")
+            self.synced = True
+            return synced_scopes
@@ -0,0 +1,77 @@
+# utils/guild_config.py
+# The guilds the bot serves and their per-guild settings, so one bot can run a network of servers.
+# Configured with environment variables:
+#   GUILD_IDS    guilds the guild slash commands are registered in, comma-separated
+#                (default: the home guild, 1144662039504109721)
+#   STAFF_ROLES  each guild's staff role as guild_id:role_id pairs, comma-separated
+#                (default: the home guild's staff role, 1409970906981339317)
+# A guild in GUILD_IDS without a staff role gets the commands, but nobody there can use the staff-only ones.
+# Cogs register their guild commands with @app_commands.guilds(*GUILDS) and restrict staff
+# commands with @staff_only(), or look the role up with staff_role_id(guild_id).
+# Commands that use the home guild's own channels, roles or categories are registered with
+# @app_commands.guilds(*HOME_GUILDS) instead, so they can't be used from (or act on) another guild.
+
+import logging
+import os
+
+import discord
+from discord import app_commands
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# The guild (and its staff role) the bot was written for; the defaults when nothing is configured
+HOME_GUILD_ID = 1144662039504109721
+HOME_STAFF_ROLE_ID = 1409970906981339317
+
+
+def guild_ids():
+    """Returns the GUILD_IDS environment variable as a list of guild IDs."""
+    value = os.getenv('GUILD_IDS', str(HOME_GUILD_ID))
+    return [int(guild_id) for guild_id in value.split(',') if guild_id.strip()]
+
+
+def staff_roles():
+    """Returns the STAFF_ROLES environment variable as {guild id: staff role id}."""
+    value = os.getenv('STAFF_ROLES', f"{HOME_GUILD_ID}:{HOME_STAFF_ROLE_ID}")
+    roles = {}
+    for pair in value.split(','):
+        if not pair.strip():
+            continue
+        guild_id, _, role_id = pair.partition(':')
+        if not role_id:
+            raise ValueError(f"STAFF_ROLES entries must be guild_id:role_id, not {pair.strip()!r}")
+        roles[int(guild_id)] = int(role_id)
+    return roles
+
+
+GUILD_IDS = guild_ids()
+# For registering guild commands: @app_commands.guilds(*GUILDS)
+GUILDS = [discord.Object(id=guild_id) for guild_id in GUILD_IDS]
+# For commands that only work in the home guild; empty, so they aren't registered, if GUILD_IDS leaves it out
+HOME_GUILDS = [discord.Object(id=HOME_GUILD_ID)] if HOME_GUILD_ID in GUILD_IDS else []
+STAFF_ROLES = staff_roles()
+
+for _guild_id in GUILD_IDS:
+    if _guild_id not in STAFF_ROLES:
+        logger.warning(f"Guild {_guild_id} has no staff role in STAFF_ROLES; its staff-only commands can't be used.")
+
+
+def staff_role_id(guild_id):
+    """The staff role of the guild, or None if it has none configured."""
+    return STAFF_ROLES.get(guild_id)
+
+
+def staff_only():
+    """
+    An app command check that passes for members with their guild's staff role. Like
+    app_commands.checks.has_any_role, it raises NoPrivateMessage in DMs and MissingAnyRole otherwise.
+    """
+    def predicate(interaction: discord.Interaction):
+        if interaction.guild is None:
+            raise app_commands.NoPrivateMessage()
+        role_id = staff_role_id(interaction.guild.id)
+        if role_id is not None and interaction.user.get_role(role_id) is not None:
+            return True
+        raise app_commands.MissingAnyRole([role_id] if role_id is not None else [])
+    return app_commands.check(predicate)
@@ -0,0 +1,131 @@
+# utils/hot_reload.py
+# Reloads single cogs while the bot stays connected, from /reload-cog or a file watcher on ./cogs.
+# After a reload the command tree is synced through CommandSync, so Discord is only called when
+# the reloaded cog's commands actually changed.
+# A cog can carry data over a reload instead of loading it again, by naming the attributes:
+#   RELOAD_STATE = ("libraries",)
+# The new instance picks them up with take_carried_state(bot, "TagsCog") in its __init__.
+# Only the cog module is reloaded; changes to utils/ still need a restart.
+
+import asyncio
+import logging
+import os
+import time
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# How often the file watcher checks ./cogs for changes (seconds)
+COG_WATCH_INTERVAL = 1.0
+
+
+def take_carried_state(bot, cog_name):
+    """
+    The attributes the previous instance of the cog carried over a reload, or an empty dict
+    on a normal load. Each cog's state can only be taken once.
+    """
+    return getattr(bot, 'carried_state', {}).pop(cog_name, {})
+
+
+class ReloadResult:
+    """How reloading one extension went."""
+    def __init__(self, name):
+        self.name = name
+        self.carried = [] # Cogs whose RELOAD_STATE was carried over
+        self.synced_scopes = [] # Command sync scopes that changed ("global" or a guild ID)
+        self.time = 0.0
+        self.error = None
+
+
+class CogReloader:
+    """Reloads extensions one at a time, carrying opted-in cog state and syncing changed commands."""
+    def __init__(self, bot):
+        self.bot = bot
+        self.bot.carried_state = {} # cog name -> {attribute: value}, filled just before a reload
+        self._lock = asyncio.Lock()
+        self._watcher = None
+
+    def _snapshot(self, name):
+        """Stores the RELOAD_STATE attributes of the extension's cogs, returning their names."""
+        carried = []
+        for cog_name, cog in self.bot.cogs.items():
+            attributes = getattr(cog, 'RELOAD_STATE', ())
+            if cog.__module__ == name and attributes:
+                self.bot.carried_state[cog_name] = {attribute: getattr(cog, attribute) for attribute in attributes}
+                carried.append(cog_name)
+        return carried
+
+    async def reload(self, name):
+        """Reloads the extension; if the new code fails to load, discord.py keeps the old one."""
+        result = ReloadResult(name)
+        async with self._lock:
+            start = time.perf_counter()
+            carried = self._snapshot(name)
+            try:
+                await self.bot.reload_extension(name)
+                # State nobody took (e.g. the new version dropped RELOAD_STATE) isn't counted as carried
+                result.carried = [cog_name for cog_name in carried if cog_name not in self.bot.carried_state]
+                command_sync = getattr(self.bot, 'command_sync', None)
+                if command_sync is not None:
+                    result.synced_scopes = await command_sync.sync()
+            except Exception as e:
+                result.error = e
+                logger.error(f"Failed to reload extension {name}: {e}", exc_info=True)
+            finally:
+                for cog_name in carried:
+                    self.bot.carried_state.pop(cog_name, None)
+            result.time = time.perf_counter() - start
+        if result.error is None:
+            logger.info(
+                f"Reloaded extension {name} in {result.time:.3f}s "
+                f"(state carried: {', '.join(result.carried) or 'none'}; "
+                f"commands synced: {', '.join(result.synced_scopes) or 'none, unchanged'})."
+            )
+        return result
+
+    def start_watching(self, cogs_dir, package='cogs', interval=COG_WATCH_INTERVAL):
+        """Starts reloading loaded extensions whose files in cogs_dir change."""
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch(cogs_dir, package, interval))
+            logger.info(f"Watching {cogs_dir} for cog changes every {interval}s.")
+
+    def _modified_times(self, cogs_dir, package):
+        times = {}
+        for filename in os.listdir(cogs_dir):
+            if filename.endswith('.py') and not filename.startswith('_'):
+                try:
+                    times[f"{package}.{filename[:-3]}"] = os.stat(os.path.join(cogs_dir, filename)).st_mtime_ns
+                except OSError:
+                    pass # Removed between listdir and stat
+        return times
+
+    async def _watch(self, cogs_dir, package, interval):
+        known = self._modified_times(cogs_dir, package)
+        changed = set()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                current = self._modified_times(cogs_dir, package)
+            except OSError as e:
+                logger.warning(f"Could not check {cogs_dir} for changes: {e}")
+                continue
+            for name, modified in current.items():
+                if known.get(name) != modified:
+                    # Reloaded on the next check, once the file has stopped changing (editors save in steps)
+                    changed.add(name)
+                elif name in changed:
+                    changed.discard(name)
+                    if name in self.bot.extensions:
+                        await self.reload(name)
+                    else:
+                        logger.info(f"{name} changed but isn't loaded; not reloading it.")
+            known = current
+
+    async def close(self):
+        """Stops the file watcher."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,62 @@
+# utils/intents.py
+# Builds the gateway intents and member cache flags from what the cogs declare they need,
+# instead of subscribing to (and caching) everything with Intents.all().
+# A cog declares them as module-level lists of discord.Intents / discord.MemberCacheFlags names:
+#   INTENTS = ["guilds", "members"]
+#   MEMBER_CACHE = ["joined"]
+# Set INTENTS_PROFILE=all to go back to Intents.all() with the default member cache.
+
+import logging
+import os
+
+import discord
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# The intent each member cache flag needs in order to be filled
+CACHE_FLAG_INTENTS = {"joined": "members", "voice": "voice_states"}
+
+
+def intents_profile():
+    """Returns the INTENTS_PROFILE environment variable: "derived" (default) or "all"."""
+    return os.getenv('INTENTS_PROFILE', 'derived').lower()
+
+
+def derive_intents(extensions):
+    """
+    Combines the INTENTS and MEMBER_CACHE declarations of the given CogExtensions.
+    Returns (intents, member_cache_flags, reasons), where reasons maps each enabled flag to
+    the extensions that asked for it. Raises ValueError for a flag name discord.py doesn't know.
+    """
+    intents = discord.Intents.none()
+    member_cache_flags = discord.MemberCacheFlags.none()
+    reasons = {}
+    for extension in extensions:
+        for flag in extension.constants.get('INTENTS', ()):
+            if flag not in discord.Intents.VALID_FLAGS:
+                raise ValueError(f"{extension.name} declares an unknown intent: {flag!r}")
+            setattr(intents, flag, True)
+            reasons.setdefault(flag, []).append(extension.name)
+        for flag in extension.constants.get('MEMBER_CACHE', ()):
+            if flag not in discord.MemberCacheFlags.VALID_FLAGS:
+                raise ValueError(f"{extension.name} declares an unknown member cache flag: {flag!r}")
+            setattr(member_cache_flags, flag, True)
+            reasons.setdefault(f"member cache {flag}", []).append(extension.name)
+            required = CACHE_FLAG_INTENTS.get(flag)
+            if required is not None:
+                setattr(intents, required, True)
+                reasons.setdefault(required, []).append(f"{extension.name} (member cache {flag})")
+    return intents, member_cache_flags, reasons
+
+
+def build_intents(extensions):
+    """The intents and member cache flags for the bot, following INTENTS_PROFILE."""
+    if intents_profile() == 'all':
+        intents = discord.Intents.all()
+        logger.info("INTENTS_PROFILE=all: using every gateway intent and the default member cache.")
+        return intents, discord.MemberCacheFlags.from_intents(intents)
+    intents, member_cache_flags, reasons = derive_intents(extensions)
+    summary = "; ".join(f"{flag} ({', '.join(names)})" for flag, names in sorted(reasons.items()))
+    logger.info(f"Gateway intents and member cache derived from the cogs: {summary or 'none'}")
+    return intents, member_cache_flags
@@ -0,0 +1,165 @@
+# utils/journal.py
+# Journaled persistence for the JSON data files (PERSISTENCE_MODE=journal).
+# Instead of re-dumping the whole file on every change, each change is appended to
+# "<file>.journal" as one JSON line. Once the journal grows past a size threshold it is
+# folded into the JSON file (the snapshot) in the background. Loading replays the
+# snapshot followed by the journal.
+
+import asyncio
+import json
+import logging
+import os
+
+from utils.persistence import atomic_write
+from utils.serialization import decode
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Journal size in bytes after which it is folded into the snapshot
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+
+def journal_enabled():
+    """Returns True if the PERSISTENCE_MODE environment variable selects journaled persistence."""
+    return os.getenv('PERSISTENCE_MODE', 'snapshot').lower() == 'journal'
+
+
+def _journal_files(path):
+    """The journal being folded into the snapshot (if any) and the live journal, in replay order."""
+    return [f"{path}.journal.compacting", f"{path}.journal"]
+
+
+def _replay(journal_file, data):
+    """
+    Applies every complete record in journal_file to data.
+    A torn record at the end (from a crash mid-append) is dropped and cut off the file
+    so new records are appended after the last good one.
+    """
+    good_offset = 0
+    applied = 0
+    with open(journal_file, 'rb') as f:
+        for line in f:
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("record has no line terminator")
+                record = json.loads(line)
+                if record["op"] == "set":
+                    data[record["key"]] = record["value"]
+                elif record["op"] == "delete":
+                    data.pop(record["key"], None)
+                else:
+                    raise ValueError(f"unknown op {record['op']!r}")
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Discarding journal {journal_file} from byte {good_offset} onwards: {e}")
+                break
+            good_offset += len(line)
+            applied += 1
+    if good_offset != os.path.getsize(journal_file):
+        with open(journal_file, 'r+b') as f:
+            f.truncate(good_offset)
+    return applied
+
+
+def load_journaled(path):
+    """
+    Loads the JSON file at path and replays any journal records on top of it.
+    When journaling is disabled, leftover journal records are folded into the file right
+    away so later whole-file saves can't be overridden by a stale journal.
+    """
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            try:
+                data = decode(f.read())
+            except ValueError:
+                logger.error(f"{path} file is corrupted. Starting with an empty dictionary.")
+
+    replayed = False
+    for journal_file in _journal_files(path):
+        if os.path.exists(journal_file):
+            applied = _replay(journal_file, data)
+            replayed = True
+            logger.info(f"Replayed {applied} journal records from {journal_file}.")
+
+    if replayed and not journal_enabled():
+        atomic_write(path, data)
+        for journal_file in _journal_files(path):
+            if os.path.exists(journal_file):
+                os.remove(journal_file)
+        logger.info(f"Folded leftover journal into {path}.")
+    return data
+
+
+class Journal:
+    """
+    Append-only change log for one JSON data file.
+    Load the data with load_journaled() first, then record each change with set()/delete().
+    `snapshot` returns a copy of the current data and is used when compacting.
+    """
+    def __init__(self, path, snapshot, compact_threshold=JOURNAL_COMPACT_BYTES):
+        self.path = path
+        self.snapshot = snapshot
+        self.compact_threshold = compact_threshold
+        self.compacting_file, self.journal_file = _journal_files(path)
+        self._file = open(self.journal_file, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        self._compaction = None
+
+    def set(self, key, value):
+        """Records that key now holds value."""
+        self._append({"op": "set", "key": key, "value": value})
+
+    def delete(self, key):
+        """Records that key was removed."""
+        self._append({"op": "delete", "key": key})
+
+    def _append(self, record):
+        # One short write per change; the record reaches the OS before the caller carries on
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        self._file.write(line)
+        self._file.flush()
+        self._size += len(line.encode('utf-8'))
+        if self._size >= self.compact_threshold and (self._compaction is None or self._compaction.done()):
+            self._compaction = asyncio.get_running_loop().create_task(self._compact_in_background())
+
+    async def _compact_in_background(self):
+        try:
+            await self.compact()
+        except Exception as e:
+            logger.error(f"Compacting journal for {self.path} failed: {e}", exc_info=True)
+
+    async def compact(self):
+        """Folds the journal into the snapshot file."""
+        # Switch to a fresh journal and take the snapshot in the same step, so every record
+        # in the old journal is covered by the snapshot and every later one lands in the new journal.
+        self._file.close()
+        if os.path.exists(self.compacting_file):
+            # A previous compaction didn't finish; keep its records until this one does
+            with open(self.compacting_file, 'ab') as dst, open(self.journal_file, 'rb') as src:
+                dst.write(src.read())
+            os.remove(self.journal_file)
+        else:
+            os.replace(self.journal_file, self.compacting_file)
+        self._file = open(self.journal_file, 'a', encoding='utf-8')
+        self._size = 0
+        data = self.snapshot()
+
+        await asyncio.to_thread(atomic_write, self.path, data)
+        os.remove(self.compacting_file)
+        logger.info(f"Compacted journal into {self.path}.")
+
+    async def checkpoint(self):
+        """Compacts right away, e.g. after a bulk change, once any compaction already running is done."""
+        if self._compaction is not None and not self._compaction.done():
+            await self._compaction
+        self._compaction = asyncio.get_running_loop().create_task(self.compact())
+        await self._compaction
+
+    async def close(self):
+        """Waits for a running compaction and closes the journal file. Call on shutdown."""
+        if self._compaction is not None and not self._compaction.done():
+            await self._compaction
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
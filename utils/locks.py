@@ -0,0 +1,47 @@
+# utils/locks.py
+# Fine-grained asyncio locking helpers for the data stores.
+
+import asyncio
+import contextlib
+
+
+class KeyedLocks:
+    """
+    One asyncio.Lock per key (e.g. per project ID), created on first use and dropped
+    again once nobody holds or waits for it, so memory stays proportional to the number
+    of records being changed right now rather than the size of the store.
+    A task already holding a key's lock can hold it again, so store methods that lock a record
+    themselves can be called inside a caller's read-modify-write block. Tasks started inside
+    the block don't hold the lock.
+    """
+    def __init__(self):
+        self._locks = {}
+        self._users = {}
+        self._owners = {} # key -> task holding its lock
+
+    def __len__(self):
+        return len(self._locks)
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key):
+        """Holds the lock for key for the duration of the `async with` block."""
+        task = asyncio.current_task()
+        if self._owners.get(key) is task:
+            yield # Already held by this task further up
+            return
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                self._owners[key] = task
+                try:
+                    yield
+                finally:
+                    del self._owners[key]
+        finally:
+            self._users[key] -= 1
+            if self._users[key] == 0:
+                del self._users[key]
+                del self._locks[key]
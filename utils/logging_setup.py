@@ -0,0 +1,170 @@
+# utils/logging_setup.py
+# Sets up logging so nothing on the event loop waits for disk or console I/O.
+# Loggers only put records on a queue; a listener thread formats and writes them to the console
+# and to the log file, which is rotated (and the old files gzipped) so it can't grow without bound.
+# Configured with environment variables:
+#   LOG_FILE          log file path (default bot.log)
+#   LOG_FORMAT        text (default) or json, one JSON object per line with the command, user ID and
+#                     latency of the app command being handled when the record was logged
+#   LOG_ROTATE        size (default) to rotate at LOG_MAX_BYTES, or time to rotate at LOG_ROTATE_WHEN
+#   LOG_MAX_BYTES     default 10 MiB
+#   LOG_ROTATE_WHEN   a TimedRotatingFileHandler interval, default midnight
+#   LOG_BACKUP_COUNT  rotated files kept, default 5
+#   LOG_COMPRESS      1 (default) to gzip rotated files
+
+import atexit
+import datetime
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+
+from utils.command_metrics import current_invocation
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Turns exceptions into text before they are queued
+_traceback_formatter = logging.Formatter()
+
+# How long the listener lets records collect before writing them (seconds). Handling them in
+# batches keeps the listener thread from taking the GIL from the event loop for every single record.
+LOG_BATCH_DELAY = 0.05
+
+
+class CommandContextFilter(logging.Filter):
+    """
+    Adds command, user_id and latency_ms to records logged while an app command is handled.
+    Runs in the thread that logged the record, where the command's context is visible.
+    """
+    def filter(self, record):
+        invocation = current_invocation()
+        if invocation is not None:
+            record.command = invocation.command_name
+            record.user_id = invocation.interaction.user.id
+            record.latency_ms = round((time.perf_counter() - invocation.start) * 1000, 3)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object."""
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for field in ("command", "user_id", "latency_ms"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread, which formats them; only what can't wait is done here."""
+    def prepare(self, record):
+        # Not copied (the slowest part of the standard prepare): this is the only handler on the root
+        # logger, so every other handler has already seen the record.
+        # The arguments and traceback may change or be gone by the time the listener gets to the record
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogListener:
+    """Hands queued records to the handlers from a background thread, a batch at a time."""
+    def __init__(self, log_queue, handlers, batch_delay=LOG_BATCH_DELAY):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_delay = batch_delay
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='log-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Writes out everything already queued and stops the thread. Safe to call more than once."""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            if batch[0] is not None:
+                time.sleep(self.batch_delay)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is None:
+                    return
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+
+
+def _gzip_rotator(source, destination):
+    with open(source, 'rb') as f_in, gzip.open(destination, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _file_handler():
+    path = os.getenv('LOG_FILE', 'bot.log')
+    backup_count = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    if os.getenv('LOG_ROTATE', 'size').lower() == 'time':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=os.getenv('LOG_ROTATE_WHEN', 'midnight'), backupCount=backup_count, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))), backupCount=backup_count, encoding='utf-8'
+        )
+    if os.getenv('LOG_COMPRESS', '1') == '1':
+        handler.namer = lambda name: name + '.gz'
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Routes all logging through a queue to a listener thread writing to the console and the
+    rotating log file. Returns the listener, which is stopped (flushing the queue) at exit.
+    """
+    formatter = JsonFormatter() if os.getenv('LOG_FORMAT', 'text').lower() == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [_file_handler(), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(CommandContextFilter())
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = LogListener(log_queue, handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
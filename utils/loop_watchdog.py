@@ -0,0 +1,112 @@
+# utils/loop_watchdog.py
+# Detects when the event loop is blocked by synchronous work.
+# A heartbeat task on the loop ticks every few milliseconds; a sidecar thread notices when
+# the ticks stop, captures the loop thread's stack and the app command being handled, and
+# logs it. Counters are kept so staff can see which commands block the loop under real load.
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _find_command_name(frame):
+    """Walks outwards from frame looking for an `interaction` local with a command attached."""
+    while frame is not None:
+        interaction = frame.f_locals.get('interaction')
+        command = getattr(interaction, 'command', None)
+        if command is not None:
+            return getattr(command, 'qualified_name', None) or getattr(command, 'name', None)
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    """
+    Reports event loop stalls longer than `threshold` seconds.
+    start() must be called from the loop being watched.
+    """
+    def __init__(self, threshold=0.5, interval=0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self.total_stall_time = 0.0
+        self.longest_stall = 0.0
+        self.lag = 0.0 # How late the latest heartbeat was, stall or not
+        self.stalls_by_command = Counter()
+        self._last_beat = time.monotonic()
+        self._current = None # (command name, worst lag seen) for the stall in progress
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loop_thread_id = None
+        self._heartbeat = None
+        self._thread = None
+
+    def start(self):
+        """Starts the heartbeat task and the sidecar thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop watchdog started (threshold {self.threshold * 1000:.0f} ms).")
+
+    async def stop(self):
+        """Stops the heartbeat task and the sidecar thread."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+
+    async def _beat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            lag = time.monotonic() - self._last_beat - self.interval
+            self.lag = max(lag, 0.0)
+            if lag > self.threshold:
+                if self._current is None:
+                    self._report(lag)
+                else:
+                    self._current = (self._current[0], lag)
+            elif self._current is not None:
+                self._finish()
+
+    def _report(self, lag):
+        """Captures and logs what the loop thread is doing while it is stalled."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        command = _find_command_name(frame) if frame is not None else None
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else '<no frame>'
+        self._current = (command, lag)
+        where = f"in /{command}" if command else "outside of an app command"
+        logger.warning(f"Event loop blocked for over {lag * 1000:.0f} ms {where}. Loop thread stack:\n{stack}")
+
+    def _finish(self):
+        command, lag = self._current
+        self._current = None
+        with self._lock:
+            self.stalls += 1
+            self.total_stall_time += lag
+            self.longest_stall = max(self.longest_stall, lag)
+            self.stalls_by_command[command or '<no command>'] += 1
+        logger.warning(f"Event loop stall ended after about {lag * 1000:.0f} ms.")
+
+    def snapshot(self):
+        """Returns a copy of the counters, safe to read from the event loop."""
+        with self._lock:
+            return {
+                "stalls": self.stalls,
+                "total_stall_time": self.total_stall_time,
+                "longest_stall": self.longest_stall,
+                "stalls_by_command": dict(self.stalls_by_command),
+            }
@@ -0,0 +1,166 @@
+# utils/member_cache.py
+# Looks up members and users in discord.py's cache and fetches the missing ones on demand,
+# and can fill the member cache in the background once the bot is ready.
+# MEMBER_CHUNKING picks when guild member lists are downloaded over the gateway
+# (this only applies with the members intent, e.g. INTENTS_PROFILE=all):
+#   startup (default): discord.py chunks every guild before on_ready
+#   lazy: on_ready fires without chunking; members are fetched when a cog needs them,
+#         and the guilds are chunked one at a time in the background after ready
+#         (when sharded, each shard's guilds as soon as that shard is ready)
+
+import asyncio
+import logging
+import os
+import time
+
+import discord
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Most user IDs one gateway member request can ask for
+QUERY_BATCH_SIZE = 100
+
+# Pause between chunking one guild and the next during the background warm-up (seconds)
+WARM_UP_DELAY = 1.0
+
+
+def member_chunking_mode():
+    """Returns the MEMBER_CHUNKING environment variable: "startup" (default) or "lazy"."""
+    return os.getenv('MEMBER_CHUNKING', 'startup').lower()
+
+
+class MemberCache:
+    """
+    Member and user lookups that fall back to fetching from Discord. Concurrent lookups in
+    the same guild are batched into one gateway request of up to QUERY_BATCH_SIZE members.
+    """
+    def __init__(self, bot, mode=None):
+        self.bot = bot
+        self.mode = mode or member_chunking_mode()
+        self._pending = {} # guild id -> {user id: future} waiting for the next batch
+        self._flushes = set() # Batch tasks, referenced until they finish
+        self._users = {} # user id -> fetch_user task in flight
+        self._warm_ups = {} # shard id (None for every guild) -> warm-up task
+        self.warm_up_time = None # Seconds the background warm-up took (the longest one when sharded), once it finished
+
+    async def get_members(self, guild, user_ids):
+        """Returns {user id: Member} for the user_ids that are in the guild, cached or fetched."""
+        members = {}
+        missing = []
+        for user_id in user_ids:
+            member = guild.get_member(user_id)
+            if member is not None:
+                members[user_id] = member
+            else:
+                missing.append(user_id)
+        if missing:
+            fetched = await asyncio.gather(*(asyncio.shield(self._request(guild, user_id)) for user_id in missing))
+            members.update((user_id, member) for user_id, member in zip(missing, fetched) if member is not None)
+        return members
+
+    async def get_member(self, guild, user_id):
+        """The guild's member with this ID, cached or fetched, or None if they aren't in it."""
+        return (await self.get_members(guild, [user_id])).get(user_id)
+
+    async def get_user(self, user_id):
+        """The user with this ID, cached or fetched, or None if Discord doesn't know them."""
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return user
+        task = self._users.get(user_id)
+        if task is None:
+            task = self._users[user_id] = asyncio.create_task(self._fetch_user(user_id))
+        return await asyncio.shield(task)
+
+    async def _fetch_user(self, user_id):
+        try:
+            return await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            return None
+        finally:
+            del self._users[user_id]
+
+    def _request(self, guild, user_id):
+        """A future for the member, joining the batch being collected for the guild."""
+        pending = self._pending.get(guild.id)
+        if pending is None:
+            pending = self._pending[guild.id] = {}
+            task = asyncio.create_task(self._flush(guild))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        future = pending.get(user_id)
+        if future is None:
+            future = pending[user_id] = asyncio.get_running_loop().create_future()
+        return future
+
+    async def _flush(self, guild):
+        # Runs on the next loop iteration, so lookups started together share the requests
+        await asyncio.sleep(0)
+        pending = self._pending.pop(guild.id)
+        user_ids = list(pending)
+        for start in range(0, len(user_ids), QUERY_BATCH_SIZE):
+            batch = user_ids[start:start + QUERY_BATCH_SIZE]
+            try:
+                found = await self._fetch_members(guild, batch)
+            except Exception as e:
+                logger.warning(f"Failed to fetch {len(batch)} members of guild {guild.id}: {e}")
+                found = {}
+            for user_id in batch:
+                if not pending[user_id].done():
+                    pending[user_id].set_result(found.get(user_id))
+
+    async def _fetch_members(self, guild, user_ids):
+        if self.bot.intents.members:
+            # One gateway request for the whole batch; the members are cached as they arrive
+            members = await guild.query_members(user_ids=user_ids, limit=len(user_ids), cache=True)
+            return {member.id: member for member in members}
+        # Without the members intent only REST works, and it looks up members one at a time
+        async def fetch(user_id):
+            try:
+                return await guild.fetch_member(user_id)
+            except discord.NotFound:
+                return None
+        members = await asyncio.gather(*(fetch(user_id) for user_id in user_ids))
+        return {member.id: member for member in members if member is not None}
+
+    def start_warm_up(self, shard_id=None):
+        """
+        In lazy mode, starts chunking the guilds that weren't chunked at startup, only those on
+        shard_id if given. Shards warm up in parallel, each over its own gateway connection.
+        """
+        if self.mode != 'lazy' or not self.bot.intents.members or shard_id in self._warm_ups:
+            return
+        self._warm_ups[shard_id] = asyncio.create_task(self._warm_up_guilds(shard_id))
+
+    async def _warm_up_guilds(self, shard_id):
+        start = time.perf_counter()
+        chunked = 0
+        guilds = [guild for guild in self.bot.guilds if not guild.chunked and (shard_id is None or guild.shard_id == shard_id)]
+        for position, guild in enumerate(guilds):
+            if position:
+                await asyncio.sleep(WARM_UP_DELAY)
+            try:
+                await guild.chunk(cache=True)
+                chunked += 1
+            except Exception as e:
+                logger.warning(f"Background chunking of guild {guild.id} failed: {e}")
+        elapsed = time.perf_counter() - start
+        self.warm_up_time = max(self.warm_up_time or 0.0, elapsed)
+        scope = f" of shard {shard_id}" if shard_id is not None else ""
+        logger.info(f"Member cache warm-up{scope} finished: chunked {chunked} guilds in {elapsed:.2f}s.")
+
+    async def wait_warm_ups(self):
+        """Waits until every warm-up started so far has finished."""
+        if self._warm_ups:
+            await asyncio.gather(*self._warm_ups.values())
+
+    async def close(self):
+        """Stops the background warm-ups that are still running."""
+        for task in self._warm_ups.values():
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
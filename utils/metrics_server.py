@@ -0,0 +1,191 @@
+# utils/metrics_server.py
+# An optional HTTP endpoint inside the bot process serving its metrics in the Prometheus text
+# format, so the bot can be graphed and alerted on from outside Discord.
+# Enabled by setting METRICS_PORT; it listens on METRICS_HOST (default 127.0.0.1, so only the
+# machine the bot runs on can reach it) and answers GET /metrics on the bot's own event loop.
+
+import logging
+import math
+from collections import Counter
+
+from aiohttp import web
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Builds a metrics page: each family's HELP and TYPE lines followed by its samples."""
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, description):
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name, value, **labels):
+        if labels:
+            label_text = ','.join(f'{key}="{_label_value(label)}"' for key, label in labels.items())
+            self.lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        else:
+            self.lines.append(f"{name} {_format_value(value)}")
+
+    def histogram(self, name, histogram, **labels):
+        """Writes a command_metrics.Histogram as cumulative buckets, sum and count."""
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, **labels, le=_format_value(bound))
+        self.sample(f"{name}_sum", histogram.sum, **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+class MetricsServer:
+    """Serves /metrics for the bot; counts gateway events by type while it runs."""
+    def __init__(self, bot, host='127.0.0.1', port=9100):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.gateway_events = Counter() # event type -> count, needs enable_debug_events=True
+        self._runner = None
+
+    async def _count_event(self, event_type):
+        self.gateway_events[event_type] += 1
+
+    async def start(self):
+        self.bot.add_listener(self._count_event, 'on_socket_event_type')
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        self.bot.remove_listener(self._count_event, 'on_socket_event_type')
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request):
+        try:
+            body = await self.render()
+        except Exception as e:
+            logger.error(f"Failed to render metrics: {e}", exc_info=True)
+            return web.Response(status=500, text="Failed to render metrics\n")
+        return web.Response(body=body.encode('utf-8'), headers={'Content-Type': CONTENT_TYPE})
+
+    async def render(self):
+        """The current metrics page."""
+        bot = self.bot
+        writer = MetricsWriter()
+
+        # Gateway
+        writer.family('discord_gateway_latency_seconds', 'gauge', 'Time between a gateway heartbeat and its acknowledgement.')
+        if math.isfinite(bot.latency):
+            writer.sample('discord_gateway_latency_seconds', bot.latency)
+        writer.family('discord_gateway_events_total', 'counter', 'Gateway events received, by type.')
+        for event_type, count in sorted(self.gateway_events.items()):
+            writer.sample('discord_gateway_events_total', count, event=event_type)
+
+        # Shards, from the shard monitor when the bot is sharded
+        shard_monitor = getattr(bot, 'shard_monitor', None)
+        if shard_monitor is not None:
+            shards = shard_monitor.snapshot()
+            for family, kind, key, description in (
+                ('discord_shard_up', 'gauge', None, 'Whether the shard is connected and ready.'),
+                ('discord_shard_latency_seconds', 'gauge', 'latency', 'Time between a heartbeat of the shard and its acknowledgement.'),
+                ('discord_shard_guilds', 'gauge', 'guilds', 'Guilds on the shard.'),
+                ('discord_shard_events_total', 'counter', 'events', 'Gateway events the shard received.'),
+                ('discord_shard_disconnects_total', 'counter', 'disconnects', 'Times the shard lost its gateway connection.')
+            ):
+                writer.family(family, kind, description)
+                for shard in shards:
+                    value = int(shard['state'] == 'ready') if key is None else shard[key]
+                    if value is not None and math.isfinite(value):
+                        writer.sample(family, value, shard=shard['id'])
+
+        # Commands, from the command tree's metrics
+        metrics = getattr(bot.tree, 'metrics', None)
+        if metrics is not None:
+            writer.family('discord_commands_total', 'counter', 'App command invocations, by outcome.')
+            for name, stats in sorted(metrics.commands.items()):
+                for outcome, count in sorted(stats.outcomes.items()):
+                    writer.sample('discord_commands_total', count, command=name, outcome=outcome)
+            for family, attribute, description in (
+                ('discord_command_duration_seconds', 'handler', 'Time spent handling an app command.'),
+                ('discord_command_first_response_seconds', 'first_response', 'Time until an app command sent its initial response.'),
+                ('discord_command_rest_seconds', 'rest', 'Time an app command spent in Discord API requests.')
+            ):
+                writer.family(family, 'histogram', description)
+                for name, stats in sorted(metrics.commands.items()):
+                    writer.histogram(family, getattr(stats, attribute), command=name)
+
+        # REST
+        rest_metrics = getattr(bot, 'rest_metrics', None)
+        if rest_metrics is not None:
+            writer.family('discord_rest_responses_total', 'counter', 'Discord API responses, by status code.')
+            for status, count in sorted(rest_metrics.responses.items()):
+                writer.sample('discord_rest_responses_total', count, status=status)
+            writer.family('discord_rest_rate_limited_total', 'counter', 'Discord API requests that were rate limited, by scope.')
+            for scope, count in sorted(rest_metrics.rate_limited.items()):
+                writer.sample('discord_rest_rate_limited_total', count, scope=scope)
+
+        # Caches
+        writer.family('discord_guilds', 'gauge', 'Guilds the bot is in.')
+        writer.sample('discord_guilds', len(bot.guilds))
+        writer.family('discord_cached_users', 'gauge', 'Users in the discord.py cache.')
+        writer.sample('discord_cached_users', len(bot.users))
+        writer.family('discord_cached_members', 'gauge', 'Guild members in the discord.py cache.')
+        writer.sample('discord_cached_members', sum(len(guild.members) for guild in bot.guilds))
+        tags_cog = bot.get_cog('TagsCog')
+        if tags_cog is not None:
+            writer.family('bot_tags', 'gauge', 'Tags and tag aliases, by guild.')
+            for guild_id, library in sorted(tags_cog.libraries.items()):
+                writer.sample('bot_tags', len(library.tags), guild=guild_id, kind='tag')
+                writer.sample('bot_tags', len(library.aliases), guild=guild_id, kind='alias')
+        profile_cog = bot.get_cog('ProfileCog')
+        if profile_cog is not None and profile_cog.profiles is not None:
+            cache = profile_cog.profiles.stats()
+            writer.family('bot_profile_cache_entries', 'gauge', 'Profiles held in the profile cache.')
+            writer.sample('bot_profile_cache_entries', cache['cached'])
+            writer.family('bot_profile_cache_lookups_total', 'counter', 'Profile cache lookups, by result.')
+            writer.sample('bot_profile_cache_lookups_total', cache['hits'], result='hit')
+            writer.sample('bot_profile_cache_lookups_total', cache['misses'], result='miss')
+        projects = getattr(bot, 'projects', None)
+        if projects is not None:
+            writer.family('bot_projects', 'gauge', 'Projects in the project store.')
+            writer.sample('bot_projects', await projects.count())
+            if projects.ids is not None:
+                writer.family('bot_project_id_length', 'gauge', 'Length of newly allocated project IDs.')
+                writer.sample('bot_project_id_length', projects.ids.length)
+                writer.family('bot_project_id_space_fill_ratio', 'gauge', 'Fraction of the IDs of the current project ID length that are in use.')
+                writer.sample('bot_project_id_space_fill_ratio', projects.ids.fill)
+
+        # Event loop, from the loop watchdog if it is running
+        watchdog = getattr(bot, 'loop_watchdog', None)
+        if watchdog is not None:
+            stalls = watchdog.snapshot()
+            writer.family('bot_event_loop_lag_seconds', 'gauge', 'How late the latest event loop heartbeat was.')
+            writer.sample('bot_event_loop_lag_seconds', watchdog.lag)
+            writer.family('bot_event_loop_stalls_total', 'counter', 'Event loop stalls longer than the watchdog threshold.')
+            writer.sample('bot_event_loop_stalls_total', stalls['stalls'])
+            writer.family('bot_event_loop_stall_seconds_total', 'counter', 'Total time the event loop spent stalled.')
+            writer.sample('bot_event_loop_stall_seconds_total', stalls['total_stall_time'])
+
+        return writer.text()
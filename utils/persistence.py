@@ -0,0 +1,103 @@
+# utils/persistence.py
+# Helpers for writing the JSON data files safely and without blocking the event loop.
+# atomic_write() never leaves a half-written file behind, and WriteBehind coalesces
+# bursts of changes into a single background write per flush interval.
+
+import asyncio
+import logging
+import os
+import tempfile
+
+from utils.serialization import encode
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def atomic_write(path, data):
+    """
+    Encodes data in the configured DATA_FORMAT to a temp file next to path, fsyncs it and
+    renames it over path. A crash at any point leaves either the old file or the new one,
+    never a partial one.
+    """
+    raw = encode(data)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class WriteBehind:
+    """
+    Debounced writer for a JSON data file.
+    Call mark_dirty() after changing the data; the first call schedules a flush after
+    `interval` seconds and any further calls in that window are folded into the same write.
+    Changes made while a write is running, and failed writes, are flushed one interval later.
+    The snapshot is taken on the event loop and serialized in a worker thread.
+    Pass `write`, a coroutine function taking the snapshot, to store it some other way than
+    as one file at path (which is then only used in log messages).
+    """
+    def __init__(self, path, snapshot, interval=2.0, write=None):
+        self.path = path
+        self.snapshot = snapshot # Callable returning a copy of the data that is safe to hand to a thread
+        self.interval = interval
+        self.write = write or self._write_file
+        self._dirty = False
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def mark_dirty(self):
+        """Marks the data as changed and schedules a flush if one isn't pending already."""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self):
+        # A change made while this task is writing doesn't schedule a flush of its own (this task
+        # is still running), so keep flushing every interval until the data stays clean
+        while self._dirty:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Background write of {self.path} failed: {e}", exc_info=True)
+
+    async def _write_file(self, data):
+        await asyncio.to_thread(atomic_write, self.path, data)
+
+    async def flush(self):
+        """Writes the data now if it has changed since the last write."""
+        async with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = self.snapshot()
+            try:
+                await self.write(data)
+            except BaseException:
+                self._dirty = True # Keep the changes pending so the next flush retries them
+                raise
+            logger.info(f"Flushed pending changes to {self.path}.")
+
+    async def close(self):
+        """Writes any outstanding changes and stops the pending timer. Call on shutdown."""
+        # Flushing first waits for an in-flight background write to finish before writing again
+        await self.flush()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
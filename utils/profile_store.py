@@ -0,0 +1,135 @@
+# utils/profile_store.py
+# Lazily loaded profile storage for the profile cog.
+# Each profile lives in its own file, profiles/<user_id>.json, so a single profile can be
+# read or written without touching the others. Profiles are only loaded when someone asks
+# for them and are kept in a size-bounded LRU cache; edits are written in the background.
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+
+from utils.journal import load_journaled
+from utils.persistence import WriteBehind, atomic_write
+from utils.serialization import decode, encode
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Marker written once the old single-file profiles.json has been split into the directory
+MIGRATED_MARKER = '.migrated'
+
+
+class ProfileStore:
+    """
+    Profile storage with an LRU cache in front of a one-file-per-user directory.
+    Use ProfileStore.open() rather than the constructor so setup runs off the event loop.
+    """
+    def __init__(self, directory, cache_size=1000, flush_interval=2.0):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict() # user_id -> profile data, or None for "no profile"
+        self._unsaved = {} # user_id -> profile data not yet on disk
+        # Edits within flush_interval of each other are written together, each profile to its own file
+        self._writer = WriteBehind(f"{directory}/", lambda: dict(self._unsaved), flush_interval, write=self._write_unsaved)
+
+    @classmethod
+    async def open(cls, directory, migrate_from=None, **kwargs):
+        """Opens the profile directory, splitting migrate_from into it on first start."""
+        store = cls(directory, **kwargs)
+        await asyncio.to_thread(store._setup, migrate_from)
+        return store
+
+    def _setup(self, migrate_from):
+        os.makedirs(self.directory, exist_ok=True)
+        marker = os.path.join(self.directory, MIGRATED_MARKER)
+        if migrate_from and not os.path.exists(marker):
+            profiles = load_journaled(migrate_from) if os.path.exists(migrate_from) else {}
+            # The source file is left untouched and the marker is written last, so an interrupted
+            # migration simply runs again; that makes a per-file fsync unnecessary here
+            for user_id, profile_data in profiles.items():
+                with open(self._path(user_id), 'wb') as f:
+                    f.write(encode(profile_data))
+            if hasattr(os, 'sync'):
+                os.sync()
+            with open(marker, 'w', encoding='utf-8') as f:
+                f.write(migrate_from)
+            logger.info(f"Migrated {len(profiles)} profiles from {migrate_from} to {self.directory}/.")
+
+    def _path(self, user_id):
+        if not user_id.isdigit():
+            raise ValueError(f"Invalid user ID {user_id!r}.")
+        return os.path.join(self.directory, f"{user_id}.json")
+
+    def _read(self, user_id):
+        """Reads one profile from disk; runs in a worker thread."""
+        try:
+            with open(self._path(user_id), 'rb') as f:
+                return decode(f.read())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.error(f"Profile file for {user_id} is corrupted. Treating it as missing.")
+            return None
+
+    def _remember(self, user_id, profile_data):
+        self._cache[user_id] = profile_data
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, user_id):
+        """Returns the profile for a user ID, or None if they haven't created one."""
+        if user_id in self._unsaved:
+            return self._unsaved[user_id]
+        if user_id in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(user_id)
+            return self._cache[user_id]
+        self.misses += 1
+        profile_data = await asyncio.to_thread(self._read, user_id)
+        if user_id not in self._unsaved: # Don't cache a stale read if it was updated meanwhile
+            self._remember(user_id, profile_data)
+        return profile_data
+
+    def set(self, user_id, profile_data):
+        """Stores a profile and schedules it to be written in the background."""
+        self._path(user_id) # Validate the ID up front rather than in the background writer
+        self._unsaved[user_id] = profile_data
+        self._remember(user_id, profile_data)
+        self._writer.mark_dirty()
+
+    async def flush(self):
+        """Writes every unsaved profile now, each to its own file."""
+        await self._writer.flush()
+
+    async def _write_unsaved(self, batch):
+        await asyncio.to_thread(self._write_batch, batch)
+        for user_id, profile_data in batch.items():
+            # Keep entries that were updated again while this batch was being written
+            if self._unsaved.get(user_id) is profile_data:
+                del self._unsaved[user_id]
+
+    def _write_batch(self, batch):
+        for user_id, profile_data in batch.items():
+            atomic_write(self._path(user_id), profile_data)
+
+    async def close(self):
+        """Writes any unsaved profiles and stops the pending timer. Call on shutdown."""
+        await self._writer.close()
+
+    def stats(self):
+        """Cache metrics for /stats."""
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self._cache),
+            "capacity": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,97 @@
+# utils/project_ids.py
+# Allocates unique project IDs from an in-memory set of the IDs already in use.
+# IDs start at 6 characters; once that space is a quarter full, new IDs get longer so
+# a random draw almost never collides.
+
+import logging
+import random
+import string
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+ID_CHARACTERS = string.ascii_uppercase + string.digits
+
+# ID lengths to use, in order; the next one is used once the current one is crowded
+ID_LENGTHS = (6, 8, 10)
+
+# Fraction of an ID space that may be used before moving on to the next length
+MAX_FILL = 0.25
+
+
+class ProjectIdAllocator:
+    """
+    Hands out project IDs that aren't in use, with an O(1) collision check per draw.
+    allocate() reserves the ID immediately and never awaits, so two creations running
+    at the same time can't receive the same ID.
+    """
+    def __init__(self, used_ids=()):
+        self._used = set(used_ids)
+        self._counts = {length: 0 for length in ID_LENGTHS}
+        for project_id in self._used:
+            if len(project_id) in self._counts:
+                self._counts[len(project_id)] += 1
+        self._length = self._pick_length()
+
+    @staticmethod
+    def capacity(length):
+        """Number of distinct IDs of the given length."""
+        return len(ID_CHARACTERS) ** length
+
+    def _pick_length(self):
+        for length in ID_LENGTHS:
+            if self._counts[length] < self.capacity(length) * MAX_FILL:
+                return length
+        raise RuntimeError("Every project ID length is crowded. Add a longer length to ID_LENGTHS.")
+
+    @property
+    def length(self):
+        """The length of newly allocated IDs."""
+        return self._length
+
+    @property
+    def fill(self):
+        """Fraction of the current ID length's space that is in use."""
+        return self._counts[self._length] / self.capacity(self._length)
+
+    def __contains__(self, project_id):
+        return project_id in self._used
+
+    def __len__(self):
+        return len(self._used)
+
+    def allocate(self):
+        """Draws and reserves a new unique project ID."""
+        while True:
+            project_id = ''.join(random.choice(ID_CHARACTERS) for _ in range(self._length))
+            if project_id not in self._used:
+                self._add(project_id)
+                return project_id
+
+    def add(self, project_id):
+        """Marks an ID that was created elsewhere (e.g. a migration) as used."""
+        if project_id not in self._used:
+            self._add(project_id)
+
+    def release(self, project_id):
+        """Returns a reserved ID that ended up not being used."""
+        if project_id in self._used:
+            self._used.remove(project_id)
+            if len(project_id) in self._counts:
+                self._counts[len(project_id)] -= 1
+
+    def _add(self, project_id):
+        self._used.add(project_id)
+        if len(project_id) in self._counts:
+            self._counts[len(project_id)] += 1
+            if self._counts[self._length] >= self.capacity(self._length) * MAX_FILL:
+                old_length = self._length
+                self._length = self._pick_length()
+                logger.warning(f"{old_length}-character project IDs are {MAX_FILL:.0%} used. New projects now get {self._length}-character IDs.")
+
+    def describe(self):
+        """One-line summary of how full the ID space is, for logs and /stats."""
+        return (
+            f"{len(self._used)} IDs in use, {self._counts[self._length]:,} of {self.capacity(self._length):,} "
+            f"{self._length}-character IDs taken ({self.fill:.4%}; longer IDs from {MAX_FILL:.0%})"
+        )
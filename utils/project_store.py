@@ -0,0 +1,143 @@
+# utils/project_store.py
+# Shared project repository used by the project cogs.
+# The bot owns a single store instance (bot.projects) and injects it into the cogs.
+# Two backends are available, picked with the PROJECTS_BACKEND environment variable:
+#   json   - (default) the whole dataset in memory, persisted to projects.json
+#            (or appended to projects.json.journal when PERSISTENCE_MODE=journal)
+#   sqlite - a SQLite database in WAL mode with indexes for per-creator/status lookups
+
+import asyncio
+import logging
+import os
+
+from utils.journal import Journal, journal_enabled, load_journaled
+from utils.locks import KeyedLocks
+from utils.persistence import atomic_write
+from utils.project_ids import ProjectIdAllocator
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# File path for the project data
+PROJECTS_FILE = 'projects.json'
+
+# Fields a project can be looked up by with find()
+INDEXED_FIELDS = ("creator_id", "recipient_id", "department", "status")
+
+
+class ProjectStore:
+    """
+    JSON backend: holds every project in memory, keyed by its project ID.
+    Reads never touch disk and every change is persisted through _persist().
+
+    Changes to one project are serialized by a per-project lock, so updates to unrelated
+    projects run in parallel. Project dictionaries are replaced rather than mutated, so a
+    shallow copy of the store is always a consistent snapshot to write.
+    """
+    def __init__(self, path=PROJECTS_FILE):
+        self.path = path
+        self._projects = load_journaled(self.path)
+        self._journal = Journal(self.path, lambda: dict(self._projects)) if journal_enabled() else None
+        # Allocator for new project IDs, seeded with the IDs already in use
+        self.ids = ProjectIdAllocator(self._projects)
+        self._record_locks = KeyedLocks()
+        self._write_lock = asyncio.Lock()
+        self._version = 0 # Bumped on every change
+        self._saved_version = 0 # Latest version known to be on disk
+        logger.info(f"ProjectStore loaded {len(self._projects)} projects from {self.path} ({self.ids.describe()}).")
+
+    def lock(self, project_id):
+        """
+        Per-project lock for read-modify-write sequences, e.g.
+        `async with projects.lock(project_id): ...`. The store's own methods can be called inside it.
+        """
+        return self._record_locks.hold(project_id)
+
+    async def _save(self):
+        """
+        Writes the whole store to the data file in a worker thread, one write at a time.
+        Changes that arrive while a write is running share the next write instead of
+        queueing one each.
+        """
+        version = self._version
+        async with self._write_lock:
+            if self._saved_version >= version:
+                return # A write that started after our change already covered it
+            version = self._version
+            snapshot = dict(self._projects)
+            await asyncio.to_thread(atomic_write, self.path, snapshot)
+            self._saved_version = version
+
+    async def _persist(self, project_id):
+        """Persists a change to one project. This is the only place the store touches disk."""
+        self._version += 1
+        if self._journal is not None:
+            self._journal.set(project_id, self._projects[project_id])
+        else:
+            await self._save()
+
+    async def get(self, project_id):
+        """Returns the project data for an ID, or None if it doesn't exist."""
+        return self._projects.get(project_id)
+
+    async def contains(self, project_id):
+        """Returns True if a project with this ID exists."""
+        return project_id in self._projects
+
+    async def count(self):
+        """Returns the number of projects."""
+        return len(self._projects)
+
+    async def find(self, **filters):
+        """
+        Returns {project_id: project_data} for every project matching all the given
+        field filters, e.g. find(creator_id="123", status="In Progress").
+        """
+        for field in filters:
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Projects can't be looked up by '{field}'.")
+        return {
+            project_id: project_data
+            for project_id, project_data in self._projects.items()
+            if all(project_data.get(field) == value for field, value in filters.items())
+        }
+
+    async def create(self, project_id, project_data):
+        """Adds a new project and persists it."""
+        async with self.lock(project_id):
+            if project_id in self._projects:
+                raise KeyError(f"Project {project_id} already exists.")
+            self._projects[project_id] = dict(project_data)
+            self.ids.add(project_id)
+            await self._persist(project_id)
+
+    async def update_status(self, project_id, new_status):
+        """
+        Sets the status of an existing project and persists it.
+        Returns the updated project data, or None if the project doesn't exist.
+        """
+        async with self.lock(project_id):
+            project_data = self._projects.get(project_id)
+            if project_data is None:
+                return None
+            project_data = {**project_data, "status": new_status}
+            self._projects[project_id] = project_data
+            await self._persist(project_id)
+            return project_data
+
+    async def close(self):
+        """Closes the journal, if one is in use. Every change is already on disk."""
+        if self._journal is not None:
+            await self._journal.close()
+
+
+async def open_project_store():
+    """Opens the project store selected by the PROJECTS_BACKEND environment variable."""
+    backend = os.getenv('PROJECTS_BACKEND', 'json').lower()
+    if backend == 'sqlite':
+        # Imported here so the JSON backend doesn't pay for it
+        from utils.sqlite_project_store import SQLiteProjectStore
+        return await SQLiteProjectStore.open(os.getenv('PROJECTS_DB', 'projects.db'), migrate_from=PROJECTS_FILE)
+    if backend != 'json':
+        logger.warning(f"Unknown PROJECTS_BACKEND '{backend}'. Falling back to the JSON backend.")
+    return ProjectStore()
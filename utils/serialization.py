@@ -0,0 +1,81 @@
+# utils/serialization.py
+# Encodings for the profile, project and tag data files, picked with the DATA_FORMAT
+# environment variable:
+#   json    - (default) indented JSON, easy to read and edit by hand
+#   compact - JSON without whitespace, encoded with orjson when it is installed
+#   msgpack - binary MessagePack, needs the msgpack package
+# Files are decoded by looking at their first byte, so switching formats needs no migration:
+# the next save simply writes the new format.
+
+import functools
+import json
+import logging
+import os
+
+# Optional fast encoders; the formats that need them fall back gracefully when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "compact", "msgpack")
+
+# First bytes of a MessagePack map (fixmap, map16, map32); none of them can start a JSON document
+MSGPACK_MAP_PREFIXES = frozenset(range(0x80, 0x90)) | {0xde, 0xdf}
+
+
+@functools.lru_cache(maxsize=None)
+def data_format():
+    """Returns the configured DATA_FORMAT, falling back to json if it can't be used."""
+    fmt = os.getenv('DATA_FORMAT', 'json').lower()
+    if fmt not in FORMATS:
+        logger.warning(f"Unknown DATA_FORMAT '{fmt}'. Using json.")
+        return "json"
+    if fmt == "msgpack" and msgpack is None:
+        logger.warning("DATA_FORMAT is msgpack but the msgpack package isn't installed. Using json.")
+        return "json"
+    return fmt
+
+
+def encode(data, fmt=None):
+    """Serializes data to bytes in the given format (default: the configured one)."""
+    fmt = fmt or data_format()
+    if fmt == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    if fmt == "compact":
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, indent=4).encode('utf-8')
+
+
+def detect_format(raw):
+    """Returns "msgpack" or "json" for the encoded bytes."""
+    if raw and raw[0] in MSGPACK_MAP_PREFIXES:
+        return "msgpack"
+    return "json"
+
+
+def decode(raw):
+    """
+    Deserializes bytes written by encode() in any format.
+    Raises ValueError if the data is empty or corrupted.
+    """
+    if detect_format(raw) == "msgpack":
+        if msgpack is None:
+            raise ValueError("data is MessagePack but the msgpack package isn't installed")
+        try:
+            return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        except Exception as e:
+            raise ValueError(f"invalid MessagePack data: {e}") from e
+    if orjson is not None:
+        return orjson.loads(raw) # orjson.JSONDecodeError is a ValueError
+    return json.loads(raw)
@@ -0,0 +1,259 @@
+# utils/sharding.py
+# Opt-in sharding for running the bot across many guilds. With SHARDING=auto the bot is an
+# AutoShardedBot: one gateway connection per shard, all in this process unless SHARD_IDS says otherwise.
+# Configured with environment variables:
+#   SHARDING     off (default) for a single gateway connection, or auto
+#   SHARD_COUNT  total number of shards over every process; unset lets Discord recommend one
+#   SHARD_IDS    the shards this process runs, e.g. 0,1 or 4-7 (needs SHARD_COUNT); unset runs them all
+# When the shards are split over several processes, each guild's commands are synced by the process
+# running that guild's shard and the global commands by the process running shard 0.
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+
+from discord.ext import commands
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# How often each shard's event count is sampled to work out its event rate (seconds)
+SHARD_SAMPLE_INTERVAL = 10.0
+
+
+def shard_for_guild(guild_id, shard_count):
+    """The shard Discord sends a guild's events to."""
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(text):
+    """Parses a SHARD_IDS value such as "0,1,4-7" into a sorted list of shard IDs."""
+    shard_ids = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            shard_ids.update(range(int(first), int(last) + 1))
+        else:
+            shard_ids.add(int(part))
+    return sorted(shard_ids)
+
+
+class ShardConfig:
+    """The sharding settings: whether the bot is sharded, and which shards this process runs."""
+    def __init__(self, enabled=False, shard_count=None, shard_ids=None):
+        self.enabled = enabled
+        self.shard_count = shard_count # None lets Discord pick the count
+        self.shard_ids = shard_ids # None runs every shard in this process
+
+    @classmethod
+    def from_env(cls):
+        """Reads SHARDING, SHARD_COUNT and SHARD_IDS. Raises ValueError for an invalid combination."""
+        mode = os.getenv('SHARDING', 'off').lower()
+        if mode not in ('off', 'auto'):
+            raise ValueError(f"SHARDING must be 'off' or 'auto', not {mode!r}")
+        shard_count = int(os.environ['SHARD_COUNT']) if os.getenv('SHARD_COUNT') else None
+        shard_ids = parse_shard_ids(os.environ['SHARD_IDS']) if os.getenv('SHARD_IDS') else None
+        if mode == 'off':
+            if shard_count is not None or shard_ids is not None:
+                logger.warning("SHARD_COUNT and SHARD_IDS are ignored unless SHARDING=auto.")
+            return cls()
+
+        if shard_count is not None and shard_count < 1:
+            raise ValueError("SHARD_COUNT must be at least 1")
+        if shard_ids is not None:
+            if shard_count is None:
+                raise ValueError("SHARD_IDS needs SHARD_COUNT, the number of shards over every process")
+            if not shard_ids or shard_ids[0] < 0 or shard_ids[-1] >= shard_count:
+                raise ValueError(f"SHARD_IDS must be between 0 and {shard_count - 1}")
+        config = cls(True, shard_count, shard_ids)
+        if config.shard_ids is not None and len(config.shard_ids) < config.shard_count:
+            logger.info(f"Sharding: running shards {config.shard_ids} of {config.shard_count} in this process.")
+            logger.warning(
+                "The other shards run in other processes. Data files (tags, profiles, JSON projects) "
+                "are not shared between processes; use PROJECTS_BACKEND=sqlite for projects."
+            )
+        else:
+            logger.info(f"Sharding: running all {config.shard_count or 'recommended'} shards in this process.")
+        return config
+
+    @property
+    def bot_class(self):
+        return commands.AutoShardedBot if self.enabled else commands.Bot
+
+    def bot_options(self):
+        """The shard_count and shard_ids keyword arguments for the bot."""
+        if not self.enabled:
+            return {}
+        return {"shard_count": self.shard_count, "shard_ids": self.shard_ids}
+
+    def runs_shard(self, shard_id):
+        """Whether this process runs the shard (always, unless SHARD_IDS splits them over processes)."""
+        return self.shard_ids is None or shard_id in self.shard_ids
+
+    def runs_guild(self, guild_id):
+        """Whether this process runs the shard that receives the guild's events and interactions."""
+        if self.shard_ids is None:
+            return True
+        return self.runs_shard(shard_for_guild(guild_id, self.shard_count))
+
+
+# Returned by _gateway_sequence when the sequence number can't be read at all
+_UNAVAILABLE = object()
+
+
+def _gateway_sequence(shard_info):
+    """
+    The sequence number of the last event in the shard's gateway session, i.e. how many events the
+    session has received (None before the first one), or _UNAVAILABLE.
+    discord.py has no public per-shard event count: on_socket_event_type and on_socket_raw_receive
+    don't say which shard an event came from. So this reads the private ShardInfo._parent (the Shard)
+    and its websocket's sequence, the number discord.py 2.x sends with every heartbeat. Each step is
+    guarded, so if a discord.py upgrade renames them the event rates are reported as unavailable
+    (with a warning) instead of the monitor failing.
+    """
+    ws = getattr(getattr(shard_info, '_parent', None), 'ws', None)
+    return getattr(ws, 'sequence', _UNAVAILABLE)
+
+
+class ShardHealth:
+    """What the monitor has seen of one shard."""
+    def __init__(self, shard_id):
+        self.shard_id = shard_id
+        self.state = "connecting" # connecting, connected (waiting for its guilds), ready or disconnected
+        self.ready_after = None # Seconds from start until the shard was first ready
+        self.connects = 0
+        self.disconnects = 0
+        self.resumes = 0
+        self.events = 0 # Gateway events received
+        self.event_rate = 0.0 # Events per second over the last sample interval
+        self._sequence = None
+
+
+class ShardMonitor:
+    """
+    Follows each shard's connection state through the shard events and samples how many gateway
+    events it receives, for the per-shard lines in /stats and /metrics.
+    """
+    def __init__(self, bot, started_at, interval=SHARD_SAMPLE_INTERVAL):
+        self.bot = bot
+        self.started_at = started_at
+        self.interval = interval
+        self.shards = {} # shard id -> ShardHealth
+        self.events_available = True # False if this discord.py doesn't let _gateway_sequence count events
+        self._sample_task = None
+        self._sampled_at = None
+
+    def _health(self, shard_id):
+        health = self.shards.get(shard_id)
+        if health is None:
+            health = self.shards[shard_id] = ShardHealth(shard_id)
+        return health
+
+    def start(self):
+        self.bot.add_listener(self._on_shard_connect, 'on_shard_connect')
+        self.bot.add_listener(self._on_shard_ready, 'on_shard_ready')
+        self.bot.add_listener(self._on_shard_disconnect, 'on_shard_disconnect')
+        self.bot.add_listener(self._on_shard_resumed, 'on_shard_resumed')
+        self._sample_task = asyncio.create_task(self._sample_periodically())
+
+    async def close(self):
+        for listener, event in (
+            (self._on_shard_connect, 'on_shard_connect'),
+            (self._on_shard_ready, 'on_shard_ready'),
+            (self._on_shard_disconnect, 'on_shard_disconnect'),
+            (self._on_shard_resumed, 'on_shard_resumed')
+        ):
+            self.bot.remove_listener(listener, event)
+        if self._sample_task is not None:
+            self._sample_task.cancel()
+            try:
+                await self._sample_task
+            except asyncio.CancelledError:
+                pass
+
+    async def _on_shard_connect(self, shard_id):
+        health = self._health(shard_id)
+        health.connects += 1
+        health.state = "connected"
+        logger.info(f"Shard {shard_id} connected, waiting for its guilds.")
+
+    async def _on_shard_ready(self, shard_id):
+        health = self._health(shard_id)
+        health.state = "ready"
+        if health.ready_after is None:
+            health.ready_after = time.perf_counter() - self.started_at
+            guilds = sum(1 for guild in self.bot.guilds if guild.shard_id == shard_id)
+            logger.info(f"Shard {shard_id} ready {health.ready_after:.2f}s after start ({guilds} guilds).")
+        else:
+            logger.info(f"Shard {shard_id} ready again after starting a new session.")
+
+    async def _on_shard_disconnect(self, shard_id):
+        health = self._health(shard_id)
+        health.disconnects += 1
+        health.state = "disconnected"
+        logger.warning(f"Shard {shard_id} disconnected from the gateway ({health.disconnects} disconnects so far).")
+
+    async def _on_shard_resumed(self, shard_id):
+        health = self._health(shard_id)
+        health.resumes += 1
+        health.state = "ready"
+        logger.info(f"Shard {shard_id} resumed its session.")
+
+    def sample(self):
+        """Adds the events each shard received since the last sample and updates the event rates."""
+        now = time.perf_counter()
+        elapsed = now - self._sampled_at if self._sampled_at is not None else None
+        self._sampled_at = now
+        for shard_id, shard_info in self.bot.shards.items():
+            sequence = _gateway_sequence(shard_info)
+            if sequence is _UNAVAILABLE:
+                if self.events_available:
+                    self.events_available = False
+                    logger.warning(
+                        "Can't read the shards' gateway sequence numbers from this discord.py version; "
+                        "per-shard event counts and rates are unavailable."
+                    )
+                return
+            if sequence is None:
+                continue
+            health = self._health(shard_id)
+            previous = health._sequence
+            health._sequence = sequence
+            if previous is None:
+                received = sequence
+            elif sequence < previous:
+                received = sequence # A new session started counting from 1 again
+            else:
+                received = sequence - previous
+            health.events += received
+            if elapsed:
+                health.event_rate = received / elapsed
+
+    async def _sample_periodically(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self):
+        """Every shard this process runs, as a list of dicts sorted by shard ID."""
+        guilds = Counter(guild.shard_id for guild in self.bot.guilds)
+        shards = []
+        for shard_id, shard_info in sorted(self.bot.shards.items()):
+            health = self._health(shard_id)
+            shards.append({
+                "id": shard_id,
+                "state": "disconnected" if shard_info.is_closed() else health.state,
+                "latency": shard_info.latency,
+                "guilds": guilds[shard_id],
+                "events": health.events if self.events_available else None,
+                "event_rate": health.event_rate if self.events_available else None,
+                "disconnects": health.disconnects,
+                "resumes": health.resumes,
+                "ready_after": health.ready_after
+            })
+        return shards
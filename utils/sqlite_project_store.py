@@ -0,0 +1,176 @@
+# utils/sqlite_project_store.py
+# SQLite backend for the shared project store (PROJECTS_BACKEND=sqlite).
+# The database runs in WAL mode with an index on each lookup column. Every query runs on a
+# single dedicated worker thread, so the event loop never waits on disk and the connection
+# is only ever used from one thread.
+
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.journal import load_journaled
+from utils.locks import KeyedLocks
+from utils.project_ids import ProjectIdAllocator
+from utils.project_store import INDEXED_FIELDS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("department", "creator_id", "recipient_id", "creator_name", "recipient_name", "status")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_id     TEXT PRIMARY KEY,
+    department     TEXT NOT NULL,
+    creator_id     TEXT NOT NULL,
+    recipient_id   TEXT NOT NULL,
+    creator_name   TEXT,
+    recipient_name TEXT,
+    status         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_creator_id ON projects (creator_id);
+CREATE INDEX IF NOT EXISTS idx_projects_recipient_id ON projects (recipient_id);
+CREATE INDEX IF NOT EXISTS idx_projects_department ON projects (department);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _row_to_project(row):
+    """Turns a database row back into the dictionary shape the cogs expect."""
+    return dict(zip(COLUMNS, row))
+
+
+class SQLiteProjectStore:
+    """
+    Project store backed by a SQLite database.
+    Use SQLiteProjectStore.open() rather than the constructor so setup runs off the event loop.
+    Writes are serialized by the single database thread; each update is one statement, so it
+    is atomic without holding the per-project lock.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="projects-db")
+        self._conn = None
+        self.ids = None # ProjectIdAllocator, seeded with the stored IDs once the database is open
+        self._record_locks = KeyedLocks()
+
+    @classmethod
+    async def open(cls, path, migrate_from=None):
+        """Opens (creating if needed) the database and imports migrate_from on first start."""
+        store = cls(path)
+        await store._run(store._setup, migrate_from)
+        return store
+
+    def lock(self, project_id):
+        """
+        Per-project lock for read-modify-write sequences, e.g.
+        `async with projects.lock(project_id): ...`. The store's own methods can be called inside it.
+        """
+        return self._record_locks.hold(project_id)
+
+    async def _run(self, func, *args):
+        """Runs func on the database thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _setup(self, migrate_from):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+        if migrate_from and not migrated:
+            self._migrate(migrate_from)
+        self.ids = ProjectIdAllocator(row[0] for row in self._conn.execute("SELECT project_id FROM projects"))
+        logger.info(f"SQLiteProjectStore opened {self.path} with {len(self.ids)} projects ({self.ids.describe()}).")
+
+    def _migrate(self, json_path):
+        """
+        One-time import of an existing projects.json, including the records still in its journal
+        if the JSON backend ran with PERSISTENCE_MODE=journal. The imported data is left in place.
+        """
+        projects = load_journaled(json_path)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO projects (project_id, {', '.join(COLUMNS)}) VALUES (?{', ?' * len(COLUMNS)})",
+                [(project_id, *(data.get(column) for column in COLUMNS)) for project_id, data in projects.items()]
+            )
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (json_path,))
+        logger.info(f"Migrated {len(projects)} projects from {json_path} to {self.path}.")
+
+    def _get(self, project_id):
+        row = self._conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM projects WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        return _row_to_project(row) if row else None
+
+    def _find(self, filters):
+        where = " AND ".join(f"{field} = ?" for field in filters) or "1"
+        rows = self._conn.execute(
+            f"SELECT project_id, {', '.join(COLUMNS)} FROM projects WHERE {where}", tuple(filters.values())
+        ).fetchall()
+        return {row[0]: _row_to_project(row[1:]) for row in rows}
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def _create(self, project_id, project_data):
+        try:
+            with self._conn:
+                self._conn.execute(
+                    f"INSERT INTO projects (project_id, {', '.join(COLUMNS)}) VALUES (?{', ?' * len(COLUMNS)})",
+                    (project_id, *(project_data.get(column) for column in COLUMNS))
+                )
+        except sqlite3.IntegrityError:
+            raise KeyError(f"Project {project_id} already exists.")
+
+    def _update_status(self, project_id, new_status):
+        with self._conn:
+            cursor = self._conn.execute("UPDATE projects SET status = ? WHERE project_id = ?", (new_status, project_id))
+        if cursor.rowcount == 0:
+            return None
+        return self._get(project_id)
+
+    async def get(self, project_id):
+        """Returns the project data for an ID, or None if it doesn't exist."""
+        return await self._run(self._get, project_id)
+
+    async def contains(self, project_id):
+        """Returns True if a project with this ID exists."""
+        return await self.get(project_id) is not None
+
+    async def count(self):
+        """Returns the number of projects."""
+        return await self._run(self._count)
+
+    async def find(self, **filters):
+        """Returns {project_id: project_data} for every project matching all the given field filters."""
+        for field in filters:
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Projects can't be looked up by '{field}'.")
+        return await self._run(self._find, filters)
+
+    async def create(self, project_id, project_data):
+        """Adds a new project."""
+        await self._run(self._create, project_id, project_data)
+        self.ids.add(project_id)
+
+    async def update_status(self, project_id, new_status):
+        """
+        Sets the status of an existing project.
+        Returns the updated project data, or None if the project doesn't exist.
+        """
+        return await self._run(self._update_status, project_id, new_status)
+
+    async def close(self):
+        """Closes the database connection and stops the worker thread."""
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
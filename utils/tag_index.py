@@ -0,0 +1,226 @@
+# utils/tag_index.py
+# Search index behind the /tag autocomplete and "did you mean" suggestions.
+# Lowercase keys are computed once when a tag is added, and kept in sorted lists so a
+# keystroke is answered with a binary search instead of lowercasing and scanning every tag.
+# A trigram index on top of that finds close matches for mistyped names.
+
+import bisect
+import itertools
+import math
+import re
+
+# Characters that separate words inside a tag name, e.g. "server-rules" or "how_to apply"
+WORD_SEPARATOR = re.compile(r'[^0-9a-z]+')
+
+
+# Most names scored per fuzzy query; keeps queries made only of very common trigrams fast
+FUZZY_CANDIDATE_BUDGET = 200
+
+# Minimum similarity (0-1) for a name to count as a close match to a complete name
+MIN_SIMILARITY = 0.3
+
+# Minimum share of a partially typed query's trigrams a name must contain to be suggested
+MIN_PARTIAL_SIMILARITY = 0.5
+
+
+def _word_starts(key):
+    """Offsets of every word after the first one in a lowercase tag name."""
+    return [match.end() for match in WORD_SEPARATOR.finditer(key) if 0 < match.end() < len(key)]
+
+
+def trigrams(text, partial=False):
+    """
+    The set of 3-character sequences in text, padded so word starts and ends count too.
+    A partial (still being typed) text gets no end padding, since it hasn't ended yet.
+    """
+    padded = f"  {text.lower()}" + ("" if partial else " ")
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Maps each trigram to the names containing it, so names similar to a query can be
+    found by looking only at names that share a trigram with it. Updates are incremental.
+    For a complete query, similarity is the Jaccard index of the two trigram sets; for a
+    partial one it is the share of the query's trigrams found in the name, so long names
+    aren't penalised for the part that hasn't been typed yet.
+    """
+    def __init__(self, names=()):
+        self._postings = {} # trigram -> set of names
+        self._trigrams = {} # name -> its trigram set
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        if name in self._trigrams:
+            return
+        name_trigrams = trigrams(name)
+        self._trigrams[name] = name_trigrams
+        for trigram in name_trigrams:
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def remove(self, name):
+        name_trigrams = self._trigrams.pop(name, None)
+        if name_trigrams is None:
+            return
+        for trigram in name_trigrams:
+            postings = self._postings[trigram]
+            postings.discard(name)
+            if not postings:
+                del self._postings[trigram]
+
+    def similar(self, query, limit=25, partial=False):
+        """Returns up to `limit` (name, similarity) pairs, most similar first."""
+        query_trigrams = trigrams(query, partial)
+        min_similarity = MIN_PARTIAL_SIMILARITY if partial else MIN_SIMILARITY
+        postings = sorted(
+            (self._postings[trigram] for trigram in query_trigrams if trigram in self._postings),
+            key=len
+        )
+
+        # Either measure needs at least `needed` shared trigrams, so a match must share one of
+        # any len(query_trigrams) - needed + 1 of the query's trigrams. Trigrams nobody has are
+        # the cheapest of those; the rest come from the rarest posting lists.
+        needed = math.ceil(min_similarity * len(query_trigrams))
+        absent = len(query_trigrams) - len(postings)
+        lists = max(0, len(query_trigrams) - needed + 1 - absent)
+        rarest = postings[:lists]
+        candidates = set()
+        for position, names in enumerate(rarest):
+            if len(candidates) + len(names) > FUZZY_CANDIDATE_BUDGET:
+                # Too many to score them all: keep to names sharing two of the remaining trigrams
+                remaining = rarest[position:]
+                for first, second in zip(remaining, remaining[1:]):
+                    candidates |= first & second
+                    if len(candidates) >= FUZZY_CANDIDATE_BUDGET:
+                        break
+                candidates = set(itertools.islice(candidates, FUZZY_CANDIDATE_BUDGET))
+                break
+            candidates |= names
+
+        scored = []
+        query_size = len(query_trigrams)
+        for name in candidates:
+            name_trigrams = self._trigrams[name]
+            overlap = len(query_trigrams & name_trigrams)
+            if overlap < needed:
+                continue
+            if partial:
+                similarity = overlap / query_size
+            else:
+                similarity = overlap / (query_size + len(name_trigrams) - overlap)
+            if similarity >= min_similarity:
+                scored.append((similarity, name))
+        # Most similar first, then shorter (closer to what was typed), then alphabetical
+        scored.sort(key=lambda item: (-item[0], len(item[1]), item[1]))
+        return [(name, similarity) for similarity, name in scored[:limit]]
+
+
+class TagIndex:
+    """
+    Finds tag names for a partially typed query, best matches first:
+    1. names starting with the query,
+    2. names with a later word starting with the query,
+    3. names containing the query anywhere,
+    4. names similar to the query, to catch typos, when nothing else matched.
+    Each tier is only searched when the ones before it come up short. The third tier
+    searches one newline-joined string of all the lowercase names with str.find, rebuilt lazily after changes, rather than looping over the tags in Python.
+    """
+    def __init__(self, names=()):
+        self._names = [] # Sorted (lowercase name, name) pairs
+        self._words = [] # Sorted (lowercase name from a word start onwards, name) pairs
+        self._blob = None # "\n".join of the lowercase names, or None when it needs rebuilding
+        self._offsets = [] # Start of each name within _blob, in _names order
+        self.fuzzy = TrigramIndex()
+        self.update(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        key = name.lower()
+        self._blob = None
+        self.fuzzy.add(name)
+        bisect.insort(self._names, (key, name))
+        for start in _word_starts(key):
+            bisect.insort(self._words, (key[start:], name))
+
+    def update(self, names):
+        """Adds many names at once, sorting once at the end instead of inserting each one."""
+        self._blob = None
+        for name in names:
+            key = name.lower()
+            self.fuzzy.add(name)
+            self._names.append((key, name))
+            self._words.extend((key[start:], name) for start in _word_starts(key))
+        self._names.sort()
+        self._words.sort()
+
+    def remove(self, name):
+        key = name.lower()
+        self._blob = None
+        self.fuzzy.remove(name)
+        self._discard(self._names, (key, name))
+        for start in _word_starts(key):
+            self._discard(self._words, (key[start:], name))
+
+    @staticmethod
+    def _discard(entries, entry):
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    @staticmethod
+    def _with_prefix(entries, prefix):
+        """Yields names whose key starts with prefix, in sorted order."""
+        position = bisect.bisect_left(entries, (prefix,))
+        while position < len(entries) and entries[position][0].startswith(prefix):
+            yield entries[position][1]
+            position += 1
+
+    def _containing(self, query):
+        """Yields names containing query, in sorted order."""
+        if self._blob is None:
+            self._blob = '\n'.join(key for key, _ in self._names)
+            self._offsets = []
+            offset = 0
+            for key, _ in self._names:
+                self._offsets.append(offset)
+                offset += len(key) + 1
+        position = self._blob.find(query)
+        while position != -1:
+            entry = bisect.bisect_right(self._offsets, position) - 1
+            yield self._names[entry][1]
+            if entry + 1 >= len(self._offsets):
+                return
+            position = self._blob.find(query, self._offsets[entry + 1])
+
+    def search(self, query, limit=25):
+        """Returns up to `limit` tag names matching query, best matches first."""
+        query = query.lower()
+        if not query:
+            return [name for _, name in self._names[:limit]]
+
+        results = []
+        seen = set()
+        def collect(names):
+            for name in names:
+                if len(results) >= limit:
+                    return
+                if name not in seen:
+                    seen.add(name)
+                    results.append(name)
+
+        collect(self._with_prefix(self._names, query))
+        collect(self._with_prefix(self._words, query))
+        if len(results) < limit and '\n' not in query:
+            collect(self._containing(query))
+        if not results and len(query) >= 3:
+            collect(name for name, _ in self.fuzzy.similar(query, limit=limit, partial=True))
+        return results
+
+    def suggest(self, query, limit=3):
+        """Closest tag names to a name that doesn't exist, for "did you mean" messages."""
+        # Fall back to partial matching for names that were only typed halfway, e.g. "paymnt"
+        matches = self.fuzzy.similar(query, limit=limit) or self.fuzzy.similar(query, limit=limit, partial=True)
+        return [name for name, _ in matches]
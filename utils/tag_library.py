@@ -0,0 +1,147 @@
+# utils/tag_library.py
+# One guild's tags for the tags cog: the tags and aliases, their usage counters, and the
+# autocomplete index and compiled templates built from them.
+# Each guild's files live in tags/<guild id>/ (tags.json, tag_aliases.json, tag_usage.json).
+# The home guild keeps the tags.json, tag_aliases.json and tag_usage.json it had before tags
+# were per guild, so its existing library is picked up as is.
+
+import asyncio
+import logging
+import os
+
+from utils.guild_config import HOME_GUILD_ID
+from utils.journal import Journal, journal_enabled, load_journaled
+from utils.persistence import atomic_write
+from utils.tag_index import TagIndex
+from utils.tag_template import TagTemplate
+from utils.tag_usage import TagUsage
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Directory holding a directory of tag files per guild
+TAGS_DIRECTORY = 'tags'
+
+# How often the usage counters are written out (seconds)
+TAG_USAGE_FLUSH_INTERVAL = 10.0
+
+
+def library_files(guild_id):
+    """The (tags, aliases, usage) file paths of a guild's library."""
+    if guild_id == HOME_GUILD_ID:
+        return 'tags.json', 'tag_aliases.json', 'tag_usage.json'
+    directory = os.path.join(TAGS_DIRECTORY, str(guild_id))
+    return (
+        os.path.join(directory, 'tags.json'),
+        os.path.join(directory, 'tag_aliases.json'),
+        os.path.join(directory, 'tag_usage.json')
+    )
+
+
+def load_aliases(path, tags):
+    """Loads the tag aliases, dropping any that point at a missing tag or clash with a tag name."""
+    aliases = load_journaled(path)
+    for alias, target in list(aliases.items()):
+        if target not in tags or alias in tags:
+            logger.warning(f"Ignoring alias '{alias}' for '{target}': the tag is missing or the name is taken.")
+            del aliases[alias]
+    return aliases
+
+
+class TagLibrary:
+    """
+    The tags of one guild. Loading reads files, so create it off the event loop (TagLibrary.load).
+    After close() the data can be kept (e.g. over a hot reload) and reopen() starts writing again.
+    """
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.tags_file, self.aliases_file, self.usage_file = library_files(guild_id)
+        os.makedirs(os.path.dirname(os.path.abspath(self.tags_file)), exist_ok=True)
+        self.tags = load_journaled(self.tags_file)
+        # Aliases are extra names for a tag, so its content is only stored and compiled once
+        self.aliases = load_aliases(self.aliases_file, self.tags)
+        self.aliases_by_tag = {} # tag name -> set of its aliases, for cascading deletes and renames
+        for alias, target in self.aliases.items():
+            self.aliases_by_tag.setdefault(target, set()).add(alias)
+        # Autocomplete index over the tag names and aliases, kept in step with every change
+        self.index = TagIndex(list(self.tags) + list(self.aliases))
+        # Tag contents compiled into templates, so sends don't re-parse or re-split them
+        self.templates = {name: TagTemplate(content) for name, content in self.tags.items()}
+        self.reopen()
+        logger.info(f"Loaded {len(self.tags)} tags and {len(self.aliases)} aliases for guild {guild_id}.")
+
+    @classmethod
+    async def load(cls, guild_id):
+        """Loads the guild's library in a worker thread."""
+        return await asyncio.to_thread(cls, guild_id)
+
+    def reopen(self):
+        """Opens the journals and usage counters the library writes through."""
+        # In journal mode each change is appended as a single record instead of rewriting the file
+        self.journal = Journal(self.tags_file, lambda: dict(self.tags)) if journal_enabled() else None
+        self.alias_journal = Journal(self.aliases_file, lambda: dict(self.aliases)) if journal_enabled() else None
+        # Usage counters for ranking autocomplete; saved in batches, never on the send path
+        self.usage = TagUsage(self.usage_file, flush_interval=TAG_USAGE_FLUSH_INTERVAL)
+        # File rewrites run one at a time, in the order of the changes, so an older copy can't land last
+        self._write_lock = asyncio.Lock()
+
+    async def close(self):
+        """Closes the journals and saves the usage counters."""
+        if self.journal is not None:
+            await self.journal.close()
+            await self.alias_journal.close()
+        await self.usage.close()
+
+    def add_alias(self, alias, target):
+        self.aliases[alias] = target
+        self.aliases_by_tag.setdefault(target, set()).add(alias)
+        self.index.add(alias)
+
+    def remove_alias(self, alias):
+        target = self.aliases.pop(alias)
+        aliases = self.aliases_by_tag[target]
+        aliases.discard(alias)
+        if not aliases:
+            del self.aliases_by_tag[target]
+        self.index.remove(alias)
+
+    async def save_tags(self, *names):
+        """
+        Persists changes to the given tags: one journal record each, or a rewrite of the tags
+        file. The file is replaced atomically from a worker thread, so a crash mid-write can't
+        wipe the tags and a large library doesn't block the event loop.
+        """
+        if self.journal is None:
+            snapshot = dict(self.tags)
+            async with self._write_lock:
+                await asyncio.to_thread(atomic_write, self.tags_file, snapshot)
+            logger.info(f"Tags data saved to {self.tags_file}.")
+            return
+        for name in names:
+            if name in self.tags:
+                self.journal.set(name, self.tags[name])
+            else:
+                self.journal.delete(name)
+
+    async def save_aliases(self, *aliases):
+        """Persists changes to the given aliases: one journal record each, or an atomic rewrite of the aliases file."""
+        if self.alias_journal is None:
+            snapshot = dict(self.aliases)
+            async with self._write_lock:
+                await asyncio.to_thread(atomic_write, self.aliases_file, snapshot)
+            logger.info(f"Tag aliases saved to {self.aliases_file}.")
+            return
+        for alias in aliases:
+            if alias in self.aliases:
+                self.alias_journal.set(alias, self.aliases[alias])
+            else:
+                self.alias_journal.delete(alias)
+
+    async def save_all(self):
+        """Persists a bulk change with a single write per data file."""
+        if self.journal is not None:
+            await self.journal.checkpoint()
+            await self.alias_journal.checkpoint()
+        else:
+            await self.save_tags()
+            await self.save_aliases()
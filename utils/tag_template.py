@@ -0,0 +1,85 @@
+# utils/tag_template.py
+# Tag content compiled into templates with placeholders such as {user} and {mention}.
+# Content is parsed and split into message-sized chunks once, when the tag is created or
+# loaded, so sending a tag only has to join a few strings.
+
+import re
+
+# Discord's limit on the length of a message's content
+MESSAGE_LIMIT = 2000
+
+# Supported placeholders and the longest text each one can be replaced with
+PLACEHOLDERS = {
+    "user": 32, # Display name
+    "mention": 23, # <@ + a user ID of up to 20 digits + >
+    "channel": 23, # <# + a channel ID of up to 20 digits + >
+    "server": 100 # Server name
+}
+
+# Only the exact placeholders above are replaced; any other braces are sent as they are
+PLACEHOLDER = re.compile(r'\{(' + '|'.join(PLACEHOLDERS) + r')\}')
+
+
+def _cut(text, room):
+    """Where to split text so the first part fits in room: after a newline, else a space, else anywhere."""
+    for separator in ('\n', ' '):
+        position = text.rfind(separator, 0, room)
+        if position > 0:
+            return position + 1
+    return room
+
+
+def _split(pieces, limit):
+    """
+    Splits alternating [text, placeholder, text, ...] pieces into chunks whose content
+    stays under limit even with every placeholder at its longest.
+    """
+    chunks = []
+    chunk = [] # Pieces of the current chunk, alternating text and placeholder like the input
+    length = 0
+    for position, piece in enumerate(pieces):
+        if position % 2:
+            if length + PLACEHOLDERS[piece] > limit:
+                chunks.append(chunk)
+                chunk, length = [''], 0
+            chunk.append(piece)
+            length += PLACEHOLDERS[piece]
+            continue
+        while length + len(piece) > limit:
+            cut = _cut(piece, limit - length)
+            chunks.append(chunk + [piece[:cut]])
+            chunk, length, piece = [], 0, piece[cut:]
+        chunk.append(piece)
+        length += len(piece)
+    chunks.append(chunk)
+    return chunks
+
+
+class TagTemplate:
+    """
+    A tag's content, compiled. Each chunk is either a plain string or a tuple of
+    alternating text and placeholder names; render() fills in the placeholders and
+    returns one string per message to send.
+    """
+    __slots__ = ('chunks', 'placeholders')
+
+    def __init__(self, content, limit=MESSAGE_LIMIT):
+        pieces = PLACEHOLDER.split(content)
+        self.placeholders = frozenset(pieces[1::2])
+        self.chunks = [
+            ''.join(chunk) if len(chunk) == 1 else tuple(chunk)
+            for chunk in _split(pieces, limit)
+        ]
+
+    def render(self, values):
+        """Returns the message contents with placeholders filled in from the values mapping."""
+        messages = []
+        for chunk in self.chunks:
+            if chunk.__class__ is str:
+                messages.append(chunk)
+                continue
+            parts = list(chunk)
+            for position in range(1, len(parts), 2):
+                parts[position] = values[parts[position]][:PLACEHOLDERS[parts[position]]]
+            messages.append(''.join(parts))
+        return messages
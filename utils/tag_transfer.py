@@ -0,0 +1,151 @@
+# utils/tag_transfer.py
+# Bulk import and export of tags as JSON lines: one {"name": ..., "content": ...} object per line,
+# or {"name": ..., "alias_of": ...} for an alias.
+# Imports are read line by line from a stream of byte chunks, so only the current line of the
+# file is held in memory, and every record is validated before any of them is applied.
+
+import json
+
+from utils.tag_template import TagTemplate
+
+# Longest line accepted in an import file
+MAX_LINE_BYTES = 64 * 1024
+
+# Limits on imported tags; names have to fit in an autocomplete choice
+MAX_NAME_LENGTH = 100
+MAX_CONTENT_LENGTH = 6000
+
+# How many problems an import report lists before just counting them
+MAX_REPORTED_ERRORS = 10
+
+
+async def iter_lines(chunks, max_line_bytes=MAX_LINE_BYTES):
+    """Yields (line number, line) from an async iterable of byte chunks, without the line terminators."""
+    buffer = b''
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split(b'\n')
+        buffer = lines.pop()
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"Line {line_number + len(lines) + 1} is longer than {max_line_bytes} bytes.")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip(b'\r')
+    if buffer:
+        yield line_number + 1, buffer.rstrip(b'\r')
+
+
+class TagImport:
+    """
+    Collects the tags and aliases of one import file, a line at a time.
+    Names are lowercased like /tag create does. A name that appears twice in the file
+    keeps its first record, and names that already exist are skipped unless overwriting,
+    which replaces a tag's content or an alias's target but never turns one into the other.
+    Call finish() after the last line; nothing is applied unless the file had no invalid lines.
+    """
+    def __init__(self, existing_tags, existing_aliases, overwrite=False):
+        self.existing_tags = existing_tags
+        self.existing_aliases = existing_aliases # alias -> tag name
+        self.overwrite = overwrite
+        self.tags = {} # name -> content, in file order
+        self.templates = {} # name -> compiled TagTemplate
+        self.aliases = {} # alias -> tag name
+        self._alias_lines = {} # alias -> line number, for errors found by finish()
+        self.lines = 0
+        self.duplicates = 0
+        self.skipped = 0 # Already existing names left alone
+        self.errors = [] # Up to MAX_REPORTED_ERRORS messages
+        self.error_count = 0
+
+    @property
+    def valid(self):
+        return self.error_count == 0
+
+    def _error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line_number}: {message}")
+
+    def feed(self, line_number, line):
+        """Validates one line of the file and keeps its tag if it should be imported."""
+        self.lines = line_number
+        if line_number == 1:
+            line = line.removeprefix(b'\xef\xbb\xbf') # UTF-8 byte order mark
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            self._error(line_number, f"not valid JSON ({e})")
+            return
+        if not isinstance(record, dict):
+            self._error(line_number, "expected an object with \"name\" and \"content\"")
+            return
+        name = record.get("name")
+        if not isinstance(name, str) or not name.strip():
+            self._error(line_number, "\"name\" must be a non-empty string")
+            return
+        name = name.strip().lower()
+        if len(name) > MAX_NAME_LENGTH:
+            self._error(line_number, f"name is longer than {MAX_NAME_LENGTH} characters")
+            return
+        is_alias = "alias_of" in record
+        if is_alias:
+            target = record["alias_of"]
+            if not isinstance(target, str) or not target.strip():
+                self._error(line_number, "\"alias_of\" must be a non-empty string")
+                return
+            target = target.strip().lower()
+        else:
+            content = record.get("content")
+            if not isinstance(content, str) or not content.strip():
+                self._error(line_number, "\"content\" must be a non-empty string")
+                return
+            if len(content) > MAX_CONTENT_LENGTH:
+                self._error(line_number, f"content is longer than {MAX_CONTENT_LENGTH} characters")
+                return
+
+        if name in self.tags or name in self.aliases:
+            self.duplicates += 1
+            return
+        if name in self.existing_tags or name in self.existing_aliases:
+            same_kind = self.existing_aliases if is_alias else self.existing_tags
+            if not (self.overwrite and name in same_kind):
+                self.skipped += 1
+                return
+        if is_alias:
+            self.aliases[name] = target
+            self._alias_lines[name] = line_number
+        else:
+            self.tags[name] = content
+            self.templates[name] = TagTemplate(content)
+
+    def finish(self):
+        """Checks that every alias points at a tag from the file or an existing one."""
+        for alias, target in list(self.aliases.items()):
+            if target not in self.tags:
+                # Pointing at an existing alias is fine; store its tag instead
+                target = self.existing_aliases.get(target, target)
+            if target == alias or (target not in self.tags and target not in self.existing_tags):
+                self._error(self._alias_lines[alias], f"\"alias_of\" names no tag: {target}")
+                del self.aliases[alias]
+            else:
+                self.aliases[alias] = target
+
+    def summary(self):
+        """One line describing what was found, for progress and result messages."""
+        return (
+            f"{self.lines} lines read: {len(self.tags)} tags and {len(self.aliases)} aliases to import, "
+            f"{self.duplicates} duplicates, {self.skipped} already existing, {self.error_count} invalid."
+        )
+
+
+def write_export(tags, aliases, file):
+    """Writes tags and then aliases to a binary file as JSON lines, one record at a time."""
+    for name, content in tags.items():
+        file.write(json.dumps({"name": name, "content": content}, ensure_ascii=False).encode('utf-8'))
+        file.write(b'\n')
+    for alias, target in aliases.items():
+        file.write(json.dumps({"name": alias, "alias_of": target}, ensure_ascii=False).encode('utf-8'))
+        file.write(b'\n')
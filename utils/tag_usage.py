@@ -0,0 +1,131 @@
+# utils/tag_usage.py
+# Per-tag usage counters for ranking /tag autocomplete by recent popularity.
+# Counting a use only touches memory; the counters are written to disk in batches by a
+# WriteBehind, so sending a tag never waits on a file write.
+
+import bisect
+import heapq
+import logging
+import math
+import time
+
+from utils.journal import load_journaled
+from utils.persistence import WriteBehind
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds after which a use counts half as much towards a tag's popularity
+USAGE_HALF_LIFE = 7 * 24 * 60 * 60
+
+# How many of the most popular tags are kept ranked in memory for autocomplete
+TOP_TAGS = 100
+
+
+class TagUsage:
+    """
+    Tracks how often and how recently each tag is sent.
+    Each tag has a use count, a decayed score (every use adds 1, and the score halves
+    every USAGE_HALF_LIFE seconds) and the time it was last used. On disk a tag is stored
+    as [count, score, last_used], with the score as of last_used.
+    """
+    def __init__(self, path, flush_interval=10.0, half_life=USAGE_HALF_LIFE):
+        self.path = path
+        self.half_life = half_life
+        self._usage = {name: tuple(entry) for name, entry in load_journaled(path).items()}
+        self._writer = WriteBehind(path, lambda: dict(self._usage), flush_interval)
+        self._top = [] # Up to TOP_TAGS (-rank, name) pairs, most popular first
+        self._top_ranks = {} # name -> rank for the names in _top
+        self._top_stale = True
+        logger.info(f"Loaded usage counters for {len(self._usage)} tags from {path}.")
+
+    def _rank(self, name):
+        """
+        Orders tags by decayed score without recomputing every score as time passes.
+        log2(score at last_used) + last_used / half_life is the same for every tag as
+        log2(score now) + now / half_life, so comparing it compares the scores right now.
+        The rank only changes when the tag is used, and only ever goes up.
+        """
+        _, score, last_used = self._usage[name]
+        return math.log2(score) + last_used / self.half_life
+
+    def _decayed(self, entry, now):
+        _, score, last_used = entry
+        return score * 0.5 ** ((now - last_used) / self.half_life)
+
+    def score(self, name, now=None):
+        """The tag's decayed score as of now (0 if it has never been used)."""
+        entry = self._usage.get(name)
+        if entry is None:
+            return 0.0
+        return self._decayed(entry, time.time() if now is None else now)
+
+    def count(self, name):
+        """How many times the tag has been sent in total."""
+        entry = self._usage.get(name)
+        return entry[0] if entry is not None else 0
+
+    def last_used(self, name):
+        entry = self._usage.get(name)
+        return entry[2] if entry is not None else None
+
+    def record(self, name, now=None):
+        """Counts one use of the tag. Memory only; the write happens later in the background."""
+        now = time.time() if now is None else now
+        self._usage[name] = (self.count(name) + 1, self.score(name, now) + 1, now)
+        self._writer.mark_dirty()
+        if self._top_stale:
+            return
+        # Ranks only ever go up, so the tag can only move up or join the top list
+        rank = self._rank(name)
+        old_rank = self._top_ranks.pop(name, None)
+        if old_rank is not None:
+            self._top.remove((-old_rank, name))
+        elif len(self._top) >= TOP_TAGS:
+            if rank <= -self._top[-1][0]:
+                return
+            _, dropped = self._top.pop()
+            del self._top_ranks[dropped]
+        bisect.insort(self._top, (-rank, name))
+        self._top_ranks[name] = rank
+
+    def remove(self, name):
+        """Forgets a deleted tag's counters."""
+        if self._usage.pop(name, None) is None:
+            return
+        self._writer.mark_dirty()
+        if name in self._top_ranks:
+            # Something further down has to move up, which takes a full ranking
+            self._top_stale = True
+
+    def merge(self, name, into, now=None):
+        """Moves a tag's counters onto another tag, adding them to its own, e.g. on a rename."""
+        entry = self._usage.pop(name, None)
+        if entry is None:
+            return
+        now = time.time() if now is None else now
+        count, last_used, score = entry[0], entry[2], self._decayed(entry, now)
+        other = self._usage.get(into)
+        if other is not None:
+            count += other[0]
+            last_used = max(last_used, other[2])
+            score += self._decayed(other, now)
+        # Stored as of last_used, like every other entry
+        self._usage[into] = (count, score * 2 ** ((now - last_used) / self.half_life), last_used)
+        self._writer.mark_dirty()
+        self._top_stale = True
+
+    def top(self, limit=TOP_TAGS):
+        """The most popular tags right now, most popular first."""
+        if self._top_stale:
+            self._top_ranks = {name: self._rank(name) for name in heapq.nlargest(TOP_TAGS, self._usage, key=self._rank)}
+            self._top = sorted((-rank, name) for name, rank in self._top_ranks.items())
+            self._top_stale = False
+        return [name for _, name in self._top[:limit]]
+
+    async def flush(self):
+        await self._writer.flush()
+
+    async def close(self):
+        """Writes any counts that haven't been saved yet. Call on shutdown."""
+        await self._writer.close()